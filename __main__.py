@@ -1,31 +1,132 @@
-from .src import parse_args, MazePath, PointsDict, Tree, Instructions
+from .src import parse_args, parse_batch_args
+from .src import CSRAdjacency, MazePath, Tree, Instructions
+from .src.profiling import Profiler
 import sys
-import turtle
+
+if sys.argv[1:2] == ["batch"]:
+    from .src.batch import run_batch
+
+    run_batch(parse_batch_args(sys.argv[2:]))
+    sys.exit()
 
 arguments = parse_args(sys.argv[1:])
 
 WIDTH, HEIGHT = arguments.size
 STEP = arguments.cell[0]
 HOME = -(WIDTH * STEP) // 2, -(HEIGHT * STEP) // 2
+profiler = Profiler(
+    enabled=arguments.profile is not None or arguments.profile_memory,
+    memory=arguments.profile_memory)
+
+if (arguments.algorithm == "eller" and
+        not (arguments.tile or arguments.mapped) and
+        not (arguments.distances or arguments.heatmap) and
+        arguments.backend in ("png", "ppm", "svg")):
+    from .src.eller import save_streamed
+
+    # the maze is saved row by row, without being held in memory
+    output = arguments.output or f"maze.{arguments.backend}"
+    with profiler.stage("save_streamed"):
+        save_streamed(output, WIDTH, HEIGHT, STEP, arguments.backend,
+                      merge=arguments.merge)
+    print(f"Saved {output}.")
+    profiler.report(arguments.profile or "table")
+    sys.exit()
 
-maze = MazePath(WIDTH, HEIGHT)
-points_dict = PointsDict(maze).get_points_dict()
+if arguments.mapped:
+    from .src.out_of_core import generate_mapped
 
-tree = Tree(points_dict)
-instructions = Instructions(tree.trunks)
+    with profiler.stage("generate"):
+        maze = generate_mapped(arguments.mapped, WIDTH, HEIGHT)
+    profiler.count_maze(maze.get_codes(), WIDTH, arguments.algorithm)
+elif arguments.tile:
+    from .src.tiled import generate_tiled
 
-turtle.hideturtle()
-if not arguments.slow:
-    turtle.speed(9)
+    with profiler.stage("generate"):
+        maze = generate_tiled(WIDTH, HEIGHT, *arguments.tile,
+                              algorithm=arguments.algorithm,
+                              workers=arguments.workers)
+    profiler.count_maze(maze.get_codes(), WIDTH)
 else:
-    turtle.speed(1)
-for line in instructions:
-    turtle.penup()
-    for y, x in line:
-        x *= STEP
-        y *= STEP
-        turtle.setposition(x + HOME[0], y + HOME[1])
-        turtle.pendown()
-
-if not arguments.close:
-    input("Press `enter` to close the turtle window.")
+    with profiler.stage("generate"):
+        maze = MazePath(WIDTH, HEIGHT, compact=True,
+                        algorithm=arguments.algorithm)
+    profiler.count_maze(maze.get_codes(), WIDTH, arguments.algorithm)
+
+if arguments.distances or arguments.heatmap:
+    from .src.distance_field import (distance_field, open_distances,
+                                     save_distances, save_heatmap)
+
+    with profiler.stage("distances"):
+        if arguments.distances:
+            # the distances are kept in the file and read back from it
+            maximum = save_distances(arguments.distances, maze)
+            distances = open_distances(arguments.distances, WIDTH, HEIGHT)
+            print(f"Saved {arguments.distances}.")
+        else:
+            distances = distance_field(maze)
+            maximum = max(distances, default=0)
+    if arguments.heatmap:
+        with profiler.stage("heatmap"):
+            save_heatmap(arguments.heatmap, distances, WIDTH, HEIGHT,
+                         maximum)
+        print(f"Saved {arguments.heatmap}.")
+    del distances
+
+if arguments.mapped and arguments.backend in ("png", "ppm", "svg"):
+    from .src.out_of_core import save_image
+
+    # the maze is read from the file row by row, like Eller's rows
+    output = arguments.output or f"maze.{arguments.backend}"
+    with profiler.stage("save"):
+        save_image(output, maze, STEP, arguments.backend,
+                   merge=arguments.merge)
+    maze.close()
+    print(f"Saved {output}.")
+    profiler.report(arguments.profile or "table")
+    sys.exit()
+with profiler.stage("adjacency"):
+    adjacency = CSRAdjacency.from_maze(maze)
+if arguments.mapped:
+    # the codes are not read after this point
+    maze.close()
+
+with profiler.stage("tree"):
+    tree = Tree(adjacency)
+profiler.count_tree(tree)
+instructions = profiler.counted(
+    Instructions(tree.trunks, adjacency.point, compress=True,
+                 chain=arguments.chain))
+
+if arguments.backend in ("png", "ppm", "svg"):
+    from .src.export import save
+
+    output = arguments.output or f"maze.{arguments.backend}"
+    with profiler.stage("save"):
+        save(instructions, output, WIDTH, HEIGHT, STEP, arguments.backend,
+             merge=arguments.merge)
+    print(f"Saved {output}.")
+    profiler.report(arguments.profile or "table")
+elif arguments.backend == "canvas":
+    from .src.canvas_renderer import draw
+
+    with profiler.stage("draw"):
+        window = draw(instructions, STEP, WIDTH, HEIGHT)
+    profiler.report(arguments.profile or "table")
+    if not arguments.close:
+        window.mainloop()
+    else:
+        window.destroy()
+else:
+    from .src.turtle_renderer import draw
+
+    with profiler.stage("draw"):
+        draw(instructions, STEP, HOME,
+             slow=arguments.slow,
+             flush_every=arguments.flush_every,
+             flush_ms=arguments.flush_ms,
+             instant=arguments.instant)
+    profiler.report(arguments.profile or "table")
+
+    if not arguments.close:
+        input("Press `enter` to close the turtle window.")
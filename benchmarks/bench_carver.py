@@ -0,0 +1,52 @@
+""" Compare the speed of MazePath._create_path with the flat-index
+kernel from the `carver` module.
+
+Usage (from the repository's root):
+    python -m benchmarks.bench_carver [--sizes 100 300 1000] [--repeat 3]
+
+Steps are forward steps of the depth-first search, i.e. the number
+of fields minus one; both engines make exactly that many.
+"""
+import argparse
+import time
+from src import MazePath
+
+
+def best_time(width: int, height: int, repeat: int, **options) -> float:
+    """ Measure the shortest of `repeat` generations of a maze.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param repeat: number of measurements.
+    :param options: keyword arguments passed to MazePath.
+    :return: time in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        MazePath(width, height, **options)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        "Benchmark MazePath._create_path against carver.carve")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[100, 300, 1000],
+                        help="sides of square mazes")
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    print(f"{'size':>11} {'loop steps/s':>14} {'kernel steps/s':>15} "
+          f"{'speedup':>8}")
+    for side in arguments.sizes:
+        steps = side * side - 1
+        loop = best_time(side, side, arguments.repeat)
+        kernel = best_time(side, side, arguments.repeat,
+                           compact=True, fast=True)
+        print(f"{side:>5}x{side:<5} {steps / loop:>14,.0f} "
+              f"{steps / kernel:>15,.0f} {loop / kernel:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
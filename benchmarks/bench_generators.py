@@ -0,0 +1,82 @@
+""" Compare the generators from the `generators` registry by speed
+and by texture of the mazes they create.
+
+Usage (from the repository's root):
+    python -m benchmarks.bench_generators [--sizes 100 300] [--repeat 3]
+        [--algorithms kruskal prim]
+
+Texture is described by the share of dead ends among the fields
+and by the share of fields where the path goes straight on: long
+corridors of the backtracker have few dead ends and many straight
+fields, Kruskal's and Prim's mazes are the opposite.
+"""
+import argparse
+import random
+import time
+from src.compact_fields import ROOT, OFFSETS
+from src.generators import GENERATORS, generate
+
+
+def best_time(algorithm: str, width: int, height: int,
+              repeat: int) -> tuple[float, bytearray]:
+    """ Measure the shortest of `repeat` generations of a maze.
+    :param algorithm: name of the generator.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param repeat: number of measurements.
+    :return: tuple: time in seconds and codes of the last maze.
+    """
+    times = []
+    for seed in range(repeat):
+        rng = random.Random(seed)
+        start = time.perf_counter()
+        codes = generate(algorithm, width, height, rng=rng)
+        times.append(time.perf_counter() - start)
+    return min(times), codes
+
+
+def texture(codes: bytearray, width: int) -> tuple[float, float]:
+    """ Describe the texture of a maze.
+    :param codes: direction codes of the fields.
+    :param width: number of fields in a row.
+    :return: tuple: shares of dead ends and of straight fields.
+    """
+    offsets = {code: row * width + column
+               for code, (row, column) in OFFSETS.items()}
+    # offsets of passages of every field
+    passages = [[] for _ in codes]
+    for cell, code in enumerate(codes):
+        if code != ROOT:
+            parent = cell + offsets[code]
+            passages[cell].append(parent - cell)
+            passages[parent].append(cell - parent)
+    dead_ends = sum(len(cell) == 1 for cell in passages)
+    straight = sum(len(cell) == 2 and cell[0] == -cell[1]
+                   for cell in passages)
+    return dead_ends / len(codes), straight / len(codes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        "Benchmark generators of the `generators` registry")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300],
+                        help="sides of square mazes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--algorithms", nargs="+", default=list(GENERATORS),
+                        choices=list(GENERATORS))
+    arguments = parser.parse_args()
+
+    print(f"{'algorithm':>12} {'size':>11} {'fields/s':>12} "
+          f"{'dead ends':>10} {'straight':>9}")
+    for side in arguments.sizes:
+        for algorithm in arguments.algorithms:
+            seconds, codes = best_time(algorithm, side, side,
+                                       arguments.repeat)
+            dead_ends, straight = texture(codes, side)
+            print(f"{algorithm:>12} {side:>5}x{side:<5} "
+                  f"{side * side / seconds:>12,.0f} {dead_ends:>10.1%} "
+                  f"{straight:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+""" Compare the lockstep MazeBatch with a loop creating the same mazes
+one by one with MazePath and extracting their walls with WallGrid.
+
+Usage (from the repository's root):
+    python -m benchmarks.bench_lockstep [--size 10 10]
+        [--counts 1000 10000 100000] [--loop 1000]
+        [--algorithms backtracker binary_tree sidewinder]
+
+Requires numpy.
+"""
+import argparse
+import time
+from src import MazePath, WallGrid
+from src.lockstep import ALGORITHMS, MazeBatch
+
+
+def loop_rate(width: int, height: int, count: int, algorithm: str) -> float:
+    """ Measure the rate of the loop over MazePath.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param count: number of mazes.
+    :param algorithm: name of the generator.
+    :return: mazes per second.
+    """
+    start = time.perf_counter()
+    for seed in range(count):
+        maze = MazePath(width, height, compact=True, seed=seed,
+                        algorithm=algorithm)
+        WallGrid(maze)
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        "Benchmark MazeBatch against a loop over MazePath")
+    parser.add_argument("--size", type=int, nargs=2, default=[10, 10],
+                        help="width and height of the mazes")
+    parser.add_argument("--counts", type=int, nargs="+",
+                        default=[1000, 10000, 100000],
+                        help="sizes of batches")
+    parser.add_argument("--loop", type=int, default=1000,
+                        help="number of mazes created by the loop")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS),
+                        choices=ALGORITHMS)
+    arguments = parser.parse_args()
+    width, height = arguments.size
+
+    print(f"{'algorithm':>12} {'engine':>16} {'mazes/s':>12} {'speedup':>8}")
+    for algorithm in arguments.algorithms:
+        baseline = loop_rate(width, height, arguments.loop, algorithm)
+        print(f"{algorithm:>12} {'MazePath loop':>16} {baseline:>12,.0f} "
+              f"{1:>7.1f}x")
+        for count in arguments.counts:
+            start = time.perf_counter()
+            MazeBatch(count, width, height, seed=0, algorithm=algorithm)
+            rate = count / (time.perf_counter() - start)
+            print(f"{algorithm:>12} {f'batch of {count}':>16} "
+                  f"{rate:>12,.0f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
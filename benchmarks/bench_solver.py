@@ -0,0 +1,93 @@
+""" Compare path queries answered by MazeSolver with a breadth-first
+search run for every query.
+
+Usage (from the repository's root):
+    python -m benchmarks.bench_solver [--size 500] [--queries 1000]
+        [--bfs-queries 20]
+
+The time of building the index is reported separately, so the number
+of queries after which it pays off can be read from the results.
+"""
+import argparse
+import random
+import time
+from collections import deque
+from src import MazePath, MazeSolver
+from src.compact_fields import ROOT, UP, DOWN, LEFT, RIGHT
+
+
+def bfs_distance(codes: bytearray, width: int, a: int, b: int) -> int:
+    """ Count the steps between two fields with a breadth-first search
+    over passages read from the direction codes.
+    :param codes: direction codes of the maze.
+    :param width: number of fields in a row.
+    :param a: index of a field.
+    :param b: index of a field.
+    :return: number of steps.
+    """
+    size = len(codes)
+    distances = {a: 0}
+    queue = deque([a])
+    while queue:
+        cell = queue.popleft()
+        if cell == b:
+            return distances[cell]
+        code = codes[cell]
+        neighbours = []
+        if code != ROOT:
+            neighbours.append(cell + {UP: -width, DOWN: width,
+                                      LEFT: -1, RIGHT: 1}[code])
+        # fields pointing to this one
+        if cell >= width and codes[cell - width] == DOWN:
+            neighbours.append(cell - width)
+        if cell + width < size and codes[cell + width] == UP:
+            neighbours.append(cell + width)
+        if cell % width and codes[cell - 1] == RIGHT:
+            neighbours.append(cell - 1)
+        if (cell + 1) % width and codes[cell + 1] == LEFT:
+            neighbours.append(cell + 1)
+        for neighbour in neighbours:
+            if neighbour not in distances:
+                distances[neighbour] = distances[cell] + 1
+                queue.append(neighbour)
+    raise ValueError("The fields are not connected.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        "Benchmark MazeSolver against breadth-first search")
+    parser.add_argument("--size", type=int, default=500,
+                        help="side of a square maze")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--bfs-queries", type=int, default=20)
+    arguments = parser.parse_args()
+    side = arguments.size
+    maze = MazePath(side, side, compact=True, fast=True, seed=0)
+    rng = random.Random(1)
+    pairs = [((rng.randrange(side), rng.randrange(side)),
+              (rng.randrange(side), rng.randrange(side)))
+             for _ in range(max(arguments.queries, arguments.bfs_queries))]
+
+    start = time.perf_counter()
+    solver = MazeSolver(maze)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    for a, b in pairs[:arguments.queries]:
+        solver.distance(a, b)
+    index = (time.perf_counter() - start) / arguments.queries
+    codes = maze.get_codes()
+    start = time.perf_counter()
+    for (ai, aj), (bi, bj) in pairs[:arguments.bfs_queries]:
+        bfs_distance(codes, side, ai * side + aj, bi * side + bj)
+    bfs = (time.perf_counter() - start) / arguments.bfs_queries
+
+    print(f"index built in {build:.3f} s, {len(solver.up)} levels")
+    print(f"{'method':>8} {'s/query':>12}")
+    print(f"{'index':>8} {index:>12.2e}")
+    print(f"{'bfs':>8} {bfs:>12.2e}")
+    print(f"the index pays off after {build / max(bfs - index, 1e-12):.0f} "
+          f"queries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+""" Measure how the wall-clock time of tiled generation scales with
+the number of worker processes.
+
+Usage (from the repository's root):
+    python -m benchmarks.bench_tiled [--size 2000] [--tile 250]
+        [--workers 1 2 4] [--algorithm backtracker]
+
+The single MazePath generation is measured as the baseline; tiled
+mazes with one worker show the cost of splitting and stitching alone.
+"""
+import argparse
+import os
+import time
+from src import MazePath
+from src.generators import GENERATORS
+from src.tiled import generate_tiled
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        "Benchmark tiled generation against a single MazePath")
+    parser.add_argument("--size", type=int, default=2000,
+                        help="side of a square maze")
+    parser.add_argument("--tile", type=int, default=250,
+                        help="side of a square tile")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument("--algorithm", default="backtracker",
+                        choices=list(GENERATORS))
+    arguments = parser.parse_args()
+    side, fields = arguments.size, arguments.size ** 2
+
+    start = time.perf_counter()
+    MazePath(side, side, compact=True, algorithm=arguments.algorithm,
+             seed=0)
+    single = time.perf_counter() - start
+    print(f"{'workers':>8} {'seconds':>8} {'fields/s':>12} {'speedup':>8}")
+    print(f"{'single':>8} {single:>8.2f} {fields / single:>12,.0f} "
+          f"{1:>7.1f}x")
+    for workers in arguments.workers:
+        start = time.perf_counter()
+        generate_tiled(side, side, arguments.tile, arguments.tile,
+                       arguments.algorithm, seed=0, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {elapsed:>8.2f} {fields / elapsed:>12,.0f} "
+              f"{single / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+""" Show that extracting trunks with Tree takes time proportional to
+the number of wall points.
+
+Usage (from the repository's root):
+    python -m benchmarks.bench_tree [--max-cells 10000000] [--factor 10]
+
+Mazes are generated with the flat-index kernel in the compact mode, and
+their walls are passed to Tree as a CSRAdjacency, so that the ladder can
+reach 10^7 fields. Only building the Tree is timed, with the garbage
+collector paused like in `timeit`: its full collections scan the whole
+heap and would hide the behaviour of the algorithm itself. For linear
+behaviour the time per wall point stays flat as the mazes grow.
+"""
+import argparse
+import gc
+import math
+import time
+from src import CSRAdjacency, MazePath, Tree
+
+
+def measure(cells: int) -> tuple[int, int, float]:
+    """ Generate a square-ish maze with about `cells` fields and time
+    building a Tree from its walls.
+    :param cells: requested number of fields.
+    :return: tuple: number of fields, number of wall points, time in seconds.
+    """
+    width = math.isqrt(cells)
+    height = cells // width
+    adjacency = CSRAdjacency.from_maze(
+        MazePath(width, height, compact=True, fast=True))
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        Tree(adjacency)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    return width * height, len(adjacency), elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("Benchmark scaling of Tree")
+    parser.add_argument("--min-cells", type=int, default=10 ** 4)
+    parser.add_argument("--max-cells", type=int, default=10 ** 7)
+    parser.add_argument("--factor", type=int, default=10,
+                        help="growth of the number of fields between steps")
+    arguments = parser.parse_args()
+
+    print(f"{'fields':>12} {'wall points':>12} {'time [s]':>10} "
+          f"{'ns/point':>10} {'relative':>9}")
+    first = None
+    cells = arguments.min_cells
+    while cells <= arguments.max_cells:
+        fields, points, elapsed = measure(cells)
+        per_point = elapsed / points * 1e9
+        first = first or per_point
+        print(f"{fields:>12,} {points:>12,} {elapsed:>10.2f} "
+              f"{per_point:>10.0f} {per_point / first:>8.2f}x")
+        cells *= arguments.factor
+
+
+if __name__ == "__main__":
+    main()
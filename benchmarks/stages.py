@@ -0,0 +1,230 @@
+""" Time every stage of the pipeline drawing a maze and record its peak
+memory over a ladder of sizes, save the results as JSON and compare them
+with a baseline saved before, to catch regressions.
+
+Usage (from the repository's root):
+    python -m benchmarks.stages [--sizes 10 30 100 300 1000 2000 4000]
+        [--pipeline classic] [--repeat 3] [--output results.json]
+        [--baseline baseline.json] [--tolerance 0.2]
+
+Pipelines:
+    classic - MazePath as nested lists, PointsDict, get_points_dict, Tree
+        and iteration of Instructions, as in the original program,
+    compact - MazePath in the compact mode with the flat-index kernel,
+        CSRAdjacency, Tree and iteration of compressed Instructions.
+Sizes are sides of square mazes. The largest mazes of the classic
+pipeline need many gigabytes of memory, so pass a shorter ladder on
+smaller machines.
+
+Every stage is timed `repeat` times, with the garbage collector paused
+like in `timeit`, and the shortest time is kept. Then the pipeline runs
+once more under `tracemalloc`, which slows it down, to record the peak
+memory of every stage. With a baseline, every stage slower or bigger
+than the baseline by more than `tolerance` is reported and the exit
+status is 1. Times shorter than `--min-seconds` are too noisy and
+are not compared.
+
+benchmarks/baseline.json holds results of the classic pipeline for
+sizes 10 to 300 on the machine of its last update, so
+    python -m benchmarks.stages --sizes 10 30 100 300 \
+        --baseline benchmarks/baseline.json
+checks for regressions out of the box. Times depend on the machine, so
+before comparing on another one, or after an intended change, save
+a new baseline from the commit to compare with:
+    python -m benchmarks.stages --sizes 10 30 100 300 \
+        --output benchmarks/baseline.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from src import CSRAdjacency, Instructions, MazePath, PointsDict, Tree
+
+SIZES = [10, 30, 100, 300, 1000, 2000, 4000]
+
+# stage's name and function receiving the side of the maze and the value
+# returned by the previous stage
+Stage = tuple[str, Callable]
+
+
+def _iterate(instructions: Instructions) -> int:
+    """ Exhaust Instructions.
+    :param instructions: Instructions object.
+    :return: number of lines.
+    """
+    return sum(1 for _ in instructions)
+
+
+PIPELINES: dict[str, list[Stage]] = {
+    "classic": [
+        ("MazePath", lambda side, _: MazePath(side, side)),
+        ("PointsDict", lambda side, maze: PointsDict(maze)),
+        ("get_points_dict",
+         lambda side, points: points.get_points_dict()),
+        ("Tree", lambda side, points_dict: Tree(points_dict)),
+        ("Instructions",
+         lambda side, tree: _iterate(Instructions(tree.trunks))),
+    ],
+    "compact": [
+        ("MazePath",
+         lambda side, _: MazePath(side, side, compact=True, fast=True)),
+        ("CSRAdjacency",
+         lambda side, maze: CSRAdjacency.from_maze(maze)),
+        ("Tree", lambda side, adjacency: (Tree(adjacency), adjacency)),
+        ("Instructions",
+         lambda side, value: _iterate(Instructions(
+             value[0].trunks, value[1].point, compress=True))),
+    ],
+}
+
+
+def time_stages(stages: list[Stage], side: int) -> list[float]:
+    """ Run the pipeline once and time its stages.
+    :param stages: list of stages.
+    :param side: side of the maze.
+    :return: list of times in seconds.
+    """
+    times = []
+    value = None
+    gc.collect()
+    gc.disable()
+    try:
+        for _, function in stages:
+            start = time.perf_counter()
+            value = function(side, value)
+            times.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return times
+
+
+def trace_stages(stages: list[Stage], side: int) -> list[int]:
+    """ Run the pipeline once under tracemalloc and record the peak memory
+    of every stage, including the values kept from previous stages.
+    :param stages: list of stages.
+    :param side: side of the maze.
+    :return: list of peaks in bytes.
+    """
+    peaks = []
+    value = None
+    tracemalloc.start()
+    try:
+        for _, function in stages:
+            tracemalloc.reset_peak()
+            value = function(side, value)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def run(pipeline: str, sizes: list[int], repeat: int,
+        memory: bool = True) -> dict:
+    """ Benchmark a pipeline over a ladder of sizes.
+    :param pipeline: name of the pipeline.
+    :param sizes: sides of square mazes.
+    :param repeat: number of timed runs of every size.
+    :param memory: record peak memory too.
+    :return: dictionary of results, ready to be saved as JSON.
+    """
+    stages = PIPELINES[pipeline]
+    results = {}
+    for side in sizes:
+        runs = [time_stages(stages, side) for _ in range(repeat)]
+        peaks = trace_stages(stages, side) if memory else None
+        size = results[f"{side}x{side}"] = {}
+        for index, (name, _) in enumerate(stages):
+            size[name] = {"seconds": min(times[index] for times in runs)}
+            if peaks is not None:
+                size[name]["peak_bytes"] = peaks[index]
+    return {"pipeline": pipeline,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results}
+
+
+def compare(results: dict, baseline: dict, tolerance: float,
+            min_seconds: float) -> list[str]:
+    """ Find stages slower or bigger than in the baseline.
+    :param results: dictionary returned by `run`.
+    :param baseline: dictionary returned by `run` before.
+    :param tolerance: allowed relative growth, e.g. 0.2 for 20 %.
+    :param min_seconds: shortest time that is compared.
+    :return: list of descriptions of regressions.
+    """
+    regressions = []
+    if results["pipeline"] != baseline["pipeline"]:
+        return [f"pipeline {results['pipeline']} differs from the "
+                f"baseline's {baseline['pipeline']}"]
+    for size, stages in results["results"].items():
+        for stage, current in stages.items():
+            before = baseline["results"].get(size, {}).get(stage)
+            if before is None:
+                continue
+            for key, unit in (("seconds", "s"), ("peak_bytes", "B")):
+                if key not in current or key not in before:
+                    continue
+                if key == "seconds" and before[key] < min_seconds:
+                    continue
+                if current[key] > before[key] * (1 + tolerance):
+                    regressions.append(
+                        f"{size} {stage}: {key} {before[key]:.4g} {unit} "
+                        f"-> {current[key]:.4g} {unit} "
+                        f"({current[key] / before[key] - 1:+.0%})")
+    return regressions
+
+
+def report(results: dict) -> None:
+    """ Print results as a table.
+    :param results: dictionary returned by `run`.
+    """
+    print(f"{'size':>11} {'stage':>16} {'seconds':>10} {'peak MiB':>10}")
+    for size, stages in results["results"].items():
+        for stage, values in stages.items():
+            peak = values.get("peak_bytes")
+            peak = "" if peak is None else f"{peak / 2 ** 20:.1f}"
+            print(f"{size:>11} {stage:>16} {values['seconds']:>10.4f} "
+                  f"{peak:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        "Benchmark stages of the pipeline drawing a maze")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="sides of square mazes")
+    parser.add_argument("--pipeline", choices=list(PIPELINES),
+                        default="classic")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the run recording peak memory")
+    parser.add_argument("--output", help="save the results as JSON")
+    parser.add_argument("--baseline",
+                        help="compare the results with a saved JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--min-seconds", type=float, default=0.001)
+    arguments = parser.parse_args()
+
+    results = run(arguments.pipeline, arguments.sizes, arguments.repeat,
+                  not arguments.no_memory)
+    report(results)
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, arguments.tolerance,
+                              arguments.min_seconds)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
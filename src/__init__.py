@@ -1,4 +1,11 @@
-from .args_parser import parse_args
+from .args_parser import parse_args, parse_batch_args
+from .cache import CachedMaze, MazeCache
+from .compact_fields import CompactFields
+from .csr import CSRAdjacency
+from .infinite import InfiniteMaze
 from .maze_path import MazePath
+from .maze_file import MazeFile, save_maze
 from .points_dict import PointsDict
-from .tree import Branch, Tree, Instructions
+from .solver import MazeSolver
+from .tree import Branch, CSRBranch, Tree, Instructions
+from .wall_grid import WallGrid, build_points_dict
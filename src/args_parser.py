@@ -1,6 +1,7 @@
 import argparse
 from argparse import Namespace
 from typing import List
+from .generators import GENERATORS
 
 
 def positive(value: str) -> int:
@@ -39,9 +40,188 @@ def parse_args(args: List[str]) -> Namespace:
         nargs=1,
         default=[15],
     )
+    parser.add_argument(
+        "-a",
+        "--algorithm",
+        help="algorithm generating the maze; defaults to backtracker",
+        choices=list(GENERATORS),
+        default="backtracker",
+    )
+    parser.add_argument(
+        "--tile",
+        help="create the maze in tiles of width, height cells generated "
+             "in parallel processes and connected into one maze",
+        type=positive,
+        nargs=2,
+        metavar=("WIDTH", "HEIGHT"),
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        help="number of processes creating the tiles; defaults to "
+             "the number of CPUs",
+        type=positive,
+    )
+    parser.add_argument(
+        "--mapped",
+        help="create the maze out of core with the backtracker, in "
+             "a memory-mapped file at PATH; the png, ppm and svg backends "
+             "then read it row by row",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--distances",
+        help="save the number of steps from the entrance to every field "
+             "at PATH, as little-endian unsigned 32-bit ints computed in "
+             "a memory-mapped file",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--heatmap",
+        help="save the distances from the entrance as a PNG heatmap at PATH, "
+             "one pixel per field",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "-b",
+        "--backend",
+        help="drawing backend: the animated turtle, a plain tkinter "
+             "canvas drawing the maze at once, or a PNG, PPM or SVG image "
+             "saved without any display; defaults to turtle",
+        choices=["turtle", "canvas", "png", "ppm", "svg"],
+        default="turtle",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="path of the image saved by the png, ppm and svg backends; "
+             "defaults to maze.png, maze.ppm or maze.svg",
+    )
+    parser.add_argument(
+        "--merge",
+        help="write all lines of an SVG image as a single path",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--chain",
+        help="draw the lines in an order chaining each one to the nearest "
+             "end of the previous one, which shortens the travel of "
+             "the lifted pen",
+        action="store_true",
+    )
     parser.add_argument(
         "--slow", help="slow the turtle down", action="store_true")
+    parser.add_argument(
+        "--flush-every",
+        help="update the screen after every N moves of the turtle "
+             "instead of after each of them",
+        type=positive,
+        metavar="N",
+    )
+    parser.add_argument(
+        "--flush-ms",
+        help="update the screen at least every MS milliseconds "
+             "instead of after each move of the turtle",
+        type=positive,
+        metavar="MS",
+    )
+    parser.add_argument(
+        "--instant",
+        help="draw the whole maze at once, without animation",
+        action="store_true",
+    )
     parser.add_argument(
         "--close", help="close the turtle window when finished", action="store_true"
     )
-    return parser.parse_args(args)
+    parser.add_argument(
+        "--profile",
+        help="report wall time and CPU time of every stage with counters "
+             "of their work to standard error, as a table or JSON",
+        nargs="?",
+        choices=["table", "json"],
+        const="table",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        help="report peak memory of every stage traced by tracemalloc too; "
+             "tracing slows the stages down many times",
+        action="store_true",
+    )
+    arguments = parser.parse_args(args)
+    if arguments.mapped and arguments.tile:
+        parser.error("--mapped cannot be combined with --tile")
+    if arguments.mapped and arguments.algorithm != "backtracker":
+        parser.error("--mapped creates the maze with the backtracker only")
+    return arguments
+
+
+def parse_batch_args(args: List[str]) -> Namespace:
+    """ Parse command line arguments of the batch mode.
+    :param args:Arguments as a list of strings.
+    :return: Namespace object with parsed values
+        as attributes.
+    """
+    parser = argparse.ArgumentParser(
+        "batch", description="Creates many mazes in parallel processes "
+                             "and saves them as images")
+    parser.add_argument(
+        "-n",
+        "--count",
+        help="number of mazes of every size; defaults to 1",
+        type=positive,
+        default=1,
+    )
+    parser.add_argument(
+        "-s",
+        "--size",
+        help="number of cells: width, height; may be repeated; "
+             "defaults to 40, 20",
+        type=positive,
+        nargs=2,
+        action="append",
+    )
+    parser.add_argument(
+        "--seed",
+        help="seed of the first maze; the following ones get consecutive "
+             "seeds; defaults to 0",
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        "-c",
+        "--cell",
+        help="side of one cell in pixels; defaults to 15",
+        type=positive,
+        nargs=1,
+        default=[15],
+    )
+    parser.add_argument(
+        "-a",
+        "--algorithm",
+        help="algorithm generating the maze; defaults to backtracker",
+        choices=list(GENERATORS),
+        default="backtracker",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        help="format of the images; defaults to png",
+        choices=["png", "ppm", "svg"],
+        default="png",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="directory for the images; defaults to mazes",
+        default="mazes",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        help="number of worker processes; defaults to the number of CPUs",
+        type=positive,
+    )
+    arguments = parser.parse_args(args)
+    if arguments.size is None:
+        arguments.size = [[40, 20]]
+    return arguments
@@ -0,0 +1,87 @@
+import os
+import time
+from argparse import Namespace
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from .csr import CSRAdjacency
+from .export import save
+from .maze_path import MazePath
+from .tree import Instructions, Tree
+
+# width, height, seed, step, image format, output directory, algorithm
+Job = tuple[int, int, int, int, str, str, str]
+# path, process id, number of fields, time in seconds
+Result = tuple[str, int, int, float]
+
+
+def generate(job: Job) -> Result:
+    """ Run the whole pipeline for one maze: MazePath, CSRAdjacency, Tree,
+    Instructions and export. Executed in worker processes.
+    :param job: tuple: width, height, seed, step, image format,
+        output directory and generation algorithm.
+    :return: tuple: path of the image, worker's process id, number
+        of fields and time of the work in seconds.
+    """
+    width, height, seed, step, image_format, directory, algorithm = job
+    start = time.perf_counter()
+    maze = MazePath(width, height, compact=True, seed=seed,
+                    algorithm=algorithm)
+    adjacency = CSRAdjacency.from_maze(maze)
+    instructions = Instructions(Tree(adjacency).trunks, adjacency.point,
+                                compress=True)
+    path = os.path.join(directory,
+                        f"maze_{algorithm}_{width}x{height}_{seed}."
+                        f"{image_format}")
+    save(instructions, path, width, height, step, image_format)
+    return path, os.getpid(), width * height, time.perf_counter() - start
+
+
+def get_jobs(arguments: Namespace) -> list[Job]:
+    """ Create a job for every maze: `count` mazes of every size, with
+    consecutive seeds starting from the base seed.
+    :param arguments: Namespace returned by `parse_batch_args`.
+    :return: list of jobs.
+    """
+    jobs = []
+    seed = arguments.seed
+    for width, height in arguments.size:
+        for _ in range(arguments.count):
+            jobs.append((width, height, seed, arguments.cell[0],
+                         arguments.format, arguments.output_dir,
+                         arguments.algorithm))
+            seed += 1
+    return jobs
+
+
+def run_batch(arguments: Namespace,
+              report: Callable[[str], None] = print) -> list[Result]:
+    """ Generate mazes in a pool of processes and report the throughput
+    of every worker and of the whole batch.
+    :param arguments: Namespace returned by `parse_batch_args`.
+    :param report: function receiving lines of the report.
+    :return: list of results, in the order of jobs.
+    """
+    os.makedirs(arguments.output_dir, exist_ok=True)
+    jobs = get_jobs(arguments)
+    workers = arguments.workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            generate, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    elapsed = time.perf_counter() - start
+
+    per_worker = defaultdict(lambda: [0, 0, 0.0])
+    for _, pid, fields, busy in results:
+        stats = per_worker[pid]
+        stats[0] += 1
+        stats[1] += fields
+        stats[2] += busy
+    for pid, (mazes, fields, busy) in sorted(per_worker.items()):
+        report(f"worker {pid}: {mazes} mazes, {mazes / busy:.1f} mazes/s, "
+               f"{fields / busy:,.0f} fields/s")
+    total_fields = sum(result[2] for result in results)
+    report(f"{len(results)} mazes in {elapsed:.2f} s with {workers} "
+           f"workers: {len(results) / elapsed:.1f} mazes/s, "
+           f"{total_fields / elapsed:,.0f} fields/s")
+    return results
@@ -0,0 +1,259 @@
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from .csr import CSRAdjacency
+from .generators import GENERATORS
+from .maze_path import MazePath
+from .tree import Instructions, Tree
+
+MAGIC = b"MZC2"
+# width, height, length of the algorithm's name, length of the seed
+# written as decimal text, number of lines, number of points
+HEADER = struct.Struct("<IIHHII")
+SUFFIX = ".maze"
+TEMPORARY_SUFFIX = ".tmp"
+# age after which temporary files are left by crashed writers
+STALE_SECONDS = 3600
+
+
+class CachedMaze:
+    """ A maze together with the lines of its trunks and their branches
+    in the order of Instructions, compressed to ends and corners.
+    """
+
+    def __init__(self, maze: MazePath,
+                 lines: list[list[tuple[int, int]]]) -> None:
+        """ Initialize an instance.
+        :param maze: MazePath object.
+        :param lines: list of lines of (y, x) coordinates.
+        """
+        self.maze = maze
+        self.lines = lines
+
+
+def _to_little_endian(values: array) -> bytes:
+    """ Serialize an array in the byte order used by cache files.
+    :param values: array of integers.
+    :return: bytes.
+    """
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    """ Deserialize an array saved with `_to_little_endian`.
+    :param typecode: typecode of the array.
+    :param data: bytes.
+    :return: array of integers.
+    """
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class MazeCache:
+    """ Content-addressed cache of generated mazes on disk. Every entry is
+    a file named after a hash of (width, height, algorithm, seed) holding
+    the maze's direction codes and the lines of its trunks. Files are
+    written atomically, and the least recently used ones are removed
+    whenever the cache grows over `max_bytes`, so the directory may be
+    shared by many processes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30) -> None:
+        """ Initialize an instance.
+        :param directory: directory of the cache; created if missing.
+        :param max_bytes: maximal total size of the cached files.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, width: int, height: int, seed: int,
+             algorithm: str = "backtracker") -> str:
+        """ Get the path of the file of a maze.
+        :param width: number of fields in a row.
+        :param height: number of rows.
+        :param seed: seed of the maze.
+        :param algorithm: name of the generation algorithm.
+        :return: path of the file.
+        """
+        key = f"{width}x{height}:{algorithm}:{seed}".encode()
+        return os.path.join(self.directory,
+                            hashlib.sha256(key).hexdigest() + SUFFIX)
+
+    def get(self, width: int, height: int, seed: int,
+            algorithm: str = "backtracker") -> CachedMaze | None:
+        """ Load a maze from the cache and mark it as recently used.
+        :param width: number of fields in a row.
+        :param height: number of rows.
+        :param seed: seed of the maze.
+        :param algorithm: name of the generation algorithm.
+        :return: CachedMaze object or None if the maze is not cached.
+        """
+        path = self.path(width, height, seed, algorithm)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        try:
+            return self._decode(data, (width, height, seed, algorithm))
+        except (struct.error, UnicodeDecodeError, ValueError):
+            # a damaged file is a miss, and it is removed
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            return None
+
+    def put(self, cached: CachedMaze, algorithm: str = "backtracker") -> None:
+        """ Save a maze in the cache and evict the least recently used
+        entries if the cache is too big. Mazes without a seed cannot be
+        found again, so they are not saved.
+        :param cached: CachedMaze object.
+        :param algorithm: name of the generation algorithm.
+        """
+        maze = cached.maze
+        if maze.seed is None:
+            return
+        path = self.path(maze.width, maze.height, maze.seed, algorithm)
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory,
+                                                 suffix=TEMPORARY_SUFFIX)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(self._encode(cached, algorithm))
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self.evict()
+
+    def get_or_create(self, width: int, height: int, seed: int,
+                      algorithm: str = "backtracker") -> CachedMaze:
+        """ Load a maze from the cache, or generate it, extract its trunks
+        and save it in the cache.
+        :param width: number of fields in a row.
+        :param height: number of rows.
+        :param seed: seed of the maze.
+        :param algorithm: name of the generation algorithm.
+        :return: CachedMaze object.
+        """
+        if algorithm not in GENERATORS:
+            raise ValueError(f"Unknown algorithm: {algorithm}.")
+        cached = self.get(width, height, seed, algorithm)
+        if cached is None:
+            maze = MazePath(width, height, compact=True, seed=seed,
+                            algorithm=algorithm)
+            adjacency = CSRAdjacency.from_maze(maze)
+            lines = list(Instructions(Tree(adjacency).trunks,
+                                      adjacency.point, compress=True))
+            cached = CachedMaze(maze, lines)
+            self.put(cached, algorithm)
+        return cached
+
+    def evict(self) -> None:
+        """ Remove the least recently used files until the total size
+        of the cache is not bigger than `max_bytes`, and temporary files
+        older than STALE_SECONDS, left by writers that crashed.
+        """
+        entries = []
+        stale = time.time() - STALE_SECONDS
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                temporary = entry.name.endswith(TEMPORARY_SUFFIX)
+                if not (temporary or entry.name.endswith(SUFFIX)):
+                    continue
+                try:
+                    stat = entry.stat()
+                    if temporary:
+                        if stat.st_mtime < stale:
+                            os.unlink(entry.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    @staticmethod
+    def _encode(cached: CachedMaze, algorithm: str) -> bytes:
+        """ Serialize a maze: header, algorithm's name, seed as decimal
+        text, so seeds of any size fit, direction codes, lengths of lines
+        and ids of their points.
+        :param cached: CachedMaze object.
+        :param algorithm: name of the generation algorithm.
+        :return: bytes.
+        """
+        maze = cached.maze
+        columns = maze.width + 1
+        lengths = array("I", map(len, cached.lines))
+        points = array("I", (row * columns + column
+                             for line in cached.lines
+                             for row, column in line))
+        name = algorithm.encode()
+        seed = str(maze.seed).encode()
+        return b"".join((MAGIC,
+                         HEADER.pack(maze.width, maze.height, len(name),
+                                     len(seed), len(lengths), len(points)),
+                         name,
+                         seed,
+                         bytes(maze.get_codes()),
+                         _to_little_endian(lengths),
+                         _to_little_endian(points)))
+
+    @staticmethod
+    def _decode(data: bytes, expected: tuple) -> CachedMaze | None:
+        """ Deserialize a maze saved with `_encode`.
+        :param data: content of a file.
+        :param expected: tuple: width, height, seed and algorithm
+            of the requested maze.
+        :return: CachedMaze object or None if the file holds another maze
+            or was saved in another format.
+        :raise: struct.error, UnicodeDecodeError or ValueError if the file
+            is damaged.
+        """
+        if data[:4] != MAGIC:
+            return None
+        width, height, name_length, seed_length, count, total = \
+            HEADER.unpack_from(data, 4)
+        position = 4 + HEADER.size
+        algorithm = data[position:position + name_length].decode()
+        position += name_length
+        seed = int(data[position:position + seed_length].decode())
+        position += seed_length
+        if (width, height, seed, algorithm) != expected:
+            return None
+        cells = width * height
+        if len(data) != position + cells + 4 * (count + total):
+            raise ValueError("The file is truncated.")
+        codes = bytearray(data[position:position + cells])
+        position += cells
+        lengths = _from_little_endian("I", data[position:position + 4 * count])
+        position += 4 * count
+        points = _from_little_endian("I", data[position:])
+        columns = width + 1
+        lines = []
+        start = 0
+        for length in lengths:
+            lines.append([divmod(point, columns)
+                          for point in points[start:start + length]])
+            start += length
+        maze = MazePath.from_codes(width, height, codes, seed=seed)
+        return CachedMaze(maze, lines)
@@ -0,0 +1,37 @@
+import tkinter
+from collections.abc import Iterable
+
+MARGIN = 10
+
+
+def draw(instructions: Iterable,
+         step: int,
+         width: int,
+         height: int) -> tkinter.Tk:
+    """ Draw lines yielded by Instructions on a plain tkinter Canvas,
+    with a single `create_line` call per line. The maze is oriented
+    like in the turtle window: the first row of points at the bottom.
+    :param instructions: iterable of lines of (y, x) coordinates.
+    :param step: side of one cell in pixels.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :return: the Tk window containing the canvas; call its `mainloop`
+        to keep it open.
+    """
+    root = tkinter.Tk()
+    root.title("Maze")
+    bottom = MARGIN + height * step
+    canvas = tkinter.Canvas(root,
+                            width=width * step + 2 * MARGIN,
+                            height=bottom + MARGIN,
+                            background="white",
+                            highlightthickness=0)
+    canvas.pack()
+    for line in instructions:
+        coordinates = []
+        for y, x in line:
+            coordinates.append(MARGIN + x * step)
+            coordinates.append(bottom - y * step)
+        canvas.create_line(*coordinates, capstyle=tkinter.PROJECTING)
+    root.update()
+    return root
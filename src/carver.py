@@ -0,0 +1,95 @@
+import random
+from .compact_fields import ROOT, UP, DOWN, LEFT, RIGHT
+
+RANDOM_BITS = 64
+
+
+def carve(width: int, height: int,
+          codes: bytearray | None = None,
+          rng: random.Random | None = None,
+          visited: bytearray | None = None) -> bytearray:
+    """ Create a maze's schema with the same randomized depth-first
+    backtracking as MazePath._create_path, working on flat indices
+    of fields instead of tuples of coordinates.
+    The fields are tracked in a visited bitmap surrounded with a frame
+    of already visited sentinels, so each neighbour is checked with
+    a single precomputed offset and no range tests. Random choices
+    are served from bits of batched `getrandbits` calls. Stepping back
+    follows the direction codes, so no separate stack is needed.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param codes: optional buffer of width * height zeroed bytes to be
+        filled with direction codes (see the `compact_fields` module).
+    :param rng: source of randomness; the `random` module by default.
+    :param visited: optional buffer of (width + 2) * (height + 2) zeroed
+        bytes for the visited bitmap, e.g. a memory-mapped file.
+    :return: buffer of direction codes.
+    """
+    rng = rng or random
+    size = width * height
+    if codes is None:
+        codes = bytearray(size)
+    if not size:
+        return codes
+    padded = width + 2
+    if visited is None:
+        visited = bytearray(b"\x01" * padded)
+        visited += (b"\x01" + bytes(width) + b"\x01") * height
+        visited += b"\x01" * padded
+    else:
+        frame = b"\x01" * padded
+        visited[:padded] = frame
+        visited[(height + 1) * padded:(height + 2) * padded] = frame
+        for point in range(padded - 1, (height + 1) * padded, padded):
+            visited[point:point + 2] = b"\x01\x01"
+    # (offset in the bitmap, offset in codes, code of the new field)
+    moves = ((-padded, -width, DOWN), (padded, width, UP),
+             (-1, -1, RIGHT), (1, 1, LEFT))
+    back = {DOWN: (padded, width), UP: (-padded, -width),
+            RIGHT: (1, 1), LEFT: (-1, -1)}
+    # moves available for every combination of unvisited neighbours
+    table = [tuple(move for bit, move in enumerate(moves) if mask >> bit & 1)
+             for mask in range(16)]
+    getrandbits = rng.getrandbits
+    bits, bits_left = 0, 0
+
+    cell = rng.randrange(size)
+    row, column = divmod(cell, width)
+    point = (row + 1) * padded + column + 1
+    visited[point] = 1
+    codes[cell] = ROOT
+    remaining = size - 1
+    while remaining:
+        mask = (visited[point - padded] | visited[point + padded] << 1 |
+                visited[point - 1] << 2 | visited[point + 1] << 3)
+        if mask == 15:
+            step_point, step_cell = back[codes[cell]]
+            point += step_point
+            cell += step_cell
+            continue
+        available = table[mask ^ 15]
+        count = len(available)
+        if count == 1:
+            move = available[0]
+        else:
+            while True:
+                if bits_left < 2:
+                    bits, bits_left = getrandbits(RANDOM_BITS), RANDOM_BITS
+                if count == 2:
+                    index = bits & 1
+                    bits >>= 1
+                    bits_left -= 1
+                    break
+                index = bits & 3
+                bits >>= 2
+                bits_left -= 2
+                if index < count:
+                    break
+            move = available[index]
+        step_point, step_cell, code = move
+        point += step_point
+        cell += step_cell
+        visited[point] = 1
+        codes[cell] = code
+        remaining -= 1
+    return codes
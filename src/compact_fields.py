@@ -0,0 +1,131 @@
+from collections.abc import Iterator
+from typing import Self
+
+UNVISITED, ROOT, UP, DOWN, LEFT, RIGHT = range(6)
+OFFSETS = {UP: (-1, 0), DOWN: (1, 0), LEFT: (0, -1), RIGHT: (0, 1)}
+CODES = {offset: code for code, offset in OFFSETS.items()}
+
+
+def decode(i: int, j: int, code: int) -> tuple | None:
+    """ Translate a direction code of the field (i, j) into the value
+    used by the nested-lists representation of `MazePath.fields`.
+    :param i: row of the field.
+    :param j: column of the field.
+    :param code: direction code.
+    :return: None for an unvisited field, an empty tuple for the starting
+        field, otherwise coordinates of the previous field.
+    """
+    if code == UNVISITED:
+        return None
+    if code == ROOT:
+        return ()
+    di, dj = OFFSETS[code]
+    return i + di, j + dj
+
+
+def encode(i: int, j: int, value: tuple | None) -> int:
+    """ Translate a value of the field (i, j) into a direction code.
+    :param i: row of the field.
+    :param j: column of the field.
+    :param value: None, an empty tuple or coordinates of a neighbouring
+        field.
+    :return: direction code.
+    """
+    if value is None:
+        return UNVISITED
+    if value == ():
+        return ROOT
+    try:
+        return CODES[value[0] - i, value[1] - j]
+    except KeyError:
+        raise ValueError(
+            f"{value} is not a neighbour of the field {(i, j)}.") from None
+
+
+class FieldsRow:
+    """ View of one row of CompactFields, behaving like a list of
+    the values stored in the nested-lists representation.
+    """
+    __slots__ = ("_codes", "_row", "_start", "_width")
+
+    def __init__(self, fields: "CompactFields", row: int) -> None:
+        """ Initialize an instance.
+        :param fields: CompactFields object.
+        :param row: index of the row.
+        """
+        self._codes = fields.codes
+        self._row = row
+        self._start = row * fields.width
+        self._width = fields.width
+
+    def __len__(self) -> int:
+        return self._width
+
+    def __getitem__(self, j: int) -> tuple | None:
+        if not 0 <= j < self._width:
+            raise IndexError("row index out of range")
+        return decode(self._row, j, self._codes[self._start + j])
+
+    def __setitem__(self, j: int, value: tuple | None) -> None:
+        if not 0 <= j < self._width:
+            raise IndexError("row index out of range")
+        self._codes[self._start + j] = encode(self._row, j, value)
+
+    def __iter__(self) -> Iterator[tuple | None]:
+        row, start = self._row, self._start
+        for j, code in enumerate(self._codes[start:start + self._width]):
+            yield decode(row, j, code)
+
+
+class CompactFields:
+    """ Memory-efficient replacement for the nested lists of
+    `MazePath.fields`. Every field is stored as a one-byte direction
+    code pointing to the previous field, in a single flat bytearray.
+    Indexing and iteration return FieldsRow views, so the code written
+    for the nested lists keeps working.
+    """
+
+    def __init__(self, width: int, height: int,
+                 codes: bytearray | None = None) -> None:
+        """ Initialize an instance.
+        :param width: number of fields in a row.
+        :param height: number of rows.
+        :param codes: optional buffer of width * height direction codes;
+            a new, unvisited one is created by default.
+        """
+        self.width: int = width
+        self.height: int = height
+        self.codes = bytearray(width * height) if codes is None else codes
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, i: int) -> FieldsRow:
+        if not 0 <= i < self.height:
+            raise IndexError("fields index out of range")
+        return FieldsRow(self, i)
+
+    def __iter__(self) -> Iterator[FieldsRow]:
+        for i in range(self.height):
+            yield FieldsRow(self, i)
+
+    @classmethod
+    def from_lists(cls, fields: list[list[tuple | None]]) -> Self:
+        """ Encode the nested-lists representation of fields.
+        :param fields: nested lists of values.
+        :return: CompactFields object.
+        """
+        height = len(fields)
+        width = len(fields[0]) if height else 0
+        codes = bytearray(width * height)
+        for i, row in enumerate(fields):
+            start = i * width
+            for j, value in enumerate(row):
+                codes[start + j] = encode(i, j, value)
+        return cls(width, height, codes)
+
+    def to_lists(self) -> list[list[tuple | None]]:
+        """ Decode the fields into the nested-lists representation.
+        :return: nested lists of values.
+        """
+        return [list(row) for row in self]
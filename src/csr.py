@@ -0,0 +1,175 @@
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Self
+from .compact_fields import UP, DOWN, LEFT, RIGHT
+from .maze_path import MazePath
+from . import wall_grid
+
+
+def get_walls(codes: bytearray, width: int,
+              height: int) -> tuple[bytearray, bytearray]:
+    """ Pure-Python counterpart of `WallGrid.get_walls`, working on flat
+    buffers: `horizontal[row * width + column]` for the line between
+    points (row, column) and (row, column + 1), `vertical[row * (width + 1)
+    + column]` for the line between points (row, column) and
+    (row + 1, column). Exits are opened as in PointsDict.
+    :param codes: direction codes of the maze's fields.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :return: tuple of bytearrays: horizontal and vertical lines.
+    """
+    horizontal = bytearray(b"\x01") * (width * (height + 1))
+    vertical = bytearray(b"\x01") * ((width + 1) * height)
+    for cell, code in enumerate(codes):
+        row, column = divmod(cell, width)
+        if code == UP:
+            horizontal[cell] = 0
+        elif code == DOWN:
+            horizontal[cell + width] = 0
+        elif code == LEFT:
+            vertical[cell + row] = 0
+        elif code == RIGHT:
+            vertical[cell + row + 1] = 0
+    middle = height // 2
+    vertical[middle * (width + 1)] = 0
+    vertical[middle * (width + 1) + width] = 0
+    return horizontal, vertical
+
+
+class CSRAdjacency(Mapping):
+    """ Compressed-sparse-row replacement for the dictionary returned by
+    `PointsDict.get_points_dict`. Points are identified by integers:
+    point (row, column) has id `row * (width + 1) + column`. Neighbours
+    of a point are stored in `neighbours[offsets[id]:offsets[id + 1]]`.
+    As a read-only mapping from ids of points having any line to arrays
+    of their neighbours' ids, it can be passed directly to Tree.
+    """
+
+    def __init__(self, width: int, height: int,
+                 offsets: array, neighbours: array) -> None:
+        """ Initialize an instance.
+        :param width: number of fields in a row.
+        :param height: number of rows.
+        :param offsets: array of (width + 1) * (height + 1) + 1 indices
+            of the `neighbours` array.
+        :param neighbours: array of ids of neighbouring points.
+        """
+        self.width: int = width
+        self.height: int = height
+        self.offsets = offsets
+        self.neighbours = neighbours
+        self._length = sum(1 for _ in self)
+
+    @classmethod
+    def from_walls(cls, horizontal: Sequence[int], vertical: Sequence[int],
+                   width: int, height: int) -> Self:
+        """ Build the structure from flat buffers of lines, in the layout
+        returned by `get_walls`.
+        :param horizontal: truthy values for existing horizontal lines.
+        :param vertical: truthy values for existing vertical lines.
+        :param width: number of fields in a row.
+        :param height: number of rows.
+        :return: CSRAdjacency object.
+        """
+        columns = width + 1
+        offsets = array("I", [0])
+        neighbours = array("I")
+        point = 0
+        for row in range(height + 1):
+            for column in range(columns):
+                if row and vertical[point - columns]:
+                    neighbours.append(point - columns)
+                if column and horizontal[point - row - 1]:
+                    neighbours.append(point - 1)
+                if column < width and horizontal[point - row]:
+                    neighbours.append(point + 1)
+                if row < height and vertical[point]:
+                    neighbours.append(point + columns)
+                offsets.append(len(neighbours))
+                point += 1
+        return cls(width, height, offsets, neighbours)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[tuple[tuple[int, int],
+                                              tuple[int, int]]],
+                   width: int, height: int) -> Self:
+        """ Build the structure from pairs of points, e.g. `PointsDict.lines`.
+        :param lines: iterable of pairs of coordinates.
+        :param width: number of fields in a row.
+        :param height: number of rows.
+        :return: CSRAdjacency object.
+        """
+        horizontal = bytearray(width * (height + 1))
+        vertical = bytearray((width + 1) * height)
+        for (row_1, column_1), (row_2, column_2) in lines:
+            row, column = min(row_1, row_2), min(column_1, column_2)
+            if row_1 == row_2:
+                horizontal[row * width + column] = 1
+            else:
+                vertical[row * (width + 1) + column] = 1
+        return cls.from_walls(horizontal, vertical, width, height)
+
+    @classmethod
+    def from_maze(cls, maze_path: MazePath) -> Self:
+        """ Build the structure straight from the maze's direction codes,
+        with WallGrid if numpy is installed, without any sets of tuples.
+        :param maze_path: MazePath object.
+        :return: CSRAdjacency object.
+        """
+        if wall_grid.np is None:
+            horizontal, vertical = get_walls(
+                maze_path.get_codes(), maze_path.width, maze_path.height)
+        else:
+            grid = wall_grid.WallGrid(maze_path)
+            horizontal = grid.horizontal.tobytes()
+            vertical = grid.vertical.tobytes()
+        return cls.from_walls(horizontal, vertical,
+                              maze_path.width, maze_path.height)
+
+    def __getitem__(self, point: int) -> array:
+        if not 0 <= point < len(self.offsets) - 1:
+            raise KeyError(point)
+        start, end = self.offsets[point], self.offsets[point + 1]
+        if start == end:
+            raise KeyError(point)
+        return self.neighbours[start:end]
+
+    def __iter__(self) -> Iterator[int]:
+        offsets = self.offsets
+        for point in range(len(offsets) - 1):
+            if offsets[point] != offsets[point + 1]:
+                yield point
+
+    def __len__(self) -> int:
+        return self._length
+
+    def degree(self, point: int) -> int:
+        """ Count lines meeting in a point.
+        :param point: id of the point.
+        :return: number of neighbours.
+        """
+        return self.offsets[point + 1] - self.offsets[point]
+
+    def leaves(self) -> Iterator[int]:
+        """ Find points having just one neighbour.
+        :return: iterator of ids of points.
+        """
+        offsets = self.offsets
+        for point in range(len(offsets) - 1):
+            if offsets[point + 1] - offsets[point] == 1:
+                yield point
+
+    def point(self, point: int) -> tuple[int, int]:
+        """ Translate an id into coordinates used by PointsDict.
+        :param point: id of the point.
+        :return: tuple (row, column).
+        """
+        return divmod(point, self.width + 1)
+
+    def point_id(self, row: int, column: int) -> int:
+        """ Translate coordinates into an id.
+        :param row: row of the point.
+        :param column: column of the point.
+        :return: id of the point.
+        """
+        return row * (self.width + 1) + column
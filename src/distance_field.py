@@ -0,0 +1,219 @@
+import mmap
+import sys
+from array import array
+from collections.abc import Iterator
+from itertools import repeat
+from .compact_fields import UNVISITED, ROOT, UP, DOWN, LEFT, RIGHT
+from .maze_path import MazePath
+from .raster import write_png
+
+# number of bytes of distances swapped at once on big-endian machines
+SWAP_CHUNK = 4 * 65536
+
+# colours the heatmap passes through, from the nearest to the farthest fields
+HEAT_STOPS = ((48, 18, 59), (40, 120, 240), (30, 210, 160),
+              (160, 240, 50), (250, 190, 40), (220, 50, 20), (122, 4, 3))
+
+
+def heat_palette() -> list[tuple[int, int, int]]:
+    """ Interpolate a palette of 256 colours between HEAT_STOPS.
+    :return: list of (red, green, blue) tuples.
+    """
+    palette = []
+    segments = len(HEAT_STOPS) - 1
+    for level in range(256):
+        position = level * segments / 255
+        index = min(int(position), segments - 1)
+        fraction = position - index
+        start, stop = HEAT_STOPS[index], HEAT_STOPS[index + 1]
+        palette.append(tuple(round(a + (b - a) * fraction)
+                             for a, b in zip(start, stop)))
+    return palette
+
+
+def distance_field(maze: MazePath,
+                   start: tuple[int, int] | None = None,
+                   out=None):
+    """ Count the steps from a field to every field of a maze with
+    a breadth-first search over the tree of direction codes. Passages
+    of a field lead to its parent and to the neighbours pointing to it,
+    and in a tree the search reaches every field from one neighbour
+    only, so instead of a visited bitmap it remembers the side it came
+    from. Only the current level of the search is kept, in an array of
+    flat indices of its fields, each shifted left by 3 bits and joined
+    with the direction code leading back to the previous field; the
+    rest lives in the flat buffers of codes and distances, which may be
+    memory-mapped files.
+    :param maze: MazePath object.
+    :param start: (row, column) of the first field; defaults to
+        the field at the entrance, in the middle of the left border.
+    :param out: optional writable sequence of width * height unsigned
+        ints, e.g. a memoryview cast to "I".
+    :return: `out` or a new array("I") of distances, row after row.
+    """
+    width, height = maze.width, maze.height
+    size = width * height
+    if out is None:
+        out = array("I", bytes(4 * size))
+    elif len(out) != size:
+        raise ValueError(f"The buffer holds {len(out)} values, "
+                         f"not {size}.")
+    if not size:
+        return out
+    i, j = start or (height // 2, 0)
+    if not (0 <= i < height and 0 <= j < width):
+        raise ValueError(f"{(i, j)} is not a field of the maze.")
+    codes = maze.get_codes()
+    typecode = "I" if size <= 2 ** 29 else "Q"
+    offsets = {UP: -width, DOWN: width, LEFT: -1, RIGHT: 1}
+    last_column = width - 1
+    distance = 0
+    # the first field has no way back: UNVISITED matches no direction
+    level = array(typecode, [(i * width + j) << 3 | UNVISITED])
+    while level:
+        following = array(typecode)
+        push = following.append
+        for entry in level:
+            cell, back = entry >> 3, entry & 7
+            out[cell] = distance
+            code = codes[cell]
+            if code != ROOT and code != back:
+                # UP ^ 1 == DOWN, LEFT ^ 1 == RIGHT and vice versa
+                push(cell + offsets[code] << 3 | code ^ 1)
+            # neighbours pointing to the field
+            if (back != UP and cell >= width and
+                    codes[cell - width] == DOWN):
+                push(cell - width << 3 | DOWN)
+            if (back != DOWN and cell + width < size and
+                    codes[cell + width] == UP):
+                push(cell + width << 3 | UP)
+            column = cell % width
+            if back != LEFT and column and codes[cell - 1] == RIGHT:
+                push(cell - 1 << 3 | RIGHT)
+            if (back != RIGHT and column < last_column and
+                    codes[cell + 1] == LEFT):
+                push(cell + 1 << 3 | LEFT)
+        level = following
+        distance += 1
+    return out
+
+
+def save_distances(path: str, maze: MazePath,
+                   start: tuple[int, int] | None = None) -> int:
+    """ Compute the distance field into a memory-mapped file, so it does
+    not have to fit in memory. The file holds width * height unsigned
+    32-bit little-endian ints, row after row, and can be read back with
+    `open_distances` or `numpy.fromfile(path, "<u4")`.
+    :param path: path of the file.
+    :param maze: MazePath object.
+    :param start: (row, column) of the first field, see `distance_field`.
+    :return: the greatest distance.
+    """
+    size = maze.width * maze.height
+    with open(path, "w+b") as file:
+        file.truncate(4 * size)
+        if not size:
+            return 0
+        with mmap.mmap(file.fileno(), 4 * size) as mapping:
+            with memoryview(mapping).cast("I") as distances:
+                distance_field(maze, start, distances)
+                maximum = max(distances)
+            if sys.byteorder == "big":
+                for position in range(0, 4 * size, SWAP_CHUNK):
+                    values = array("I", mapping[position:
+                                                position + SWAP_CHUNK])
+                    values.byteswap()
+                    mapping[position:position + len(values) * 4] = \
+                        values.tobytes()
+            mapping.flush()
+    return maximum
+
+
+def open_distances(path: str, width: int, height: int):
+    """ Map a file saved by `save_distances` for reading. On big-endian
+    machines the values are read into an array and swapped instead.
+    :param path: path of the file.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :return: memoryview or array of width * height unsigned ints.
+    """
+    with open(path, "rb") as file:
+        if not width * height:
+            return memoryview(b"").cast("I")
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapping) != 4 * width * height:
+        mapping.close()
+        raise ValueError(f"{path} does not hold distances of "
+                         f"a {width} x {height} maze.")
+    if sys.byteorder == "big":
+        values = array("I", mapping)
+        mapping.close()
+        values.byteswap()
+        return values
+    return memoryview(mapping).cast("I")
+
+
+def heat_levels(maximum: int) -> bytes:
+    """ Build a table of levels of `heat_palette` of distances up to
+    a maximum: `levels[distance] == distance * 255 // maximum`. Every
+    level is a run of equal bytes, so the table is made in 256 steps.
+    :param maximum: distance getting the last colour, at least 1.
+    :return: bytes of maximum + 1 levels.
+    """
+    bounds = [-(-level * maximum // 255) for level in range(256)]
+    bounds.append(maximum + 1)
+    return b"".join(bytes([level]) * (bounds[level + 1] - bounds[level])
+                    for level in range(256))
+
+
+def iter_heat_rows(distances, width: int, height: int,
+                   maximum: int | None = None,
+                   scale: int = 1) -> Iterator[bytes]:
+    """ Turn rows of distances into rows of indices of `heat_palette`,
+    one row at a time. Distances are looked up in a table of levels
+    built once (see `heat_levels`), and fields are widened by writing
+    a row into every `scale`-th byte, so no Python code runs per pixel.
+    :param distances: sequence of width * height distances.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param maximum: distance getting the last colour; the greatest one
+        by default.
+    :param scale: side of one field in pixels.
+    :return: iterator of height * scale rows of width * scale bytes.
+    """
+    clamp = maximum is not None
+    if maximum is None:
+        maximum = max(distances, default=0)
+    maximum = maximum or 1
+    levels = heat_levels(maximum).__getitem__
+    bound = repeat(maximum)
+    scaled = bytearray(width * scale)
+    for row in range(height):
+        values = distances[row * width:(row + 1) * width]
+        if clamp:
+            values = map(min, values, bound)
+        row_levels = bytes(map(levels, values))
+        if scale > 1:
+            for offset in range(scale):
+                scaled[offset::scale] = row_levels
+            row_levels = bytes(scaled)
+        for _ in range(scale):
+            yield row_levels
+
+
+def save_heatmap(path: str, distances, width: int, height: int,
+                 maximum: int | None = None, scale: int = 1) -> None:
+    """ Save a distance field as a PNG heatmap with the headless
+    renderer, row by row; the first row is at the top.
+    :param path: path of the file.
+    :param distances: sequence of width * height distances.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param maximum: distance getting the last colour; the greatest one
+        by default.
+    :param scale: side of one field in pixels.
+    """
+    with open(path, "wb") as file:
+        write_png(file, width * scale, height * scale,
+                  iter_heat_rows(distances, width, height, maximum, scale),
+                  heat_palette())
@@ -0,0 +1,219 @@
+import random
+from collections.abc import Iterable, Iterator
+from .raster import WHITE, BLACK, write_png, write_ppm
+from .svg import write_svg
+
+# flags of passages leading out of a field: to the next field in the row
+# and to the field below, in the next row
+EAST, SOUTH = 1, 2
+MARGIN = 10
+
+
+def eller_rows(width: int, height: int,
+               rng: random.Random | None = None) -> Iterator[bytes]:
+    """ Create a maze row by row with Eller's algorithm, yielding every
+    row as soon as it is finished. Only the sets of fields connected
+    through the rows above are remembered, so the memory used depends
+    on the width of the maze, not on its height.
+    Fields of a row are randomly joined with the next field of a different
+    set, then every set gets at least one passage to the next row. In the
+    last row all sets are joined into one.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param rng: source of randomness; the `random` module by default.
+    :return: iterator of `height` rows of `width` passage flags
+        (EAST and SOUTH).
+    """
+    rng = rng or random
+    randbytes = rng.randbytes
+    choice = rng.choice
+    # set of every field of the current row; fields without a passage
+    # from above get new sets numbered from `width` on
+    sets = list(range(width))
+    for row in range(height):
+        last = row == height - 1
+        # number sets by their first field, so they index `parents`
+        first = {}
+        sets = [first.setdefault(label, column)
+                for column, label in enumerate(sets)]
+        parents = list(range(width))
+        flags = bytearray(width)
+        joins = randbytes(width)
+        for column in range(width - 1):
+            if last or joins[column] & 1:
+                one, other = sets[column], sets[column + 1]
+                while parents[one] != one:
+                    parents[one] = one = parents[parents[one]]
+                while parents[other] != other:
+                    parents[other] = other = parents[parents[other]]
+                if one != other:
+                    parents[other] = one
+                    flags[column] = EAST
+        if not last:
+            roots = []
+            for label in sets:
+                while parents[label] != label:
+                    parents[label] = label = parents[parents[label]]
+                roots.append(label)
+            downs = randbytes(width)
+            joined = bytearray(width)
+            for column, root in enumerate(roots):
+                if downs[column] & 1:
+                    flags[column] |= SOUTH
+                    joined[root] = 1
+            # sets without any passage down get one in a random field
+            lacking = {}
+            for column, root in enumerate(roots):
+                if not joined[root]:
+                    lacking.setdefault(root, []).append(column)
+            for columns in lacking.values():
+                flags[choice(columns)] |= SOUTH
+            sets = [root if flags[column] & SOUTH else width + column
+                    for column, root in enumerate(roots)]
+        yield bytes(flags)
+
+
+def iter_lines(rows: Iterable[bytes], width: int, height: int
+               ) -> Iterator[tuple[tuple[int, int], tuple[int, int]]]:
+    """ Stream lines of the maze's walls row by row - the same lines as
+    in `PointsDict.lines`, including the exits, in the order of rows.
+    :param rows: iterable of rows of passage flags, e.g. `eller_rows`.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :return: iterator of pairs of (y, x) coordinates.
+    """
+    middle = height // 2
+    for column in range(width):
+        yield (0, column), (0, column + 1)
+    for row, flags in enumerate(rows):
+        if row != middle:
+            yield (row, 0), (row + 1, 0)
+        for column, flag in enumerate(flags):
+            if not flag & EAST and (column < width - 1 or row != middle):
+                yield (row, column + 1), (row + 1, column + 1)
+            if not flag & SOUTH:
+                yield (row + 1, column), (row + 1, column + 1)
+
+
+def iter_pixel_rows(rows: Iterable[bytes], width: int, height: int,
+                    step: int = 15, margin: int = 10,
+                    thickness: int = 1) -> Iterator[bytes]:
+    """ Rasterize rows of the maze one by one into rows of 8-bit pixels,
+    as drawn by `raster.render`. Since rows of the maze arrive from the
+    first one, it is placed at the top of the image, not at the bottom.
+    :param rows: iterable of rows of passage flags, e.g. `eller_rows`.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param step: side of one cell in pixels.
+    :param margin: empty space around the maze in pixels.
+    :param thickness: width of the walls in pixels.
+    :return: iterator of `height * step + 2 * margin + thickness` rows.
+    """
+    size = width * step + 2 * margin + thickness
+    blank = bytes([WHITE]) * size
+    wall = bytes([BLACK]) * thickness
+    middle = height // 2
+
+    def verticals(flags: bytes, row: int) -> bytearray:
+        """ Draw vertical walls of a row of the maze across a row of pixels.
+        :param flags: passage flags of the row.
+        :param row: index of the row.
+        :return: row of pixels.
+        """
+        pixels = bytearray(blank)
+        if row != middle:
+            pixels[margin:margin + thickness] = wall
+        for column, flag in enumerate(flags):
+            if not flag & EAST and (column < width - 1 or row != middle):
+                x = margin + (column + 1) * step
+                pixels[x:x + thickness] = wall
+        return pixels
+
+    def line(previous: bytes | None, above: bytearray | None,
+             below: bytearray | None) -> bytes:
+        """ Draw a line of points: horizontal walls below the previous row
+        of the maze and ends of vertical walls meeting on the line.
+        :param previous: passage flags of the row above the line or None
+            for the first line.
+        :param above: pixels of vertical walls above the line or None.
+        :param below: pixels of vertical walls below the line or None.
+        :return: row of pixels.
+        """
+        pixels = bytearray(blank)
+        run = bytes([BLACK]) * (step + thickness)
+        for column in range(width):
+            if previous is None or not previous[column] & SOUTH:
+                x = margin + column * step
+                pixels[x:x + len(run)] = run
+        # pixels are either black (0) or white (255), so a bitwise and
+        # of the rows keeps the walls of both
+        merged = int.from_bytes(pixels)
+        for walls in (above, below):
+            if walls is not None:
+                merged &= int.from_bytes(walls)
+        return merged.to_bytes(size)
+
+    yield from (blank for _ in range(margin))
+    previous = above = None
+    for row, flags in enumerate(rows):
+        below = verticals(flags, row)
+        band = line(previous, above, below)
+        yield from (band for _ in range(thickness))
+        interior = bytes(below)
+        yield from (interior for _ in range(step - thickness))
+        previous, above = flags, below
+    band = line(previous, above, None)
+    yield from (band for _ in range(thickness))
+    yield from (blank for _ in range(margin))
+
+
+def save_rows(path: str, rows: Iterable[bytes], width: int, height: int,
+              step: int = 15,
+              image_format: str = "png",
+              merge: bool = False) -> None:
+    """ Save rows of the maze as an image while they arrive, so neither
+    the maze nor the image is ever held in memory. As in
+    `iter_pixel_rows`, the first row is at the top.
+    :param path: path of the file.
+    :param rows: iterable of rows of passage flags, e.g. `eller_rows`.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param step: side of one cell in pixels.
+    :param image_format: "png", "ppm" or "svg".
+    :param merge: write all lines of an SVG image as a single path.
+    """
+    if image_format == "svg":
+        # write_svg puts the first row at the bottom, so flip the lines
+        lines = (((height - y_1, x_1), (height - y_2, x_2))
+                 for (y_1, x_1), (y_2, x_2) in iter_lines(rows, width, height))
+        with open(path, "w") as file:
+            write_svg(file, lines, width, height, step, merge=merge)
+        return
+    if image_format not in ("png", "ppm"):
+        raise ValueError(f"Unknown image format: {image_format}.")
+    pixels = iter_pixel_rows(rows, width, height, step, MARGIN)
+    size = width * step + 2 * MARGIN + 1, height * step + 2 * MARGIN + 1
+    with open(path, "wb") as file:
+        if image_format == "png":
+            write_png(file, *size, pixels)
+        else:
+            write_ppm(file, *size, pixels)
+
+
+def save_streamed(path: str, width: int, height: int,
+                  step: int = 15,
+                  image_format: str = "png",
+                  merge: bool = False,
+                  rng: random.Random | None = None) -> None:
+    """ Create a maze with Eller's algorithm and save it as an image while
+    its rows are created, see `save_rows`.
+    :param path: path of the file.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param step: side of one cell in pixels.
+    :param image_format: "png", "ppm" or "svg".
+    :param merge: write all lines of an SVG image as a single path.
+    :param rng: source of randomness; the `random` module by default.
+    """
+    save_rows(path, eller_rows(width, height, rng), width, height, step,
+              image_format, merge)
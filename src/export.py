@@ -0,0 +1,34 @@
+from collections.abc import Iterable
+from .raster import render
+from .svg import write_svg
+
+FORMATS = ("png", "ppm", "svg")
+
+
+def save(lines: Iterable[Iterable[tuple[int, int]]],
+         path: str,
+         width: int, height: int,
+         step: int = 15,
+         image_format: str = "png",
+         merge: bool = False) -> None:
+    """ Save lines of the maze as an image in one of FORMATS.
+    :param lines: iterable of lines of (y, x) coordinates.
+    :param path: path of the file.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param step: side of one cell in pixels.
+    :param image_format: "png", "ppm" or "svg".
+    :param merge: write all lines of an SVG image as a single path.
+    """
+    if image_format not in FORMATS:
+        raise ValueError(f"Unknown image format: {image_format}.")
+    if image_format == "svg":
+        with open(path, "w") as file:
+            write_svg(file, lines, width, height, step, merge=merge)
+        return
+    raster = render(lines, width, height, step)
+    with open(path, "wb") as file:
+        if image_format == "png":
+            raster.write_png(file)
+        else:
+            raster.write_ppm(file)
@@ -0,0 +1,292 @@
+import random
+from array import array
+from collections.abc import Callable
+from .carver import carve
+from .compact_fields import ROOT, UP, DOWN, LEFT, RIGHT
+from .eller import EAST, SOUTH, eller_rows
+
+# Every generator takes (width, height, codes, rng), fills `codes` -
+# a buffer of width * height zeroed bytes, created if not given - with
+# direction codes of a spanning tree of the fields (see the
+# `compact_fields` module) and returns it, like `carver.carve`.
+Generator = Callable[[int, int, bytearray | None, random.Random | None],
+                     bytearray]
+
+GENERATORS: dict[str, Generator] = {}
+
+
+def register(name: str) -> Callable[[Generator], Generator]:
+    """ Decorator adding a generator to the registry.
+    :param name: name of the algorithm.
+    :return: decorator returning the generator unchanged.
+    """
+    def decorator(generator: Generator) -> Generator:
+        GENERATORS[name] = generator
+        return generator
+    return decorator
+
+
+def generate(algorithm: str, width: int, height: int,
+             codes: bytearray | None = None,
+             rng: random.Random | None = None) -> bytearray:
+    """ Create a maze's schema with one of the registered algorithms.
+    :param algorithm: name of the algorithm.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param codes: optional buffer of width * height zeroed bytes.
+    :param rng: source of randomness; the `random` module by default.
+    :return: buffer of direction codes.
+    """
+    try:
+        generator = GENERATORS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {algorithm}.") from None
+    return generator(width, height, codes, rng)
+
+
+def _neighbours(width: int, height: int) -> list[tuple]:
+    """ List the moves available in every field.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :return: list holding for every field a tuple of
+        (offset of the neighbour, direction code of the neighbour).
+    """
+    moves = ((-width, UP), (width, DOWN), (-1, LEFT), (1, RIGHT))
+    # moves for every combination of the field's borders
+    table = [tuple(move for bit, move in enumerate(moves)
+                   if not mask >> bit & 1) for mask in range(16)]
+    neighbours = []
+    for row in range(height):
+        mask = (row == 0) | (row == height - 1) << 1
+        neighbours += [table[mask | (column == 0) << 2 |
+                             (column == width - 1) << 3]
+                       for column in range(width)]
+    return neighbours
+
+
+def orient(passages: bytearray, width: int, height: int, root: int,
+           codes: bytearray | None = None) -> bytearray:
+    """ Turn a spanning tree given as passages between fields into
+    direction codes pointing towards the root.
+    :param passages: flags EAST and SOUTH of every field.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param root: index of the starting field.
+    :param codes: optional buffer of width * height zeroed bytes.
+    :return: buffer of direction codes.
+    """
+    if codes is None:
+        codes = bytearray(width * height)
+    codes[root] = ROOT
+    stack = [root]
+    while stack:
+        cell = stack.pop()
+        flags = passages[cell]
+        if flags & EAST and not codes[cell + 1]:
+            codes[cell + 1] = LEFT
+            stack.append(cell + 1)
+        if flags & SOUTH and not codes[cell + width]:
+            codes[cell + width] = UP
+            stack.append(cell + width)
+        if cell % width and passages[cell - 1] & EAST and \
+                not codes[cell - 1]:
+            codes[cell - 1] = RIGHT
+            stack.append(cell - 1)
+        if cell >= width and passages[cell - width] & SOUTH and \
+                not codes[cell - width]:
+            codes[cell - width] = DOWN
+            stack.append(cell - width)
+    return codes
+
+
+register("backtracker")(carve)
+
+
+@register("kruskal")
+def kruskal(width: int, height: int,
+            codes: bytearray | None = None,
+            rng: random.Random | None = None) -> bytearray:
+    """ Randomized Kruskal's algorithm: join fields separated by walls
+    taken in random order, unless they are already connected. Sets of
+    connected fields are kept in an array-backed union-find with union
+    by rank and path halving. Produces many short dead ends.
+    """
+    rng = rng or random
+    size = width * height
+    if codes is None:
+        codes = bytearray(size)
+    if not size:
+        return codes
+    # wall's id: index of the field on its left or above, times two,
+    # plus one for walls below the field
+    walls = [2 * cell for cell in range(size) if (cell + 1) % width]
+    walls += range(1, 2 * (size - width), 2)
+    rng.shuffle(walls)
+    parents = array("I", range(size))
+    ranks = bytearray(size)
+    passages = bytearray(size)
+    remaining = size - 1
+    for wall in walls:
+        if not remaining:
+            break
+        cell = wall >> 1
+        other = cell + width if wall & 1 else cell + 1
+        while parents[cell] != cell:
+            parents[cell] = cell = parents[parents[cell]]
+        while parents[other] != other:
+            parents[other] = other = parents[parents[other]]
+        if cell == other:
+            continue
+        if ranks[cell] < ranks[other]:
+            cell, other = other, cell
+        parents[other] = cell
+        if ranks[cell] == ranks[other]:
+            ranks[cell] += 1
+        passages[wall >> 1] |= SOUTH if wall & 1 else EAST
+        remaining -= 1
+    return orient(passages, width, height, rng.randrange(size), codes)
+
+
+@register("wilson")
+def wilson(width: int, height: int,
+           codes: bytearray | None = None,
+           rng: random.Random | None = None) -> bytearray:
+    """ Wilson's algorithm: join every field outside the maze with
+    a loop-erased random walk ending in the maze. Creates a uniformly
+    random spanning tree, but the first walks are long, so it is
+    the slowest of the generators. The last direction taken from
+    a field of the walk is its direction code once the walk is added.
+    """
+    rng = rng or random
+    size = width * height
+    if codes is None:
+        codes = bytearray(size)
+    if not size:
+        return codes
+    neighbours = _neighbours(width, height)
+    choice = rng.choice
+    walk = bytearray(size)
+    steps = {UP: -width, DOWN: width, LEFT: -1, RIGHT: 1}
+    codes[rng.randrange(size)] = ROOT
+    for start in range(size):
+        cell = start
+        while not codes[cell]:
+            offset, code = choice(neighbours[cell])
+            walk[cell] = code
+            cell += offset
+        cell = start
+        while not codes[cell]:
+            code = walk[cell]
+            codes[cell] = code
+            cell += steps[code]
+    return codes
+
+
+@register("prim")
+def prim(width: int, height: int,
+         codes: bytearray | None = None,
+         rng: random.Random | None = None) -> bytearray:
+    """ Randomized Prim's algorithm: grow the maze from a random field,
+    joining a random field of the frontier to a random neighbour
+    already in the maze. Produces many short dead ends radiating
+    from the starting field.
+    """
+    rng = rng or random
+    size = width * height
+    if codes is None:
+        codes = bytearray(size)
+    if not size:
+        return codes
+    neighbours = _neighbours(width, height)
+    randrange = rng.randrange
+    in_frontier = bytearray(size)
+    frontier = []
+    cell = randrange(size)
+    codes[cell] = ROOT
+    while True:
+        for offset, _ in neighbours[cell]:
+            other = cell + offset
+            if not codes[other] and not in_frontier[other]:
+                in_frontier[other] = 1
+                frontier.append(other)
+        if not frontier:
+            return codes
+        index = randrange(len(frontier))
+        cell = frontier[index]
+        frontier[index] = frontier[-1]
+        frontier.pop()
+        joined = [code for offset, code in neighbours[cell]
+                  if codes[cell + offset]]
+        codes[cell] = joined[randrange(len(joined))]
+
+
+@register("binary_tree")
+def binary_tree(width: int, height: int,
+                codes: bytearray | None = None,
+                rng: random.Random | None = None) -> bytearray:
+    """ Binary tree algorithm: join every field either to the field
+    above or to the one on the left. Needs one random bit per field
+    and no memory, but the maze has a diagonal bias and two corridors
+    along the first row and column.
+    """
+    rng = rng or random
+    size = width * height
+    if codes is None:
+        codes = bytearray(size)
+    if not size:
+        return codes
+    table = bytes(UP if byte & 1 else LEFT for byte in range(256))
+    codes[:size] = rng.randbytes(size).translate(table)
+    codes[:width] = bytes([LEFT]) * width
+    codes[::width] = bytes([UP]) * height
+    codes[0] = ROOT
+    return codes
+
+
+@register("sidewinder")
+def sidewinder(width: int, height: int,
+               codes: bytearray | None = None,
+               rng: random.Random | None = None) -> bytearray:
+    """ Sidewinder algorithm: split every row into runs of random
+    length and join each run to the row above through one of its
+    fields. Works row by row, but the first row is a single corridor.
+    """
+    rng = rng or random
+    size = width * height
+    if codes is None:
+        codes = bytearray(size)
+    if not size:
+        return codes
+    getrandbits = rng.getrandbits
+    randrange = rng.randrange
+    codes[:width] = bytes([LEFT]) * width
+    codes[0] = ROOT
+    for start in range(width, size, width):
+        run = start
+        last = start + width - 1
+        for cell in range(start, last + 1):
+            if cell == last or getrandbits(1):
+                chosen = randrange(run, cell + 1)
+                codes[run:chosen] = bytes([RIGHT]) * (chosen - run)
+                codes[chosen] = UP
+                codes[chosen + 1:cell + 1] = bytes([LEFT]) * (cell - chosen)
+                run = cell + 1
+    return codes
+
+
+@register("eller")
+def eller(width: int, height: int,
+          codes: bytearray | None = None,
+          rng: random.Random | None = None) -> bytearray:
+    """ Eller's algorithm, collecting all rows of `eller.eller_rows`.
+    Mazes too big to be held in memory can be streamed row by row with
+    the `eller` module instead.
+    """
+    rng = rng or random
+    size = width * height
+    if codes is None:
+        codes = bytearray(size)
+    if not size:
+        return codes
+    passages = bytearray().join(eller_rows(width, height, rng))
+    return orient(passages, width, height, rng.randrange(size), codes)
@@ -0,0 +1,152 @@
+import hashlib
+from collections import OrderedDict
+from collections.abc import Iterator
+from .compact_fields import UP, DOWN, LEFT, RIGHT
+from .maze_path import MazePath
+from .raster import Raster, render
+from .tiled import reroot
+
+
+class InfiniteMaze:
+    """ Unbounded maze made of chunks of fields created on demand.
+    Chunk (cx, cy) covers rows cy * chunk_height to (cy + 1) * chunk_height
+    and columns cx * chunk_width to (cx + 1) * chunk_width; coordinates may
+    be negative. Every chunk is a MazePath seeded with a hash of the world
+    seed and its coordinates, rerooted to lead out through a single exit
+    in its top or left border, chosen with the same hash. So a chunk never
+    depends on its neighbours, and walls between chunks are known without
+    creating them. Every field leads up or left through an endless chain
+    of chunks and any two chains meet, so the maze has no loops and no
+    separate parts. Recently used chunks are kept in an LRU cache.
+    """
+
+    def __init__(self, seed: int = 0,
+                 chunk_width: int = 64, chunk_height: int = 64,
+                 algorithm: str = "backtracker",
+                 cache_size: int = 256) -> None:
+        """ Initialize an instance.
+        :param seed: seed of the world.
+        :param chunk_width: number of fields in a row of a chunk.
+        :param chunk_height: number of rows of a chunk.
+        :param algorithm: name of the generator creating the chunks.
+        :param cache_size: maximal number of chunks kept in memory.
+        """
+        self.seed = seed
+        self.chunk_width = chunk_width
+        self.chunk_height = chunk_height
+        self.algorithm = algorithm
+        self.cache_size = cache_size
+        self.chunks: OrderedDict[tuple[int, int], MazePath] = OrderedDict()
+
+    def _hash(self, cx: int, cy: int) -> tuple[int, int]:
+        """ Hash the world seed with coordinates of a chunk.
+        :param cx: column of the chunk.
+        :param cy: row of the chunk.
+        :return: tuple: seed of the chunk and value choosing its exit.
+        """
+        key = f"{self.seed}:{cx}:{cy}".encode()
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        return (int.from_bytes(digest[:8], "little"),
+                int.from_bytes(digest[8:], "little"))
+
+    def exit(self, cx: int, cy: int) -> tuple[int, int]:
+        """ Find the field through which the path of a chunk leads out.
+        :param cx: column of the chunk.
+        :param cy: row of the chunk.
+        :return: tuple: direction code of the exit (UP or LEFT) and index
+            of the exit field in the chunk.
+        """
+        value = self._hash(cx, cy)[1]
+        if value & 1:
+            return UP, (value >> 1) % self.chunk_width
+        return LEFT, (value >> 1) % self.chunk_height * self.chunk_width
+
+    def chunk(self, cx: int, cy: int) -> MazePath:
+        """ Get a chunk from the cache or create it.
+        :param cx: column of the chunk.
+        :param cy: row of the chunk.
+        :return: MazePath object of the chunk.
+        """
+        key = cx, cy
+        maze = self.chunks.get(key)
+        if maze is not None:
+            self.chunks.move_to_end(key)
+            return maze
+        maze = MazePath(self.chunk_width, self.chunk_height, compact=True,
+                        algorithm=self.algorithm, seed=self._hash(cx, cy)[0])
+        code, cell = self.exit(cx, cy)
+        reroot(maze.get_codes(), self.chunk_width, cell, code)
+        self.chunks[key] = maze
+        if len(self.chunks) > self.cache_size:
+            self.chunks.popitem(last=False)
+        return maze
+
+    def code(self, row: int, column: int) -> int:
+        """ Get the direction code of a field.
+        :param row: row of the field.
+        :param column: column of the field.
+        :return: direction code; no field of the maze is its root.
+        """
+        cy, i = divmod(row, self.chunk_height)
+        cx, j = divmod(column, self.chunk_width)
+        return self.chunk(cx, cy).get_codes()[i * self.chunk_width + j]
+
+    def is_open(self, row: int, column: int, code: int) -> bool:
+        """ Check if there is a passage from a field to its neighbour.
+        Neighbours in other chunks are checked with their exits only,
+        without creating their chunks.
+        :param row: row of the field.
+        :param column: column of the field.
+        :param code: direction code of the neighbour.
+        :return: True if the wall between the fields is open.
+        """
+        if code in (DOWN, RIGHT):
+            # look from the other field, so only UP and LEFT remain
+            row, column = ((row + 1, column) if code == DOWN
+                           else (row, column + 1))
+            code = UP if code == DOWN else LEFT
+        cy, i = divmod(row, self.chunk_height)
+        cx, j = divmod(column, self.chunk_width)
+        if code == UP and i or code == LEFT and j:
+            cell = i * self.chunk_width + j
+            codes = self.chunk(cx, cy).get_codes()
+            other = cell - self.chunk_width if code == UP else cell - 1
+            return codes[cell] == code or codes[other] == (
+                DOWN if code == UP else RIGHT)
+        # the wall is a border between chunks, open only at the exit
+        return self.exit(cx, cy) == (code, i * self.chunk_width + j)
+
+    def lines(self, top: int, left: int, height: int, width: int
+              ) -> Iterator[tuple[tuple[int, int], tuple[int, int]]]:
+        """ Stream closed walls of fields in a rectangular viewport, like
+        `PointsDict.lines`, creating only the chunks under the viewport.
+        :param top: first row of the viewport.
+        :param left: first column of the viewport.
+        :param height: number of rows.
+        :param width: number of fields in a row.
+        :return: iterator of pairs of (y, x) coordinates.
+        """
+        bottom, right = top + height, left + width
+        # walls above and on the left of every field, then below the last
+        # row and on the right of the last column; the fields behind them
+        # belong to chunks under the viewport or are checked by exits
+        for row in range(top, bottom + 1):
+            for column in range(left, right + 1):
+                if column < right and not self.is_open(row, column, UP):
+                    yield (row, column), (row, column + 1)
+                if row < bottom and not self.is_open(row, column, LEFT):
+                    yield (row, column), (row + 1, column)
+
+    def render(self, top: int, left: int, height: int, width: int,
+               step: int = 15) -> Raster:
+        """ Rasterize a viewport with `raster.render`.
+        :param top: first row of the viewport.
+        :param left: first column of the viewport.
+        :param height: number of rows.
+        :param width: number of fields in a row.
+        :param step: side of one cell in pixels.
+        :return: Raster object.
+        """
+        lines = ([(y - top, x - left) for y, x in line]
+                 for line in self.lines(top, left, height, width))
+        return render(lines, width, height, step)
@@ -0,0 +1,191 @@
+from .compact_fields import ROOT, UP, DOWN, LEFT, RIGHT
+from .maze_path import MazePath
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+# moves are numbered in the order of bits of the mask of unvisited
+# neighbours: up, down, left, right; this is the code of the new field
+MOVE_CODES = (DOWN, UP, RIGHT, LEFT)
+# random choices per step: any number of available moves divides it
+CHOICES = 12
+# steps served by one call of the random generator
+RANDOM_STEPS = 64
+
+
+ALGORITHMS = ("backtracker", "binary_tree", "sidewinder")
+
+
+class MazeBatch:
+    """ Many mazes of the same size created at once with NumPy operations
+    on the whole batch. The backtracker runs the randomized depth-first
+    backtracking of `carver.carve` in lockstep: each step advances all
+    mazes by one field, forward to a random unvisited neighbour or back
+    along the direction codes. A maze of n fields is finished after
+    exactly 2 * (n - 1) steps, so no maze ever waits for another.
+    The binary tree and sidewinder algorithms need no steps at all:
+    their random choices are made for all fields of all mazes at once,
+    which is orders of magnitude faster, at the cost of their texture.
+    Attributes, like those of WallGrid with a leading axis of mazes:
+        - `codes`, shape (count, height, width), direction codes,
+        - `horizontal`, shape (count, height + 1, width),
+        - `vertical`, shape (count, height, width + 1).
+    """
+
+    def __init__(self, count: int, width: int, height: int,
+                 seed: int | None = None,
+                 algorithm: str = "backtracker") -> None:
+        """ Initialize an instance and create the mazes.
+        :param count: number of mazes.
+        :param width: number of fields in a row.
+        :param height: number of rows.
+        :param seed: seed of numpy's random generator.
+        :param algorithm: one of ALGORITHMS.
+        """
+        if np is None:
+            raise ImportError("MazeBatch requires numpy.")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}.")
+        self.count = count
+        self.width = width
+        self.height = height
+        generate = getattr(self, algorithm)
+        self.codes = generate(np.random.default_rng(seed))
+        self.horizontal, self.vertical = self.get_walls()
+
+    def backtracker(self, rng: "np.random.Generator") -> "np.ndarray":
+        """ Create all mazes in lockstep. Like in `carve`, the fields are
+        kept in padded bitmaps with a frame of visited sentinels, and the
+        direction codes use the same layout, so a maze is tracked by one
+        index. Every step looks up the move in a table indexed either by
+        the mask of unvisited neighbours and a random number below 12
+        - divisible by any number of available moves - or, if there are
+        no unvisited neighbours, by the direction code of the field.
+        :param rng: numpy's random generator.
+        :return: array of direction codes, shape (count, height, width).
+        """
+        count, width, height = self.count, self.width, self.height
+        size = width * height
+        padded = width + 2
+        area = padded * (height + 2)
+        visited = np.ones((count, height + 2, padded), dtype=np.uint8)
+        visited[:, 1:-1, 1:-1] = 0
+        visited = visited.reshape(-1)
+        # the last byte is the target of writes made by steps back
+        codes = np.zeros(count * area + 1, dtype=np.uint8)
+        dummy = count * area
+
+        moves = ((-padded, MOVE_CODES[0]), (padded, MOVE_CODES[1]),
+                 (-1, MOVE_CODES[2]), (1, MOVE_CODES[3]))
+        offsets = np.zeros(16 * CHOICES + 6, dtype=np.intp)
+        new_codes = np.zeros(16 * CHOICES + 6, dtype=np.uint8)
+        for mask in range(1, 16):
+            bits = [bit for bit in range(4) if mask >> bit & 1]
+            for choice in range(CHOICES):
+                key = mask * CHOICES + choice
+                offsets[key], new_codes[key] = moves[
+                    bits[choice % len(bits)]]
+        for offset, code in moves:
+            offsets[16 * CHOICES + code] = -offset
+
+        cell = rng.integers(size, size=count)
+        row, column = np.divmod(cell, width)
+        point = (np.arange(count, dtype=np.intp) * area +
+                 (row + 1) * padded + column + 1)
+        visited[point] = 1
+        codes[point] = ROOT
+        steps = 2 * (size - 1)
+        for first in range(0, steps, RANDOM_STEPS):
+            choices = rng.integers(CHOICES, dtype=np.uint8, size=(
+                min(RANDOM_STEPS, steps - first), count))
+            for choice in choices:
+                mask = (visited[point - padded] |
+                        visited[point + padded] << 1 |
+                        visited[point - 1] << 2 |
+                        visited[point + 1] << 3) ^ 15
+                forward = mask != 0
+                key = np.where(forward, mask * CHOICES + choice,
+                               16 * CHOICES + codes[point])
+                point += offsets[key]
+                visited[point] = 1
+                codes[np.where(forward, point, dummy)] = new_codes[key]
+        codes = codes[:-1].reshape(count, height + 2, padded)
+        return np.ascontiguousarray(codes[:, 1:-1, 1:-1])
+
+    def binary_tree(self, rng: "np.random.Generator") -> "np.ndarray":
+        """ Create all mazes with the binary tree algorithm of the
+        `generators` module: every field is joined to the field above
+        or to the one on the left.
+        :param rng: numpy's random generator.
+        :return: array of direction codes, shape (count, height, width).
+        """
+        shape = self.count, self.height, self.width
+        codes = np.where(rng.integers(2, size=shape, dtype=np.uint8),
+                         np.uint8(UP), np.uint8(LEFT))
+        codes[:, 0, :] = LEFT
+        codes[:, :, 0] = UP
+        codes[:, 0, 0] = ROOT
+        return codes
+
+    def sidewinder(self, rng: "np.random.Generator") -> "np.ndarray":
+        """ Create all mazes with the sidewinder algorithm of the
+        `generators` module: rows below the first one are split into runs
+        of random length, each joined to the row above through a random
+        field. Runs are found for all rows at once from the fields closing
+        them, with cumulative maxima and minima of their positions.
+        :param rng: numpy's random generator.
+        :return: array of direction codes, shape (count, height, width).
+        """
+        count, width, height = self.count, self.width, self.height
+        codes = np.empty((count, height, width), dtype=np.uint8)
+        codes[:, 0, :] = LEFT
+        codes[:, 0, 0] = ROOT
+        shape = count, height - 1, width
+        # the smallest type holding positions in a row saves memory traffic
+        columns = np.arange(width, dtype=np.min_scalar_type(width))
+        closing = rng.integers(2, size=shape, dtype=np.uint8).astype(bool)
+        closing[..., -1] = True
+        # first and last field of the run of every field
+        opening = np.zeros(shape, dtype=bool)
+        opening[..., 0] = True
+        opening[..., 1:] = closing[..., :-1]
+        first = np.maximum.accumulate(np.where(opening, columns, 0), axis=-1)
+        last = np.minimum.accumulate(
+            np.where(closing, columns, width)[..., ::-1], axis=-1)[..., ::-1]
+        # one random number per run, taken from its last field
+        uniform = rng.random(shape, dtype=np.float32)
+        uniform = np.take_along_axis(uniform, last, axis=-1)
+        chosen = first + (uniform * (last - first + 1)).astype(columns.dtype)
+        codes[:, 1:] = np.where(columns < chosen, np.uint8(RIGHT),
+                                np.where(columns > chosen, np.uint8(LEFT),
+                                         np.uint8(UP)))
+        return codes
+
+    def get_walls(self) -> tuple:
+        """ Build arrays of lines of all mazes from their direction codes,
+        as `WallGrid.get_walls` does for one maze, with elementwise
+        comparisons instead of masked assignments, which are much slower
+        for big batches.
+        :return: tuple of arrays: horizontal and vertical lines.
+        """
+        count, width, height = self.count, self.width, self.height
+        codes = self.codes
+        horizontal = np.ones((count, height + 1, width), dtype=bool)
+        vertical = np.ones((count, height, width + 1), dtype=bool)
+        horizontal[:, :-1] = codes != UP
+        horizontal[:, 1:] &= codes != DOWN
+        vertical[:, :, :-1] = codes != LEFT
+        vertical[:, :, 1:] &= codes != RIGHT
+        middle = height // 2
+        vertical[:, middle, 0] = vertical[:, middle, width] = False
+        return horizontal, vertical
+
+    def maze(self, index: int) -> MazePath:
+        """ Get one maze of the batch as a MazePath object.
+        :param index: index of the maze.
+        :return: compact MazePath object.
+        """
+        return MazePath.from_codes(self.width, self.height,
+                                   bytearray(self.codes[index].tobytes()))
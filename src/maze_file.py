@@ -0,0 +1,213 @@
+import mmap
+import struct
+from collections.abc import Iterator
+from typing import Self
+from .compact_fields import CompactFields, ROOT, UP
+from .maze_path import MazePath
+
+MAGIC = b"MAZE"
+VERSION = 2
+# two bits per field: direction code of the field minus UP
+PARENT_2BIT = 1
+# magic, version, encoding, width, height, length of the seed, index
+# of the starting field, name of the algorithm, flags, reserved byte;
+# the seed follows as decimal text, so seeds of any size fit
+HEADER = struct.Struct("<4sBBIIHQ16sBx")
+HAS_SEED = 1
+ALGORITHM_SIZE = 16
+SEED_SIZE = 2 ** 16 - 1
+# fields packed at once when saving
+PACK_CHUNK = 4 * 65536
+
+# _ENCODE[k][code] holds the bits of a field packed as the k-th of a byte
+_ENCODE = [bytes(((code - UP) & 3) << 2 * k for code in range(256))
+           for k in range(4)]
+# _DECODE[k][byte] is the direction code of the k-th field of a byte
+_DECODE = [bytes(((byte >> 2 * k) & 3) + UP for byte in range(256))
+           for k in range(4)]
+
+
+def iter_packed(codes, chunk: int = PACK_CHUNK) -> Iterator[bytes]:
+    """ Pack direction codes of a finished maze into two bits per field,
+    four fields per byte, the first one in the lowest bits, `chunk`
+    fields at a time, so only one chunk is copied at once. The bits of
+    the starting field are meaningless; its index is kept in the header.
+    :param codes: direction codes of all fields, e.g. a memory-mapped file.
+    :param chunk: number of fields packed at once, a multiple of four.
+    :return: iterator of packed bytes.
+    """
+    for start in range(0, len(codes), chunk):
+        part = bytes(codes[start:start + chunk])
+        if len(part) % 4:
+            part += bytes([UP]) * (4 - len(part) % 4)
+        packed = 0
+        for k in range(4):
+            packed |= int.from_bytes(part[k::4].translate(_ENCODE[k]),
+                                     "little")
+        yield packed.to_bytes(len(part) // 4, "little")
+
+
+def pack_codes(codes) -> bytes:
+    """ Pack direction codes into bytes, see `iter_packed`.
+    :param codes: direction codes of all fields.
+    :return: packed bytes.
+    """
+    return b"".join(iter_packed(codes))
+
+
+def unpack_codes(packed: bytes, first: int, count: int) -> bytearray:
+    """ Unpack direction codes of consecutive fields.
+    :param packed: bytes packed with `pack_codes`, starting with
+        the byte holding the field `first`.
+    :param first: index of the first field.
+    :param count: number of fields.
+    :return: bytearray of direction codes.
+    """
+    skip = first % 4
+    total = (skip + count + 3) // 4
+    codes = bytearray(4 * total)
+    for k in range(4):
+        codes[k::4] = packed[:total].translate(_DECODE[k])
+    return codes[skip:skip + count]
+
+
+class PackedCodes:
+    """ Read-only sequence of direction codes decoded on demand from
+    a buffer packed with `pack_codes`, e.g. a memory-mapped file.
+    Used as the `codes` of CompactFields, it lets PointsDict walk
+    through the fields without decoding the whole maze.
+    """
+
+    def __init__(self, buffer, offset: int, size: int, root: int) -> None:
+        """ Initialize an instance.
+        :param buffer: bytes-like object, e.g. an mmap.
+        :param offset: position of the packed fields in the buffer.
+        :param size: number of fields.
+        :param root: index of the starting field.
+        """
+        self._buffer = buffer
+        self._offset = offset
+        self._size = size
+        self._root = root
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int | slice) -> int | bytearray:
+        if isinstance(index, slice):
+            start, stop, stride = index.indices(self._size)
+            if stride != 1:
+                raise ValueError("PackedCodes supports only contiguous "
+                                 "slices.")
+            count = max(0, stop - start)
+            begin = self._offset + start // 4
+            end = self._offset + (start + count + 3) // 4
+            codes = unpack_codes(self._buffer[begin:end], start, count)
+            if start <= self._root < start + count:
+                codes[self._root - start] = ROOT
+            return codes
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("codes index out of range")
+        if index == self._root:
+            return ROOT
+        byte = self._buffer[self._offset + index // 4]
+        return ((byte >> 2 * (index % 4)) & 3) + UP
+
+    def __iter__(self):
+        return iter(self[:])
+
+
+def save_maze(path: str, maze: MazePath,
+              algorithm: str = "backtracker") -> None:
+    """ Save a finished maze in the binary format: a header with its
+    dimensions and algorithm, its seed as decimal text, followed by
+    a grid of two-bit parent directions. A 10000 x 10000 maze takes
+    25 MB.
+    :param path: path of the file.
+    :param maze: MazePath object.
+    :param algorithm: name of the generation algorithm.
+    """
+    codes = maze.get_codes()
+    name = algorithm.encode()
+    if len(name) > ALGORITHM_SIZE:
+        raise ValueError(f"Algorithm's name is longer than "
+                         f"{ALGORITHM_SIZE} bytes: {algorithm}.")
+    seed = b"" if maze.seed is None else str(maze.seed).encode()
+    if len(seed) > SEED_SIZE:
+        raise ValueError(f"Seed is longer than {SEED_SIZE} digits.")
+    header = HEADER.pack(MAGIC, VERSION, PARENT_2BIT,
+                         maze.width, maze.height, len(seed),
+                         codes.index(ROOT), name,
+                         HAS_SEED if maze.seed is not None else 0)
+    with open(path, "wb") as file:
+        file.write(header)
+        file.write(seed)
+        for packed in iter_packed(codes):
+            file.write(packed)
+
+
+class MazeFile:
+    """ Maze saved with `save_maze`, memory-mapped instead of read.
+    It offers the attributes used by PointsDict (`width`, `height`
+    and `fields`, decoded lazily row by row) and `get_codes`, used
+    by WallGrid and CSRAdjacency, so it can replace a MazePath.
+    """
+
+    def __init__(self, path: str) -> None:
+        """ Open a file and read its header.
+        :param path: path of the file.
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, encoding, width, height, seed_length, root,
+             name, flags) = HEADER.unpack_from(self._mmap)
+        except struct.error:
+            self.close()
+            raise ValueError(f"{path} is not a maze file.") from None
+        if magic != MAGIC or version != VERSION or encoding != PARENT_2BIT:
+            self.close()
+            raise ValueError(f"{path} is not a maze file.")
+        offset = HEADER.size + seed_length
+        if len(self._mmap) != offset + (width * height + 3) // 4:
+            self.close()
+            raise ValueError(f"{path} is truncated.")
+        seed = None
+        if flags & HAS_SEED:
+            try:
+                seed = int(self._mmap[HEADER.size:offset].decode())
+            except (UnicodeDecodeError, ValueError):
+                self.close()
+                raise ValueError(f"{path} holds an invalid seed.") from None
+        self.width: int = width
+        self.height: int = height
+        self.seed: int | None = seed
+        self.algorithm: str = name.rstrip(b"\x00").decode()
+        self.codes = PackedCodes(self._mmap, offset, width * height, root)
+        self.fields = CompactFields(width, height, self.codes)
+
+    def get_codes(self) -> bytearray:
+        """ Decode direction codes of all fields.
+        :return: bytearray of width * height codes.
+        """
+        return self.codes[:]
+
+    def to_maze_path(self, compact: bool = True) -> MazePath:
+        """ Decode the whole maze into a MazePath object.
+        :param compact: keep the fields as a CompactFields object.
+        :return: MazePath object.
+        """
+        return MazePath.from_codes(self.width, self.height,
+                                   self.get_codes(), compact, self.seed)
+
+    def close(self) -> None:
+        """ Unmap the file. """
+        self._mmap.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
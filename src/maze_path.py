@@ -1,32 +1,100 @@
 import random
 from collections.abc import Generator
+from typing import Self
+from .compact_fields import CompactFields
+from .generators import generate
 
 
 class MazePath:
     """ Class containing tools to create a maze's schema represented
-    in `fields` attribute as two nested lists.
+    in `fields` attribute as two nested lists, or - in the compact
+    mode - as a CompactFields object offering the same interface.
     """
 
-    def __init__(self, width: int, height: int) -> None:
+    def __init__(self, width: int, height: int,
+                 compact: bool = False, fast: bool = False,
+                 rng: random.Random | None = None,
+                 seed: int | None = None,
+                 algorithm: str | None = None) -> None:
         """Initialize an instance.
         :param width: number of fields in a row.
         :param height: number of rows.
+        :param compact: store the fields as one-byte direction codes
+            instead of nested lists of tuples.
+        :param fast: create the path with the flat-index kernel
+            from the `carver` module instead of `_create_path`.
+        :param rng: source of randomness used for this maze only.
+        :param seed: seed of a new random.Random instance, used if `rng`
+            is not given. Without both, the `random` module is used.
+        :param algorithm: name of a generator from the `generators`
+            registry creating the path instead of `_create_path`;
+            `fast` is the same as "backtracker".
         """
         self.width: int = width
         self.height: int = height
-        self.fields: list[list[tuple | None]] = [
-            [None for _ in range(self.width)]
-            for _ in range(self.height)
-        ]
+        self.seed: int | None = seed
+        self._random = rng or (random if seed is None
+                               else random.Random(seed))
+        self.fields: list[list[tuple | None]] | CompactFields
+        if compact:
+            self.fields = CompactFields(self.width, self.height)
+        else:
+            self.fields = [
+                [None for _ in range(self.width)]
+                for _ in range(self.height)
+            ]
         self._current: tuple = ()
-        self._set_starting_field()
-        self._create_path()
+        if fast or algorithm is not None:
+            self._generate(algorithm or "backtracker")
+        else:
+            self._set_starting_field()
+            self._create_path()
+
+    @classmethod
+    def from_codes(cls, width: int, height: int, codes: bytearray,
+                   compact: bool = True, seed: int | None = None) -> Self:
+        """ Create an instance from direction codes of an already created
+        maze, e.g. one loaded from a file, without generating a new path.
+        :param width: number of fields in a row.
+        :param height: number of rows.
+        :param codes: buffer of width * height direction codes.
+        :param compact: keep the fields as a CompactFields object
+            instead of nested lists of tuples.
+        :param seed: seed the maze was created with, if known.
+        :return: MazePath object.
+        """
+        maze = cls.__new__(cls)
+        maze.width = width
+        maze.height = height
+        maze.seed = seed
+        maze._random = random
+        maze._current = ()
+        maze.fields = CompactFields(width, height, codes)
+        if not compact:
+            maze.fields = maze.fields.to_lists()
+        return maze
+
+    def _generate(self, algorithm: str) -> None:
+        """ Create the path with a generator from the `generators`
+        registry and store the resulting direction codes in the `fields`
+        attribute.
+        :param algorithm: name of the generator.
+        """
+        if isinstance(self.fields, CompactFields):
+            generate(algorithm, self.width, self.height,
+                     self.fields.codes, self._random)
+        else:
+            codes = generate(algorithm, self.width, self.height,
+                             rng=self._random)
+            self.fields = CompactFields(
+                self.width, self.height, codes).to_lists()
 
     def _set_starting_field(self) -> None:
         """ Choose randomly a field from all available fields
         and set its value (representing a previous field) to None.
         """
-        i, j = random.randrange(self.height), random.randrange(self.width)
+        i = self._random.randrange(self.height)
+        j = self._random.randrange(self.width)
         self.fields[i][j] = ()
         self._current = i, j
 
@@ -65,7 +133,7 @@ class MazePath:
         the chosen tuple.
         :param available: list of coordinates
         """
-        i, j = random.choice(available)
+        i, j = self._random.choice(available)
         self.fields[i][j] = self._current
         self._current = i, j
 
@@ -86,3 +154,13 @@ class MazePath:
         for i, row in enumerate(self.fields):
             for j, column in enumerate(row):
                 yield (i, j), column
+
+    def get_codes(self) -> bytearray:
+        """ Get the fields as a flat bytearray of direction codes
+        (see the `compact_fields` module). In the compact mode the
+        underlying buffer is returned without copying.
+        :return: bytearray of width * height codes.
+        """
+        if isinstance(self.fields, CompactFields):
+            return self.fields.codes
+        return CompactFields.from_lists(self.fields).codes
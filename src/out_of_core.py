@@ -0,0 +1,143 @@
+import mmap
+import os
+import random
+import tempfile
+from collections.abc import Iterator
+from typing import Self
+from .carver import carve
+from .compact_fields import UP, DOWN, LEFT, RIGHT
+from .eller import EAST, SOUTH, iter_lines, save_rows
+from .maze_path import MazePath
+
+BLOCK_ROWS = 1024
+
+# translation tables turning direction codes into passage flags: of the
+# field itself, or of its neighbour on the left or above
+_TO_EAST = bytes(EAST if code == RIGHT else 0 for code in range(256))
+_FROM_EAST = bytes(EAST if code == LEFT else 0 for code in range(256))
+_TO_SOUTH = bytes(SOUTH if code == DOWN else 0 for code in range(256))
+_FROM_SOUTH = bytes(SOUTH if code == UP else 0 for code in range(256))
+
+
+class MappedMaze(MazePath):
+    """ Compact MazePath whose direction codes are a memory-mapped file.
+    Close it, or use it as a context manager, to unmap the file.
+    """
+
+    def close(self) -> None:
+        """ Unmap the file of direction codes. """
+        self.get_codes().close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def generate_mapped(path: str, width: int, height: int,
+                    seed: int | None = None,
+                    rng: random.Random | None = None) -> MappedMaze:
+    """ Create a maze with the `carver.carve` kernel, keeping its direction
+    codes in a memory-mapped file and the visited bitmap in a temporary
+    mapped file next to it, so the size of the maze is limited by the disk
+    and not by the memory. The maze is a compact MazePath whose codes are
+    the mapped file; the visited bitmap is unmapped and removed once
+    the maze is carved.
+    :param path: path of the file of direction codes, one byte per field.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param seed: seed of a new random.Random instance, used if `rng`
+        is not given. Without both, the `random` module is used.
+    :param rng: source of randomness.
+    :return: MappedMaze object, to be closed.
+    """
+    rng = rng or (random if seed is None else random.Random(seed))
+    if not width * height:
+        raise ValueError("A mapped maze needs at least one field.")
+    with open(path, "w+b") as file:
+        file.truncate(width * height)
+        codes = mmap.mmap(file.fileno(), width * height)
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        with tempfile.TemporaryFile(dir=directory) as file:
+            file.truncate((width + 2) * (height + 2))
+            with mmap.mmap(file.fileno(),
+                           (width + 2) * (height + 2)) as visited:
+                carve(width, height, codes, rng, visited)
+        codes.flush()
+    except BaseException:
+        codes.close()
+        raise
+    return MappedMaze.from_codes(width, height, codes, seed=seed)
+
+
+def open_mapped(path: str, width: int, height: int) -> MappedMaze:
+    """ Map a file created by `generate_mapped` for reading.
+    :param path: path of the file.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :return: MappedMaze object, to be closed.
+    """
+    with open(path, "rb") as file:
+        codes = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(codes) != width * height:
+        codes.close()
+        raise ValueError(f"{path} does not hold a {width} x {height} maze.")
+    return MappedMaze.from_codes(width, height, codes)
+
+
+def iter_passages(maze: MazePath,
+                  block_rows: int = BLOCK_ROWS) -> Iterator[bytes]:
+    """ Stream rows of passage flags (see the `eller` module) of a maze,
+    reading its direction codes in blocks of rows, so only one block
+    of a mapped maze is in memory at a time.
+    :param maze: MazePath object.
+    :param block_rows: number of rows read at once.
+    :return: iterator of `height` rows of `width` passage flags.
+    """
+    codes = maze.get_codes()
+    width, height = maze.width, maze.height
+    for start in range(0, height, block_rows):
+        stop = min(start + block_rows, height)
+        # one more row, below the block, for the passages down
+        block = bytes(codes[start * width:min(stop + 1, height) * width])
+        for offset in range(0, (stop - start) * width, width):
+            row = block[offset:offset + width]
+            below = block[offset + width:offset + 2 * width]
+            flags = (int.from_bytes(row.translate(_TO_EAST)) |
+                     int.from_bytes(row[1:].translate(_FROM_EAST) + b"\0") |
+                     int.from_bytes(row.translate(_TO_SOUTH)))
+            if below:
+                flags |= int.from_bytes(below.translate(_FROM_SOUTH))
+            yield flags.to_bytes(width)
+
+
+def iter_walls(maze: MazePath, block_rows: int = BLOCK_ROWS
+               ) -> Iterator[tuple[tuple[int, int], tuple[int, int]]]:
+    """ Stream the lines of `PointsDict.lines` row by row, reading
+    the maze in blocks of rows.
+    :param maze: MazePath object.
+    :param block_rows: number of rows read at once.
+    :return: iterator of pairs of (y, x) coordinates.
+    """
+    return iter_lines(iter_passages(maze, block_rows),
+                      maze.width, maze.height)
+
+
+def save_image(path: str, maze: MazePath,
+               step: int = 15,
+               image_format: str = "png",
+               merge: bool = False,
+               block_rows: int = BLOCK_ROWS) -> None:
+    """ Save a maze as an image, reading it in blocks of rows,
+    see `eller.save_rows`; the first row is at the top.
+    :param path: path of the file.
+    :param maze: MazePath object.
+    :param step: side of one cell in pixels.
+    :param image_format: "png", "ppm" or "svg".
+    :param merge: write all lines of an SVG image as a single path.
+    :param block_rows: number of rows read at once.
+    """
+    save_rows(path, iter_passages(maze, block_rows), maze.width,
+              maze.height, step, image_format, merge)
@@ -0,0 +1,210 @@
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from typing import TextIO
+from .compact_fields import UP, DOWN, LEFT, RIGHT
+from .tree import pen_up_distance
+
+# translation tables marking fields with a given direction code
+_CODE_TABLES = {code: bytes(int(value == code) for value in range(256))
+                for code in (UP, DOWN, LEFT, RIGHT)}
+
+_NULL_STAGE = nullcontext()
+
+
+def count_dead_ends(codes: bytes | bytearray, width: int) -> int:
+    """ Count fields no other field points to with its direction code,
+    i.e. leaves of the tree of fields: dead ends of the maze.
+    Every direction is checked for all fields at once, by translating
+    the codes and shifting them to the parent fields.
+    :param codes: direction codes of the maze.
+    :param width: number of fields in a row.
+    :return: number of dead ends.
+    """
+    size = len(codes)
+    if size < 2:
+        return size
+    codes = bytes(codes)
+    parents = (
+        int.from_bytes(codes[1:].translate(_CODE_TABLES[LEFT]) + b"\0") |
+        int.from_bytes(b"\0" + codes[:-1].translate(_CODE_TABLES[RIGHT])) |
+        int.from_bytes(codes[width:].translate(_CODE_TABLES[UP]) +
+                       bytes(min(width, size))) |
+        int.from_bytes(bytes(min(width, size)) +
+                       codes[:-width].translate(_CODE_TABLES[DOWN])))
+    return parents.to_bytes(size).count(0)
+
+
+class Profiler:
+    """ Wall time, CPU time and peak of memory traced by `tracemalloc`
+    of stages of a run, with counters of its work. Stages are measured
+    by `with profiler.stage(name):` blocks. A disabled profiler returns
+    the same empty context and ignores counters, so its hooks may stay
+    in the code. Memory is traced only inside the stages, so the peak
+    of a stage counts the memory it allocated, without objects created
+    before. Tracing slows the Python code down many times, so it can be
+    switched off to get true times.
+    """
+
+    def __init__(self, enabled: bool = True, memory: bool = True) -> None:
+        """ Initialize an instance.
+        :param enabled: measure the stages.
+        :param memory: trace memory allocations.
+        """
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.stages: dict[str, dict[str, float]] = dict()
+        self.counters: dict[str, int | float] = dict()
+
+    def stage(self, name: str):
+        """ Get a context manager measuring a stage. Time of stages
+        with the same name is added up.
+        :param name: name of the stage.
+        :return: context manager.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        """ Measure a stage.
+        :param name: name of the stage.
+        """
+        started = False
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started = True
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            stage = self.stages.setdefault(
+                name, {"wall": 0.0, "cpu": 0.0})
+            stage["wall"] += wall
+            stage["cpu"] += cpu
+            if self.memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                stage["peak_bytes"] = max(stage.get("peak_bytes", 0), peak)
+                if started:
+                    tracemalloc.stop()
+
+    def count(self, name: str, value: int | float = 1) -> None:
+        """ Add a value to a counter.
+        :param name: name of the counter.
+        :param value: value added.
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def counted(self, lines: Iterable) -> Iterable:
+        """ Count lines and their points passing through an iterable,
+        like Instructions passed to a backend, and measure the distance
+        the pen travels lifted between them (see `tree.pen_up_distance`).
+        :param lines: iterable of lines.
+        :return: the iterable itself if the profiler is disabled,
+            otherwise an iterator of the same lines.
+        """
+        if not self.enabled:
+            return lines
+        return self._count_lines(lines)
+
+    def _count_lines(self, lines: Iterable) -> Iterator:
+        """ Yield lines, counting them and their points. Only the ends
+        of lines are kept, for `pen_up_distance`.
+        :param lines: iterable of lines.
+        :return: iterator of lines.
+        """
+        ends = []
+        try:
+            for line in lines:
+                self.count("lines")
+                self.count("points", len(line))
+                ends.append((line[0], line[-1]))
+                yield line
+        finally:
+            self.count("pen_up_distance", pen_up_distance(ends))
+
+    def count_maze(self, codes: bytes | bytearray, width: int,
+                   algorithm: str | None = None) -> None:
+        """ Set counters of a maze: fields and dead ends. They are derived
+        from the finished maze, not counted during generation, so the
+        hot loops of the generators stay untouched. For the backtracker,
+        whose walk steps forward into every field but the first one and
+        turns back at every dead end but the last one, these numbers of
+        steps and backtracks are derived too; other algorithms do not
+        walk, so they get neither.
+        :param codes: direction codes of the maze.
+        :param width: number of fields in a row.
+        :param algorithm: name of the generator that created the maze.
+        """
+        if not self.enabled:
+            return
+        dead_ends = count_dead_ends(codes, width)
+        self.count("fields", len(codes))
+        self.count("dead_ends", dead_ends)
+        if algorithm == "backtracker":
+            self.count("derived_forward_steps", max(len(codes) - 1, 0))
+            self.count("derived_backtracks", max(dead_ends - 1, 0))
+
+    def count_tree(self, tree) -> None:
+        """ Set counters of a Tree: branches started from its leaves,
+        nodes where branches met, i.e. were trimmed or joined, and
+        trunks.
+        Call it before the trunks are consumed by Instructions.
+        :param tree: Tree object.
+        """
+        if not self.enabled:
+            return
+        self.count("branches", len(tree.leaves))
+        self.count("nodes", len(tree.nodes))
+        self.count("trunks", len(tree.trunks))
+
+    def as_dict(self) -> dict:
+        """ Get the results.
+        :return: dictionary with keys "stages" and "counters".
+        """
+        return {"stages": self.stages, "counters": self.counters}
+
+    def format_table(self) -> str:
+        """ Format the results as a table.
+        :return: string.
+        """
+        peak = f" {'peak MiB':>10}" if self.memory else ""
+        rows = [f"{'stage':<22} {'wall s':>10} {'cpu s':>10}{peak}"]
+        for name, stage in self.stages.items():
+            peak = (f" {stage['peak_bytes'] / 2 ** 20:>10.1f}"
+                    if self.memory else "")
+            rows.append(f"{name:<22} {stage['wall']:>10.4f} "
+                        f"{stage['cpu']:>10.4f}{peak}")
+        if self.stages:
+            wall = sum(stage["wall"] for stage in self.stages.values())
+            cpu = sum(stage["cpu"] for stage in self.stages.values())
+            rows.append(f"{'total':<22} {wall:>10.4f} {cpu:>10.4f}")
+        for name, value in self.counters.items():
+            value = f"{value:.1f}" if isinstance(value, float) else value
+            rows.append(f"{name:<22} {value:>10}")
+        return "\n".join(rows)
+
+    def report(self, output_format: str = "table",
+               file: TextIO | None = None) -> None:
+        """ Write the results, if the profiler is enabled.
+        :param output_format: "table" or "json".
+        :param file: file object; standard error by default, so the
+            output of the program is not mixed with the results.
+        """
+        if not self.enabled:
+            return
+        file = file or sys.stderr
+        if output_format == "json":
+            json.dump(self.as_dict(), file, indent=2)
+            file.write("\n")
+        else:
+            file.write(self.format_table() + "\n")
@@ -0,0 +1,192 @@
+import struct
+import zlib
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IDAT_SIZE = 1 << 16
+WHITE, BLACK = 255, 0
+
+
+def _write_chunk(file: BinaryIO, kind: bytes, data: bytes) -> None:
+    """ Write a single PNG chunk: length, type, data and checksum.
+    :param file: binary file object.
+    :param kind: four-letter chunk type.
+    :param data: chunk's content.
+    """
+    file.write(struct.pack(">I", len(data)))
+    file.write(kind)
+    file.write(data)
+    file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+
+def write_png(file: BinaryIO, width: int, height: int,
+              rows: Iterable[bytes],
+              palette: list[tuple[int, int, int]] | None = None) -> None:
+    """ Encode rows of 8-bit pixels as a PNG image, compressing them one
+    by one, so no copy of the whole image is ever made. Pixels are
+    levels of gray or, if a palette is given, indices of its colours.
+    :param file: binary file object.
+    :param width: width of the image in pixels.
+    :param height: height of the image in pixels.
+    :param rows: iterable of `height` bytes-like rows, `width` bytes each.
+    :param palette: optional list of up to 256 (red, green, blue) tuples.
+    """
+    file.write(PNG_SIGNATURE)
+    color_type = 0 if palette is None else 3
+    _write_chunk(file, b"IHDR", struct.pack(
+        ">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+    if palette is not None:
+        _write_chunk(file, b"PLTE", bytes(
+            value for colour in palette for value in colour))
+    compressor = zlib.compressobj()
+    pending = bytearray()
+    for row in rows:
+        # every row starts with the number of its filter - none
+        pending += compressor.compress(b"\x00")
+        pending += compressor.compress(row)
+        if len(pending) >= IDAT_SIZE:
+            _write_chunk(file, b"IDAT", pending)
+            pending = bytearray()
+    pending += compressor.flush()
+    _write_chunk(file, b"IDAT", pending)
+    _write_chunk(file, b"IEND", b"")
+
+
+def _channels(palette: list[tuple[int, int, int]] | None) -> list[bytes]:
+    """ Build translation tables mapping 8-bit pixels to the values
+    of the red, green and blue channels.
+    :param palette: optional list of up to 256 (red, green, blue) tuples.
+    :return: list of three 256-byte tables.
+    """
+    if palette is None:
+        return [bytes(range(256))] * 3
+    padded = list(palette) + [(0, 0, 0)] * (256 - len(palette))
+    return [bytes(colour[channel] for colour in padded)
+            for channel in range(3)]
+
+
+def write_ppm(file: BinaryIO, width: int, height: int,
+              rows: Iterable[bytes],
+              palette: list[tuple[int, int, int]] | None = None) -> None:
+    """ Encode rows of 8-bit pixels as a binary PPM (P6) image, expanding
+    them to RGB one by one. Pixels are interpreted as in `write_png`.
+    :param file: binary file object.
+    :param width: width of the image in pixels.
+    :param height: height of the image in pixels.
+    :param rows: iterable of `height` bytes-like rows, `width` bytes each.
+    :param palette: optional list of up to 256 (red, green, blue) tuples.
+    """
+    file.write(b"P6\n%d %d\n255\n" % (width, height))
+    channels = _channels(palette)
+    rgb = bytearray(3 * width)
+    for row in rows:
+        row = bytes(row)
+        for channel, table in enumerate(channels):
+            rgb[channel::3] = row.translate(table)
+        file.write(rgb)
+
+
+class Raster:
+    """ Framebuffer of 8-bit pixels in a single bytearray, one byte per
+    pixel, row after row from the top of the image. Axis-aligned lines
+    of the maze are drawn into it with slice assignments.
+    """
+
+    def __init__(self, width: int, height: int,
+                 background: int = WHITE,
+                 palette: list[tuple[int, int, int]] | None = None) -> None:
+        """ Initialize an instance.
+        :param width: width of the image in pixels.
+        :param height: height of the image in pixels.
+        :param background: initial value of every pixel.
+        :param palette: optional list of (red, green, blue) tuples;
+            without it pixels are levels of gray.
+        """
+        self.width: int = width
+        self.height: int = height
+        self.palette = palette
+        self.pixels = bytearray([background]) * (width * height)
+
+    def draw_horizontal(self, y: int, x_1: int, x_2: int,
+                        value: int = BLACK, thickness: int = 1) -> None:
+        """ Draw a horizontal line between two pixels, both included.
+        :param y: row of the line.
+        :param x_1: column of one end.
+        :param x_2: column of the other end.
+        :param value: value of the line's pixels.
+        :param thickness: number of rows covered, growing downwards.
+        """
+        x_1, x_2 = sorted((x_1, x_2))
+        run = bytes([value]) * (x_2 - x_1 + thickness)
+        for row in range(y, min(y + thickness, self.height)):
+            start = row * self.width + x_1
+            self.pixels[start:start + len(run)] = run
+
+    def draw_vertical(self, x: int, y_1: int, y_2: int,
+                      value: int = BLACK, thickness: int = 1) -> None:
+        """ Draw a vertical line between two pixels, both included.
+        :param x: column of the line.
+        :param y_1: row of one end.
+        :param y_2: row of the other end.
+        :param value: value of the line's pixels.
+        :param thickness: number of columns covered, growing rightwards.
+        """
+        y_1, y_2 = sorted((y_1, y_2))
+        run = bytes([value]) * thickness
+        for row in range(y_1, min(y_2 + thickness, self.height)):
+            start = row * self.width + x
+            self.pixels[start:start + thickness] = run
+
+    def rows(self) -> Iterator[memoryview]:
+        """ Yield rows of the image without copying them.
+        :return: iterator of memoryviews.
+        """
+        view = memoryview(self.pixels)
+        for start in range(0, len(self.pixels), self.width):
+            yield view[start:start + self.width]
+
+    def write_png(self, file: BinaryIO) -> None:
+        """ Save the image as PNG.
+        :param file: binary file object.
+        """
+        write_png(file, self.width, self.height, self.rows(), self.palette)
+
+    def write_ppm(self, file: BinaryIO) -> None:
+        """ Save the image as PPM.
+        :param file: binary file object.
+        """
+        write_ppm(file, self.width, self.height, self.rows(), self.palette)
+
+
+def render(lines: Iterable[Iterable[tuple[int, int]]],
+           width: int, height: int,
+           step: int = 15, margin: int = 10,
+           thickness: int = 1) -> Raster:
+    """ Rasterize lines of the maze: lines yielded by Instructions, or
+    pairs of points like those in `PointsDict.lines`. The maze is oriented
+    like in the turtle window: the first row of points at the bottom.
+    :param lines: iterable of lines of (y, x) coordinates.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param step: side of one cell in pixels.
+    :param margin: empty space around the maze in pixels.
+    :param thickness: width of the walls in pixels.
+    :return: Raster object.
+    """
+    size = 2 * margin + thickness
+    raster = Raster(width * step + size, height * step + size)
+    bottom = margin + height * step
+    for line in lines:
+        previous = None
+        for y, x in line:
+            point = margin + x * step, bottom - y * step
+            if previous is not None:
+                if previous[1] == point[1]:
+                    raster.draw_horizontal(point[1], previous[0], point[0],
+                                           thickness=thickness)
+                else:
+                    raster.draw_vertical(point[0], previous[1], point[1],
+                                         thickness=thickness)
+            previous = point
+    return raster
@@ -0,0 +1,168 @@
+from array import array
+from .compact_fields import ROOT, UP, DOWN, LEFT, RIGHT
+from .maze_path import MazePath
+
+
+class MazeSolver:
+    """ Index answering queries about paths between fields of a maze.
+    The direction codes of a maze make a tree of fields rooted in the
+    starting field of the path, with every field pointing to its parent,
+    and in a tree the only path between two fields goes through their
+    lowest common ancestor. The index keeps the depth of every field and
+    binary-lifting tables: `up[k][cell]` is the ancestor 2 ** k levels
+    above the field (the root is its own parent), so the ancestor is
+    found in O(log n) steps. Fields are (row, column) tuples, like keys
+    of MazePath's `fields`.
+    """
+
+    def __init__(self, maze: MazePath) -> None:
+        """ Initialize an instance and build the tables.
+        :param maze: MazePath object.
+        """
+        self.width: int = maze.width
+        self.height: int = maze.height
+        codes = maze.get_codes()
+        size = self.width * self.height
+        typecode = "I" if size < 2 ** 32 else "Q"
+        offsets = {UP: -self.width, DOWN: self.width, LEFT: -1, RIGHT: 1}
+        parents = array(typecode, bytes(array(typecode).itemsize * size))
+        root = 0
+        for cell, code in enumerate(codes):
+            if code == ROOT:
+                root = cell
+                parents[cell] = cell
+            else:
+                parents[cell] = cell + offsets[code]
+        self.root: int = root
+        self.depths: array = self._get_depths(parents, root)
+        self.up: list[array] = [parents]
+        for _ in range(max(max(self.depths, default=0).bit_length() - 1, 0)):
+            previous = self.up[-1]
+            self.up.append(array(typecode,
+                                 [previous[cell] for cell in previous]))
+
+    @staticmethod
+    def _get_depths(parents: array, root: int) -> array:
+        """ Count the number of steps from every field to the root,
+        walking up from fields of unknown depth to the first known one.
+        :param parents: array of indices of parent fields.
+        :param root: index of the root.
+        :return: array of depths.
+        """
+        depths = array("q", [-1]) * len(parents)
+        if not depths:
+            return depths
+        depths[root] = 0
+        for cell in range(len(parents)):
+            stack = []
+            while depths[cell] < 0:
+                stack.append(cell)
+                cell = parents[cell]
+            depth = depths[cell]
+            for cell in reversed(stack):
+                depth += 1
+                depths[cell] = depth
+        return depths
+
+    def _index(self, field: tuple[int, int]) -> int:
+        """ Get the index of a field, checking its coordinates.
+        :param field: tuple of coordinates: row, column.
+        :return: index of the field.
+        """
+        i, j = field
+        if not (0 <= i < self.height and 0 <= j < self.width):
+            raise ValueError(f"{field} is not a field of the maze.")
+        return i * self.width + j
+
+    def _field(self, cell: int) -> tuple[int, int]:
+        """ Get coordinates of a field.
+        :param cell: index of the field.
+        :return: tuple of coordinates: row, column.
+        """
+        return divmod(cell, self.width)
+
+    def _ancestor(self, cell: int, steps: int) -> int:
+        """ Go up the tree.
+        :param cell: index of a field.
+        :param steps: number of levels, at most the depth of the field.
+        :return: index of the ancestor.
+        """
+        level = 0
+        while steps:
+            if steps & 1:
+                cell = self.up[level][cell]
+            steps >>= 1
+            level += 1
+        return cell
+
+    def _lca(self, a: int, b: int) -> int:
+        """ Find the lowest common ancestor of two fields: go up from
+        the deeper one to the depth of the other, then from both by
+        the longest jumps that keep them apart.
+        :param a: index of a field.
+        :param b: index of a field.
+        :return: index of the ancestor.
+        """
+        depths = self.depths
+        if depths[a] < depths[b]:
+            a, b = b, a
+        a = self._ancestor(a, depths[a] - depths[b])
+        if a == b:
+            return a
+        for up in reversed(self.up):
+            if up[a] != up[b]:
+                a, b = up[a], up[b]
+        return self.up[0][a]
+
+    def depth(self, field: tuple[int, int]) -> int:
+        """ Get the distance of a field from the root of the tree.
+        :param field: tuple of coordinates: row, column.
+        :return: number of steps.
+        """
+        return self.depths[self._index(field)]
+
+    def lca(self, a: tuple[int, int], b: tuple[int, int]) -> tuple[int, int]:
+        """ Find the field where the paths from two fields to the root
+        of the tree meet.
+        :param a: tuple of coordinates: row, column.
+        :param b: tuple of coordinates: row, column.
+        :return: tuple of coordinates: row, column.
+        """
+        return self._field(self._lca(self._index(a), self._index(b)))
+
+    def distance(self, a: tuple[int, int], b: tuple[int, int]) -> int:
+        """ Count the steps of the path between two fields.
+        :param a: tuple of coordinates: row, column.
+        :param b: tuple of coordinates: row, column.
+        :return: number of steps.
+        """
+        a, b = self._index(a), self._index(b)
+        depths = self.depths
+        return depths[a] + depths[b] - 2 * depths[self._lca(a, b)]
+
+    def path(self, a: tuple[int, int],
+             b: tuple[int, int]) -> list[tuple[int, int]]:
+        """ Get the path between two fields.
+        :param a: tuple of coordinates: row, column.
+        :param b: tuple of coordinates: row, column.
+        :return: list of coordinates of fields, from `a` to `b`.
+        """
+        a, b = self._index(a), self._index(b)
+        common = self._lca(a, b)
+        parents = self.up[0]
+        first, second = [a], [b]
+        while first[-1] != common:
+            first.append(parents[first[-1]])
+        while second[-1] != common:
+            second.append(parents[second[-1]])
+        second.pop()
+        return [self._field(cell) for cell in first + second[::-1]]
+
+    def solve(self) -> list[tuple[int, int]]:
+        """ Get the path between the fields next to the exits of the maze,
+        in the middle of its left and right borders (see
+        `PointsDict.get_exits_lines`).
+        :return: list of coordinates of fields, from left to right.
+        """
+        middle = self.height // 2
+        return self.path((middle, 0), (middle, self.width - 1))
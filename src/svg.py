@@ -0,0 +1,51 @@
+from collections.abc import Iterable
+from typing import TextIO
+
+HEADER = ('<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+          'width="{width}" height="{height}" '
+          'viewBox="0 0 {width} {height}">\n'
+          '<rect width="100%" height="100%" fill="white"/>\n'
+          '<g fill="none" stroke="black" stroke-width="{thickness}" '
+          'stroke-linecap="square">\n')
+FOOTER = '</g>\n</svg>\n'
+
+
+def write_svg(file: TextIO,
+              lines: Iterable[Iterable[tuple[int, int]]],
+              width: int, height: int,
+              step: int = 15, margin: int = 10,
+              thickness: int = 1,
+              merge: bool = False) -> None:
+    """ Stream lines of the maze to a file as an SVG document, writing
+    every line as soon as it is yielded, so the document is never held
+    in memory. Every line becomes a `<polyline>` element, or - with
+    `merge` - a subpath of a single `<path>` element, which keeps files
+    and parsing time small for mazes with millions of walls. The maze is
+    oriented like in the turtle window: the first row of points at the
+    bottom.
+    :param file: text file object.
+    :param lines: iterable of lines of (y, x) coordinates, e.g.
+        Instructions (preferably compressed) or `PointsDict.lines`.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param step: side of one cell in pixels.
+    :param margin: empty space around the maze in pixels.
+    :param thickness: width of the walls in pixels.
+    :param merge: write all lines as one path element.
+    """
+    bottom = margin + height * step
+    file.write(HEADER.format(width=width * step + 2 * margin,
+                             height=bottom + margin,
+                             thickness=thickness))
+    if merge:
+        file.write('<path d="')
+    for line in lines:
+        points = " ".join(f"{margin + x * step},{bottom - y * step}"
+                          for y, x in line)
+        if merge:
+            file.write(f"M{points.replace(' ', 'L', 1)}")
+        else:
+            file.write(f'<polyline points="{points}"/>\n')
+    if merge:
+        file.write('"/>\n')
+    file.write(FOOTER)
@@ -0,0 +1,156 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from .compact_fields import ROOT, UP, DOWN, LEFT, RIGHT
+from .generators import generate
+from .maze_path import MazePath
+
+OPPOSITE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+# algorithm connecting the tiles into a spanning tree
+TILES_ALGORITHM = "kruskal"
+
+# width, height, algorithm, seed, index of the exit field, code of the exit
+TileJob = tuple[int, int, str, int, int, int]
+
+
+def reroot(codes: bytearray, width: int, cell: int, code: int) -> None:
+    """ Make a field the root of a maze's tree by reversing the path from
+    it to the current root, then point it outside of the maze.
+    :param codes: direction codes of the maze.
+    :param width: number of fields in a row.
+    :param cell: index of the new root.
+    :param code: new direction code of the field.
+    """
+    offsets = {UP: -width, DOWN: width, LEFT: -1, RIGHT: 1}
+    while True:
+        previous = codes[cell]
+        codes[cell] = code
+        if previous == ROOT:
+            return
+        code = OPPOSITE[previous]
+        cell += offsets[previous]
+
+
+def generate_tile(job: TileJob) -> bytes:
+    """ Create a maze of one tile and lead its path out through the exit
+    field. Executed in worker processes.
+    :param job: tuple: width, height, algorithm, seed, index of the exit
+        field and its direction code; the exit index of the tile keeping
+        the root of the whole maze is -1.
+    :return: direction codes of the tile.
+    """
+    width, height, algorithm, seed, exit_cell, exit_code = job
+    codes = generate(algorithm, width, height, rng=random.Random(seed))
+    if exit_cell >= 0:
+        reroot(codes, width, exit_cell, exit_code)
+    return bytes(codes)
+
+
+def _spans(size: int, tile: int) -> list[tuple[int, int]]:
+    """ Split a range of fields into tiles.
+    :param size: number of fields.
+    :param tile: number of fields of a tile; the last one may be smaller.
+    :return: list of (first field, number of fields) tuples.
+    """
+    return [(start, min(tile, size - start))
+            for start in range(0, size, tile)]
+
+
+def get_tile_jobs(width: int, height: int, tile_width: int,
+                  tile_height: int, algorithm: str = "backtracker",
+                  rng: random.Random | None = None
+                  ) -> list[tuple[int, int, TileJob]]:
+    """ Split a maze into tiles, connect the tiles into a random spanning
+    tree and choose a random field on the border between every tile and
+    its parent in that tree, where the tile's path leads out.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param tile_width: number of fields in a row of a tile.
+    :param tile_height: number of rows of a tile.
+    :param algorithm: name of the generator creating the tiles.
+    :param rng: source of randomness; the `random` module by default.
+    :return: list of (first row, first column, job) tuples,
+        row after row of tiles.
+    """
+    rng = rng or random
+    rows = _spans(height, tile_height)
+    columns = _spans(width, tile_width)
+    parents = generate(TILES_ALGORITHM, len(columns), len(rows), rng=rng)
+    jobs = []
+    for tile_row, (top, tile_h) in enumerate(rows):
+        for tile_column, (left, tile_w) in enumerate(columns):
+            code = parents[tile_row * len(columns) + tile_column]
+            if code == ROOT:
+                exit_cell = -1
+            elif code == UP:
+                exit_cell = rng.randrange(tile_w)
+            elif code == DOWN:
+                exit_cell = (tile_h - 1) * tile_w + rng.randrange(tile_w)
+            elif code == LEFT:
+                exit_cell = rng.randrange(tile_h) * tile_w
+            else:
+                exit_cell = rng.randrange(tile_h) * tile_w + tile_w - 1
+            job = (tile_w, tile_h, algorithm, rng.getrandbits(64),
+                   exit_cell, code)
+            jobs.append((top, left, job))
+    return jobs
+
+
+def _assemble(codes: bytearray, width: int, tiles: list,
+              results) -> None:
+    """ Copy direction codes of tiles into the maze, row by row.
+    :param codes: direction codes of the maze.
+    :param width: number of fields in a row of the maze.
+    :param tiles: list returned by `get_tile_jobs`.
+    :param results: iterable of codes of tiles, in the order of `tiles`.
+    """
+    for (top, left, job), tile in zip(tiles, results):
+        tile_width, tile_height = job[:2]
+        for row in range(tile_height):
+            start = (top + row) * width + left
+            codes[start:start + tile_width] = \
+                tile[row * tile_width:(row + 1) * tile_width]
+
+
+def generate_tiled(width: int, height: int,
+                   tile_width: int = 256, tile_height: int = 256,
+                   algorithm: str = "backtracker",
+                   seed: int | None = None,
+                   workers: int | None = None,
+                   compact: bool = True) -> MazePath:
+    """ Create a maze in tiles generated independently in a pool of
+    processes. The tiles are connected by exactly one passage per edge
+    of a random spanning tree of tiles, and the path of every tile is
+    rerooted to lead through that passage, so the whole maze is a single
+    spanning tree with direction codes like those of MazePath.
+    The maze depends on the seed only, not on the number of workers.
+    Every tile is a separate maze, so borders of tiles stay visible
+    as long walls with a single passage.
+    :param width: number of fields in a row.
+    :param height: number of rows.
+    :param tile_width: number of fields in a row of a tile.
+    :param tile_height: number of rows of a tile.
+    :param algorithm: name of the generator creating the tiles.
+    :param seed: seed of the maze; without it the `random` module is used.
+    :param workers: number of worker processes; defaults to the number
+        of CPUs; with 1 the tiles are created in this process.
+    :param compact: keep the fields as a CompactFields object.
+    :return: MazePath object.
+    """
+    rng = random if seed is None else random.Random(seed)
+    tiles = get_tile_jobs(width, height, tile_width, tile_height,
+                          algorithm, rng)
+    jobs = [job for _, _, job in tiles]
+    workers = workers or os.cpu_count() or 1
+    codes = bytearray(width * height)
+    if workers == 1:
+        results = map(generate_tile, jobs)
+        _assemble(codes, width, tiles, results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                generate_tile, jobs,
+                chunksize=max(1, len(jobs) // (workers * 4)))
+            _assemble(codes, width, tiles, results)
+    return MazePath.from_codes(width, height, codes, compact, seed)
+
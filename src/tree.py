@@ -1,8 +1,14 @@
+import math
+from array import array
 from collections import deque
+from collections.abc import Callable, Iterable
 from typing import Self
+from .csr import CSRAdjacency
 
 
 class Branch:
+    __slots__ = ("points_dict", "direction", "line", "children", "finished")
+
     def __init__(self,
                  leaf: tuple[int, int],
                  points_dict: dict) -> None:
@@ -46,6 +52,43 @@ class Branch:
         other.finished = True
 
 
+class CSRBranch(Branch):
+    """ Branch of a tree built from a CSRAdjacency. Points of its line
+    are ids of points, packed into an unsigned int array, its children
+    are kept in a list, and the line is extended by reading the arrays
+    of the adjacency directly.
+    """
+    __slots__ = ()
+
+    def __init__(self, leaf: int, points_dict: CSRAdjacency) -> None:
+        """ Initialize an instance.
+        :param leaf: id of an end of a branch.
+        :param points_dict: CSRAdjacency object.
+        """
+        self.points_dict = points_dict
+        self.direction, = points_dict[leaf]
+        self.line = array("I", (leaf,))
+        self.children = list()
+        self.finished = False
+
+    def extend(self) -> None:
+        """ Extend the line array using the CSRAdjacency arrays until
+        the number of neighbours of the last point is other than two.
+        """
+        offsets = self.points_dict.offsets
+        neighbours = self.points_dict.neighbours
+        previous, point = self.line[-1], self.direction
+        self.line.append(point)
+        while offsets[point + 1] - offsets[point] == 2:
+            start = offsets[point]
+            nxt = neighbours[start]
+            if nxt == previous:
+                nxt = neighbours[start + 1]
+            self.line.append(nxt)
+            previous, point = point, nxt
+        self.direction = None
+
+
 class Tree:
     def __init__(self, points_dict: dict) -> None:
         """ Initialize an instance.
@@ -57,13 +100,18 @@ class Tree:
         self.nodes = dict()
         self._instructions = None
         self.queue = self.get_queue()
+        self.leaves = {branch.line[0]: branch for branch in self.queue}
         self.get_trunks()
 
     def get_queue(self) -> deque[Branch]:
         """ Populate new queue with leaves - ends of branches -
-        using the points that have just one neighbour.
+        using the points that have just one neighbour. For a CSRAdjacency
+        the queue is made of CSRBranch instances.
         :return: deque of Branch instances.
         """
+        if isinstance(self.points_dict, CSRAdjacency):
+            return deque(CSRBranch(point, self.points_dict)
+                         for point in self.points_dict.leaves())
         result = deque()
         for point, value in self.points_dict.items():
             if len(value) == 1:
@@ -81,17 +129,16 @@ class Tree:
 
     @staticmethod
     def trim(node: dict) -> Branch:
-        """ Find the longest branch that is associated with the node, make
-        the other objects from the `branches` list its children and mark
-        them as finished. Return the parent branch.
+        """ Take the longest branch that is associated with the node (kept
+        by `get_node` at the beginning of the `branches` list), make
+        the other objects from the list its children and mark them
+        as finished. Return the parent branch.
         :param node: dictionary with keys: "branches" (list of branches)
             and "open_directions" (set of coordinates).
         :return: Branch object.
         """
-        branches = node["branches"]
-        branches.sort(key=lambda branch: len(branch.line), reverse=True)
         direction_left, = node["open_directions"]
-        parent, *children = branches
+        parent, *children = node["branches"]
         for child in children:
             child.finished = True
             child.reverse_()
@@ -100,29 +147,43 @@ class Tree:
         return parent
 
     def move_to_trunks(self, finished_branch) -> None:
-        """ Append the finished_branch to the list of trunks. Find in the queue
-        a branch that starts where the finished_branch ends and mark it as
-        finished. The function runs rarely, only if the first node the given
-        branch meets is a leaf.
+        """ Append the finished_branch to the list of trunks. Look up in
+        the `leaves` index a branch that starts where the finished_branch
+        ends and mark it as finished. The function runs rarely, only if
+        the first node the given branch meets is a leaf.
         :param finished_branch: Branch object.
         """
         self.trunks.append(finished_branch)
-        for opposite_branch in self.queue:
-            if opposite_branch.line[0] == finished_branch.line[-1]:
-                opposite_branch.finished = True
+        opposite_branch = self.leaves.get(finished_branch.line[-1])
+        if opposite_branch is not None:
+            opposite_branch.finished = True
 
     def get_node(self, branch) -> dict:
         """ Add a new node, if it does not exist to the `nodes` dict.
         Append the branch to it, and remove from open directions a tuple
-        that belongs to the branch's line.
+        that belongs to the branch's line. While some directions are still
+        open, insert the branch after the branches at least as long as it,
+        so the `branches` list stays in the order of a stable sort from
+        the longest one and `trim` does not need to sort it. Once all
+        directions are closed, the branch is appended, and the first one
+        is the one returned by `trim`, which is joined with the given
+        branch in `serve`.
         :param branch:
         :return: dictionary with keys: "branches" (list of branches)
             and "open_directions" (set of coordinates).
         """
         last_point = branch.line[-1]
-        node = self.nodes.setdefault(last_point, self.new_node(last_point))
-        node["branches"].append(branch)
+        node = self.nodes.get(last_point)
+        if node is None:
+            node = self.nodes[last_point] = self.new_node(last_point)
+        branches = node["branches"]
         node["open_directions"].remove(branch.line[-2])
+        position = len(branches)
+        if node["open_directions"]:
+            length = len(branch.line)
+            while position and len(branches[position - 1].line) < length:
+                position -= 1
+        branches.insert(position, branch)
         return node
 
     def serve(self, branch) -> None:
@@ -162,24 +223,197 @@ class Tree:
                 self.serve(branch)
 
 
+def compress_line(line: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """ Remove from a line the points lying in the middle of straight runs,
+    leaving only its ends and corners. Repeated points, like the one
+    where two branches were joined, are skipped as well.
+    :param line: iterable of coordinates.
+    :return: list of coordinates.
+    """
+    result = []
+    previous = direction = None
+    for point in line:
+        if previous is None:
+            result.append(point)
+        else:
+            step = point[0] - previous[0], point[1] - previous[1]
+            if step == (0, 0):
+                continue
+            if step == direction:
+                result[-1] = point
+            else:
+                result.append(point)
+            direction = step
+        previous = point
+    return result
+
+
+def pen_up_distance(lines: Iterable[Iterable[tuple[int, int]]]) -> float:
+    """ Sum the distances the pen travels lifted between consecutive lines,
+    from the end of one line to the start of the next one.
+    :param lines: iterable of lines of coordinates.
+    :return: total distance, in sides of fields.
+    """
+    distance = 0.0
+    previous = None
+    for line in lines:
+        if previous is not None:
+            distance += math.dist(previous, line[0])
+        previous = line[-1]
+    return distance
+
+
+def chain_lines(lines: list, bucket: int = 3) -> list[list[tuple[int, int]]]:
+    """ Reorder lines so the pen travels little between them: after every
+    line take the unused line with an end nearest to where the pen is,
+    reversing it if needed. A line starting exactly there is appended
+    to the current stroke, so chains of lines meeting at their ends,
+    like branches of a Tree meeting at a node, are drawn without lifting
+    the pen. Ends of lines are kept in square buckets of the grid,
+    searched in rings around the pen, so a search usually reads a few
+    buckets only; used lines are removed from the buckets lazily. Rings
+    never grow beyond the grid, and once they would cover more buckets
+    than there are unused lines, the unused lines are scanned instead,
+    so the last searches of a big maze do not read mostly empty rings.
+    :param lines: list of lines of coordinates, the first one is drawn
+        first.
+    :param bucket: side of a bucket, in sides of fields.
+    :return: list of strokes: lists of coordinates.
+    """
+    if not lines:
+        return []
+    buckets = dict()
+    for index, line in enumerate(lines):
+        first, last = line[0], line[-1]
+        for point in (first, last) if first != last else (first,):
+            key = point[0] // bucket, point[1] // bucket
+            buckets.setdefault(key, []).append(index)
+    rows = [key[0] for key in buckets]
+    columns = [key[1] for key in buckets]
+    limit = max(max(rows) - min(rows), max(columns) - min(columns))
+    used = bytearray(len(lines))
+    unused = list(range(1, len(lines)))
+
+    def ring(row: int, column: int, radius: int):
+        if not radius:
+            yield row, column
+            return
+        for j in range(column - radius, column + radius + 1):
+            yield row - radius, j
+            yield row + radius, j
+        for i in range(row - radius + 1, row + radius):
+            yield i, column - radius
+            yield i, column + radius
+
+    def closer(point: tuple[int, int], indices: list[int],
+               best: int, reverse: bool,
+               best_distance: float) -> tuple[int, bool, float]:
+        for index in indices:
+            line = lines[index]
+            distance = math.dist(point, line[0])
+            if distance < best_distance:
+                best, reverse, best_distance = index, False, distance
+            distance = math.dist(point, line[-1])
+            if distance < best_distance:
+                best, reverse, best_distance = index, True, distance
+        return best, reverse, best_distance
+
+    def nearest(point: tuple[int, int],
+                remaining: int) -> tuple[int, bool, float]:
+        row, column = point[0] // bucket, point[1] // bucket
+        best, reverse, best_distance = -1, False, math.inf
+        for radius in range(limit + 1):
+            if (2 * radius + 1) ** 2 > remaining:
+                unused[:] = [index for index in unused if not used[index]]
+                return closer(point, unused, -1, False, math.inf)
+            for key in ring(row, column, radius):
+                indices = buckets.get(key)
+                if not indices:
+                    continue
+                indices[:] = [index for index in indices if not used[index]]
+                best, reverse, best_distance = closer(
+                    point, indices, best, reverse, best_distance)
+            # ends in further rings are at least that far away
+            if best_distance <= radius * bucket:
+                break
+        return best, reverse, best_distance
+
+    used[0] = 1
+    stroke = list(lines[0])
+    strokes = [stroke]
+    for remaining in range(len(lines) - 1, 0, -1):
+        index, reverse, distance = nearest(stroke[-1], remaining)
+        used[index] = 1
+        line = lines[index]
+        line = list(reversed(line)) if reverse else list(line)
+        if distance:
+            stroke = line
+            strokes.append(stroke)
+        else:
+            stroke.extend(line[1:])
+    return strokes
+
+
 class Instructions:
     """ Iterator returning instructions for the turtle module.
     First yields the coordinates of the line of the longest branch
     (one of two trunks), then lines of its consecutive children
     and so on. After the longest branch and its children are
     exhausted, iterator returns by the same way the other trunk.
+    If the tree was built from ids of points, e.g. from a CSRAdjacency,
+    pass its `point` method as `decode` to get coordinates back.
+    With `compress` set, only the ends and corners of every line
+    are returned (see `compress_line`).
+    With `chain` set, all lines are read first and returned in the order
+    of `chain_lines`, joined into strokes drawn without lifting the pen.
     """
 
-    def __init__(self, trunks: list):
+    def __init__(self, trunks: list, decode: Callable | None = None,
+                 compress: bool = False, chain: bool = False):
         self._queue = trunks
+        self._decode = decode
+        self._compress = compress
+        self._chain = chain
+        self._strokes = None
 
     def __iter__(self):
         return self
 
-    def __next__(self) -> deque:
+    def __next__(self) -> deque | list:
+        if self._chain:
+            return self._next_stroke()
         if not self._queue:
             raise StopIteration
+        return self._next_line(self._compress)
+
+    def _next_stroke(self) -> list:
+        """ Get the next stroke of chained lines, chaining all lines
+        at the first call.
+        :return: list of coordinates.
+        """
+        if self._strokes is None:
+            # lines are chained by their ends, so they are compressed
+            # after chaining, as strokes
+            lines = []
+            while self._queue:
+                lines.append(self._next_line(False))
+            self._strokes = iter(chain_lines(lines))
+        line = next(self._strokes)
+        if self._compress:
+            line = compress_line(line)
+        return line
+
+    def _next_line(self, compress: bool) -> deque | list:
+        """ Get the line of the next branch, in the order of the tree.
+        :param compress: keep only the ends and corners of the line.
+        :return: deque or list of coordinates.
+        """
         next_branch = self._queue.pop()
         if next_branch.children:
             self._queue.extend(list(reversed(next_branch.children)))
-        return next_branch.line
+        line = next_branch.line
+        if self._decode is not None:
+            line = [self._decode(point) for point in line]
+        if compress:
+            line = compress_line(line)
+        return line
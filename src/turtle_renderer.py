@@ -0,0 +1,55 @@
+import time
+import turtle
+from collections.abc import Iterable
+
+
+def draw(instructions: Iterable,
+         step: int,
+         home: tuple[int, int],
+         slow: bool = False,
+         flush_every: int | None = None,
+         flush_ms: int | None = None,
+         instant: bool = False) -> None:
+    """ Draw lines yielded by Instructions with the turtle module.
+    By default the screen is refreshed after every move of the turtle.
+    If `flush_every` or `flush_ms` is given, the automatic refreshing is
+    turned off and the screen is updated after that many moves or
+    milliseconds, whichever comes first. With `instant`, the screen is
+    updated only once, when the whole maze is drawn.
+    :param instructions: iterable of lines of (y, x) coordinates.
+    :param step: side of one cell in pixels.
+    :param home: coordinates of the maze's corner in pixels.
+    :param slow: slow the turtle down; ignored when updates are batched.
+    :param flush_every: number of moves between screen updates.
+    :param flush_ms: number of milliseconds between screen updates.
+    :param instant: update the screen only at the end.
+    """
+    batched = instant or flush_every is not None or flush_ms is not None
+    turtle.hideturtle()
+    if batched:
+        turtle.tracer(0, 0)
+    elif not slow:
+        turtle.speed(9)
+    else:
+        turtle.speed(1)
+    moves = 0
+    last_update = time.monotonic()
+    for line in instructions:
+        turtle.penup()
+        for y, x in line:
+            x *= step
+            y *= step
+            turtle.setposition(x + home[0], y + home[1])
+            turtle.pendown()
+            if not batched or instant:
+                continue
+            moves += 1
+            now = time.monotonic()
+            if ((flush_every is not None and moves >= flush_every) or
+                    (flush_ms is not None and
+                     (now - last_update) * 1000 >= flush_ms)):
+                turtle.update()
+                moves = 0
+                last_update = now
+    if batched:
+        turtle.update()
@@ -0,0 +1,103 @@
+from collections import defaultdict
+from collections.abc import Generator
+from .compact_fields import UP, DOWN, LEFT, RIGHT
+from .maze_path import MazePath
+from .points_dict import PointsDict
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+class WallGrid:
+    """ NumPy counterpart of PointsDict. Lines of the maze's grid are
+    kept in two boolean arrays:
+        - `horizontal[row, column]` for the line between points
+            (row, column) and (row, column + 1), shape (height + 1, width),
+        - `vertical[row, column]` for the line between points
+            (row, column) and (row + 1, column), shape (height, width + 1).
+    `degrees[row, column]` holds the number of lines meeting in a point.
+    """
+
+    def __init__(self, maze_path: MazePath) -> None:
+        """ Initialize an instance.
+        :param maze_path: MazePath object.
+        """
+        if np is None:
+            raise ImportError("WallGrid requires numpy.")
+        self._width = maze_path.width
+        self._height = maze_path.height
+        self.horizontal, self.vertical = self.get_walls(maze_path)
+        self.degrees = self.get_degrees()
+
+    def get_walls(self, maze_path: MazePath) -> tuple:
+        """ Build both arrays of lines from the maze's direction codes:
+        start with the full grid, then remove the open lines and
+        the exits lines, exactly as PointsDict does with sets.
+        :param maze_path: MazePath object.
+        :return: tuple of arrays: horizontal and vertical lines.
+        """
+        codes = np.frombuffer(maze_path.get_codes(), dtype=np.uint8)
+        codes = codes.reshape(self._height, self._width)
+        horizontal = np.ones((self._height + 1, self._width), dtype=bool)
+        vertical = np.ones((self._height, self._width + 1), dtype=bool)
+        horizontal[:-1][codes == UP] = False
+        horizontal[1:][codes == DOWN] = False
+        vertical[:, :-1][codes == LEFT] = False
+        vertical[:, 1:][codes == RIGHT] = False
+        middle = self._height // 2
+        vertical[middle, 0] = vertical[middle, self._width] = False
+        return horizontal, vertical
+
+    def get_degrees(self) -> "np.ndarray":
+        """ Count lines meeting in every point of the grid.
+        :return: array of shape (height + 1, width + 1).
+        """
+        degrees = np.zeros((self._height + 1, self._width + 1),
+                           dtype=np.uint8)
+        degrees[:, :-1] += self.horizontal
+        degrees[:, 1:] += self.horizontal
+        degrees[:-1] += self.vertical
+        degrees[1:] += self.vertical
+        return degrees
+
+    def iter_lines(self) -> Generator[tuple[tuple[int, int], tuple[int, int]],
+                                      None, None]:
+        """ Yield pairs of points connected by the remaining lines.
+        :return: Generator of pairs of coordinates.
+        """
+        rows, columns = np.nonzero(self.horizontal)
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            yield (row, column), (row, column + 1)
+        rows, columns = np.nonzero(self.vertical)
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            yield (row, column), (row + 1, column)
+
+    @property
+    def lines(self) -> set[tuple[tuple[int, int], tuple[int, int]]]:
+        """ Lines of the maze in the format of `PointsDict.lines`.
+        :return: set of tuples.
+        """
+        return set(self.iter_lines())
+
+    def get_points_dict(self) -> dict:
+        """ Build the same dictionary as `PointsDict.get_points_dict`.
+        :return: dictionary of points and their neighbours.
+        """
+        points_dict = defaultdict(set)
+        for point_1, point_2 in self.iter_lines():
+            points_dict[point_1].add(point_2)
+            points_dict[point_2].add(point_1)
+        return points_dict
+
+
+def build_points_dict(maze_path: MazePath) -> dict:
+    """ Build the dictionary of points and their neighbours with
+    WallGrid, or with PointsDict if numpy is not installed.
+    :param maze_path: MazePath object.
+    :return: dictionary of points and their neighbours.
+    """
+    if np is None:
+        return PointsDict(maze_path).get_points_dict()
+    return WallGrid(maze_path).get_points_dict()
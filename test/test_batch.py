@@ -0,0 +1,62 @@
+import os
+import pytest
+from src import parse_batch_args
+from src.batch import generate, get_jobs, run_batch
+from src.export import save
+
+
+@pytest.fixture
+def arguments(tmp_path):
+    return parse_batch_args(['-n', '2', '-s', '6', '4', '-s', '5', '5',
+                             '--seed', '10', '-c', '3', '-f', 'ppm',
+                             '-o', str(tmp_path), '-w', '2', '-a', 'kruskal'])
+
+
+def test_get_jobs(arguments, tmp_path):
+    assert get_jobs(arguments) == [
+        (6, 4, 10, 3, "ppm", str(tmp_path), "kruskal"),
+        (6, 4, 11, 3, "ppm", str(tmp_path), "kruskal"),
+        (5, 5, 12, 3, "ppm", str(tmp_path), "kruskal"),
+        (5, 5, 13, 3, "ppm", str(tmp_path), "kruskal"),
+    ]
+
+
+@pytest.mark.parametrize("image_format", ["png", "ppm", "svg"])
+def test_generate(tmp_path, image_format):
+    job = 6, 4, 3, 5, image_format, str(tmp_path), "backtracker"
+    path, pid, fields, elapsed = generate(job)
+    assert path == os.path.join(tmp_path,
+                                f"maze_backtracker_6x4_3.{image_format}")
+    assert pid == os.getpid()
+    assert fields == 24
+    assert elapsed > 0
+    with open(path, "rb") as file:
+        first = file.read()
+    generate(job)
+    with open(path, "rb") as file:
+        assert file.read() == first
+
+
+def test_algorithms_do_not_overwrite_images(tmp_path):
+    paths = {generate((6, 4, 3, 5, "png", str(tmp_path), algorithm))[0]
+             for algorithm in ("backtracker", "kruskal")}
+    assert len(paths) == 2
+    assert sorted(os.listdir(tmp_path)) == sorted(map(os.path.basename,
+                                                      paths))
+
+
+def test_save_invalid_format(tmp_path):
+    with pytest.raises(ValueError):
+        save([], str(tmp_path / "maze.gif"), 1, 1, image_format="gif")
+
+
+def test_run_batch(arguments, tmp_path):
+    lines = []
+    results = run_batch(arguments, lines.append)
+    assert [os.path.basename(result[0]) for result in results] == [
+        "maze_kruskal_6x4_10.ppm", "maze_kruskal_6x4_11.ppm",
+        "maze_kruskal_5x5_12.ppm", "maze_kruskal_5x5_13.ppm"]
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(result[0]) for result in results)
+    assert lines[-1].startswith("4 mazes in ")
+    assert all(line.startswith("worker ") for line in lines[:-1])
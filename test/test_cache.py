@@ -0,0 +1,159 @@
+import os
+import random
+import pytest
+from src import CachedMaze, MazeCache, MazePath, PointsDict
+from src import cache as cache_module
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return MazeCache(str(tmp_path / "cache"))
+
+
+def test_seeded_maze_path():
+    first = MazePath(12, 7, seed=5)
+    second = MazePath(12, 7, seed=5)
+    assert first.fields == second.fields
+    assert first.seed == 5
+    assert MazePath(12, 7, compact=True, fast=True, seed=5).get_codes() == \
+        MazePath(12, 7, compact=True, fast=True, seed=5).get_codes()
+
+
+def test_maze_path_with_rng():
+    first = MazePath(12, 7, rng=random.Random(1))
+    second = MazePath(12, 7, rng=random.Random(1))
+    assert first.fields == second.fields
+    assert first.seed is None
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_from_codes(compact):
+    maze = MazePath(9, 4, seed=2)
+    loaded = MazePath.from_codes(9, 4, maze.get_codes(), compact, seed=2)
+    assert loaded.seed == 2
+    assert loaded.get_codes() == maze.get_codes()
+    assert PointsDict(loaded).lines == PointsDict(maze).lines
+
+
+def test_get_or_create(cache):
+    created = cache.get_or_create(10, 6, 3)
+    assert os.path.exists(cache.path(10, 6, 3))
+    loaded = cache.get(10, 6, 3)
+    assert loaded is not created
+    assert loaded.maze.get_codes() == created.maze.get_codes()
+    assert loaded.lines == created.lines
+    assert cache.get_or_create(10, 6, 3).lines == created.lines
+
+
+def test_get_missing(cache):
+    assert cache.get(10, 6, 3) is None
+    cache.get_or_create(10, 6, 3)
+    assert cache.get(10, 6, 4) is None
+    assert cache.get(6, 10, 3) is None
+
+
+def test_unknown_algorithm(cache):
+    with pytest.raises(ValueError):
+        cache.get_or_create(10, 6, 3, algorithm="aldous_broder")
+
+
+def test_algorithms_do_not_share_entries(cache):
+    backtracker = cache.get_or_create(10, 6, 3)
+    kruskal = cache.get_or_create(10, 6, 3, algorithm="kruskal")
+    assert cache.path(10, 6, 3) != cache.path(10, 6, 3, "kruskal")
+    assert cache.get(10, 6, 3, "kruskal").lines == kruskal.lines
+    assert cache.get(10, 6, 3).lines == backtracker.lines
+
+
+def test_damaged_file(cache):
+    cache.get_or_create(10, 6, 3)
+    path = cache.path(10, 6, 3)
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - 1)
+    assert cache.get(10, 6, 3) is None
+
+
+@pytest.mark.parametrize("seed", [2 ** 64, -2 ** 70, 0])
+def test_seeds_of_any_size(cache, seed):
+    created = cache.get_or_create(4, 4, seed)
+    loaded = cache.get(4, 4, seed)
+    assert loaded.maze.seed == seed
+    assert loaded.maze.get_codes() == created.maze.get_codes()
+
+
+def test_unseeded_maze_is_not_saved(cache):
+    maze = MazePath(4, 4, compact=True, rng=random.Random(1))
+    cache.put(CachedMaze(maze, []))
+    assert os.listdir(cache.directory) == []
+
+
+@pytest.mark.parametrize("position, value", [(12, 0xff), (13, 0xff),
+                                             (16, 0xff), (20, 0xff),
+                                             (28, 0xff), (29, 0xff)])
+def test_corrupted_file(cache, position, value):
+    cache.get_or_create(10, 6, 3)
+    path = cache.path(10, 6, 3)
+    with open(path, "r+b") as file:
+        file.seek(position)
+        file.write(bytes([value]))
+    assert cache.get(10, 6, 3) is None
+    assert not os.path.exists(path)
+
+
+def test_truncated_file_is_removed(cache):
+    cache.get_or_create(10, 6, 3)
+    path = cache.path(10, 6, 3)
+    for size in (10, 40):
+        with open(path, "r+b") as file:
+            file.truncate(size)
+        assert cache.get(10, 6, 3) is None
+        assert not os.path.exists(path)
+        cache.get_or_create(10, 6, 3)
+
+
+def test_evict_stale_temporary_files(cache):
+    suffix = cache_module.TEMPORARY_SUFFIX
+    stale = os.path.join(cache.directory, "stale" + suffix)
+    fresh = os.path.join(cache.directory, "fresh" + suffix)
+    for path in (stale, fresh):
+        with open(path, "wb") as file:
+            file.write(b"partial")
+    os.utime(stale, (1, 1))
+    cache.evict()
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+
+
+def test_other_maze_under_the_same_key(cache, monkeypatch):
+    cache.get_or_create(10, 6, 3)
+    path = cache.path(10, 6, 3)
+    monkeypatch.setattr(MazeCache, "path", lambda self, *args: path)
+    assert cache.get(10, 6, 4) is None
+
+
+def test_evict(tmp_path):
+    sizes = MazeCache(str(tmp_path / "sizes"))
+    max_bytes = -1
+    for seed in (1, 2, 3):
+        sizes.get_or_create(5, 5, seed)
+        max_bytes += os.path.getsize(sizes.path(5, 5, seed))
+    cache = MazeCache(str(tmp_path / "cache"), max_bytes)
+    cache.get_or_create(5, 5, 1)
+    os.utime(cache.path(5, 5, 1), (1, 1))
+    cache.get_or_create(5, 5, 2)
+    os.utime(cache.path(5, 5, 2), (2, 2))
+    # the first maze is used again, so the second one is evicted
+    assert cache.get(5, 5, 1) is not None
+    cache.get_or_create(5, 5, 3)
+    assert os.path.exists(cache.path(5, 5, 1))
+    assert not os.path.exists(cache.path(5, 5, 2))
+    assert os.path.exists(cache.path(5, 5, 3))
+    assert not [name for name in os.listdir(cache.directory)
+                if not name.endswith(cache_module.SUFFIX)]
+
+
+def test_evict_everything(tmp_path):
+    cache = MazeCache(str(tmp_path), max_bytes=0)
+    cached = cache.get_or_create(5, 5, 1)
+    assert isinstance(cached, CachedMaze)
+    assert os.listdir(tmp_path) == []
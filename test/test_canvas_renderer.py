@@ -0,0 +1,17 @@
+from unittest.mock import patch
+from src import canvas_renderer
+
+LINES = [[(0, 0), (0, 2), (1, 2)], [(1, 0), (2, 0)]]
+
+
+@patch('src.canvas_renderer.tkinter')
+def test_draw(mock_tkinter):
+    root = canvas_renderer.draw(LINES, 10, 2, 2)
+    assert root is mock_tkinter.Tk.return_value
+    _, options = mock_tkinter.Canvas.call_args
+    assert (options["width"], options["height"]) == (40, 40)
+    canvas = mock_tkinter.Canvas.return_value
+    assert canvas.create_line.call_count == 2
+    first, second = canvas.create_line.call_args_list
+    assert first.args == (10, 30, 30, 30, 30, 20)
+    assert second.args == (10, 20, 10, 10)
@@ -0,0 +1,45 @@
+import random
+import pytest
+from src import CompactFields, MazePath, PointsDict
+from src.carver import carve
+from src.compact_fields import ROOT, UNVISITED
+
+
+@pytest.mark.parametrize("width, height",
+                         [(1, 1), (1, 7), (7, 1), (5, 6), (31, 17)])
+def test_carve_spanning_tree(width, height):
+    codes = carve(width, height)
+    assert len(codes) == width * height
+    assert UNVISITED not in codes
+    assert codes.count(ROOT) == 1
+    fields = CompactFields(width, height, codes)
+    # every field leads back to the starting one
+    for i in range(height):
+        for j in range(width):
+            seen = set()
+            field = i, j
+            while field != ():
+                assert field not in seen
+                seen.add(field)
+                field = fields[field[0]][field[1]]
+
+
+def test_carve_into_buffer():
+    codes = bytearray(12)
+    assert carve(3, 4, codes) is codes
+    assert UNVISITED not in codes
+
+
+def test_carve_reproducible():
+    assert carve(20, 10, rng=random.Random(3)) == carve(
+        20, 10, rng=random.Random(3))
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_fast_maze_path(compact):
+    maze = MazePath(9, 4, compact=compact, fast=True)
+    assert isinstance(maze.fields, CompactFields) is compact
+    # a perfect maze removes exactly one line per connection and two exits
+    width, height = 9, 4
+    all_lines = width * (height + 1) + height * (width + 1)
+    assert len(PointsDict(maze).lines) == all_lines - (width * height - 1) - 2
@@ -0,0 +1,65 @@
+import pytest
+from src import CompactFields, MazePath, PointsDict
+from src import compact_fields
+
+FIELDS = [[(1, 0), (0, 0), (0, 1)],
+          [(1, 1), (2, 1), (0, 2)],
+          [(3, 0), (2, 0), (1, 2)],
+          [(), (3, 2), (2, 2)]]
+
+
+@pytest.mark.parametrize("value, code",
+                         [(None, compact_fields.UNVISITED),
+                          ((), compact_fields.ROOT),
+                          ((1, 2), compact_fields.UP),
+                          ((3, 2), compact_fields.DOWN),
+                          ((2, 1), compact_fields.LEFT),
+                          ((2, 3), compact_fields.RIGHT)])
+def test_encode_decode(value, code):
+    assert compact_fields.encode(2, 2, value) == code
+    assert compact_fields.decode(2, 2, code) == value
+
+
+def test_encode_invalid():
+    with pytest.raises(ValueError):
+        compact_fields.encode(2, 2, (0, 0))
+
+
+def test_round_trip():
+    fields = CompactFields.from_lists(FIELDS)
+    assert (fields.width, fields.height) == (3, 4)
+    assert len(fields.codes) == 12
+    assert fields.to_lists() == FIELDS
+    assert fields[3][0] == ()
+    assert fields[0][2] == (0, 1)
+
+
+def test_row_assignment():
+    fields = CompactFields(3, 2)
+    assert fields[1][2] is None
+    fields[1][2] = 1, 1
+    assert fields[1][2] == (1, 1)
+    assert fields.codes[5] == compact_fields.LEFT
+    with pytest.raises(IndexError):
+        fields[2][0] = ()
+    with pytest.raises(IndexError):
+        fields[0][3] = ()
+
+
+def test_compact_maze_path():
+    maze = MazePath(7, 5, compact=True)
+    assert isinstance(maze.fields, CompactFields)
+    fields = maze.fields.to_lists()
+    assert sum(row.count(()) for row in fields) == 1
+    assert all(value is not None for row in fields for value in row)
+    assert maze.get_codes() is maze.fields.codes
+
+
+def test_compact_maze_path_compatible():
+    maze = MazePath(3, 4)
+    maze.fields = FIELDS
+    compact = MazePath(3, 4, compact=True)
+    compact.fields = CompactFields.from_lists(FIELDS)
+    assert set(compact.get_pairs()) == set(maze.get_pairs())
+    assert compact.get_codes() == maze.get_codes()
+    assert PointsDict(compact).lines == PointsDict(maze).lines
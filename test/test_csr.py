@@ -0,0 +1,82 @@
+from array import array
+import pytest
+from src import (CSRAdjacency, CSRBranch, Instructions, MazePath, PointsDict,
+                 Tree)
+from src import csr, wall_grid
+
+# 2 x 1 maze with the fields connected; exits are opened on both sides:
+# (0,0)-(0,1)-(0,2)
+#
+# (1,0)-(1,1)-(1,2)
+LINES = {((0, 0), (0, 1)), ((0, 1), (0, 2)),
+         ((1, 0), (1, 1)), ((1, 1), (1, 2))}
+
+
+def segments(lines):
+    result = set()
+    for line in lines:
+        line = list(line)
+        result.update(frozenset(pair) for pair in zip(line, line[1:])
+                      if pair[0] != pair[1])
+    return result
+
+
+@pytest.fixture(params=[False, True], ids=["pure", "numpy"])
+def backend(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(wall_grid, "np", None)
+    return request.param
+
+
+def test_from_lines():
+    adjacency = CSRAdjacency.from_lines(LINES, 2, 1)
+    assert list(adjacency) == [0, 1, 2, 3, 4, 5]
+    assert len(adjacency) == 6
+    assert list(adjacency[1]) == [0, 2]
+    assert list(adjacency[3]) == [4]
+    assert adjacency.degree(4) == 2
+    assert list(adjacency.leaves()) == [0, 2, 3, 5]
+    assert adjacency.point(4) == (1, 1)
+    assert adjacency.point_id(1, 1) == 4
+    assert isinstance(adjacency.neighbours, array)
+
+
+def test_missing_point():
+    adjacency = CSRAdjacency.from_lines({((0, 0), (0, 1))}, 2, 1)
+    with pytest.raises(KeyError):
+        adjacency[4]
+    with pytest.raises(KeyError):
+        adjacency[6]
+
+
+def test_get_walls():
+    maze = MazePath(2, 1)
+    maze.fields = [[(), (0, 0)]]
+    horizontal, vertical = csr.get_walls(maze.get_codes(), 2, 1)
+    assert horizontal == bytearray([1, 1, 1, 1])
+    assert vertical == bytearray([0, 0, 0])
+
+
+@pytest.mark.parametrize("width, height", [(1, 2), (5, 3), (16, 11)])
+def test_from_maze(backend, width, height):
+    maze = MazePath(width, height)
+    points_dict = PointsDict(maze).get_points_dict()
+    adjacency = CSRAdjacency.from_maze(maze)
+    decoded = {adjacency.point(point): set(map(adjacency.point, value))
+               for point, value in adjacency.items()}
+    assert decoded == points_dict
+    assert CSRAdjacency.from_lines(PointsDict(maze).lines, width,
+                                   height).neighbours == adjacency.neighbours
+
+
+def test_tree(backend):
+    maze = MazePath(20, 15)
+    adjacency = CSRAdjacency.from_maze(maze)
+    tree = Tree(adjacency)
+    assert all(isinstance(branch, CSRBranch) for branch in tree.trunks)
+    lines = list(Instructions(tree.trunks, adjacency.point))
+    assert all(isinstance(point, tuple) for line in lines for point in line)
+    expected = Tree(PointsDict(maze).get_points_dict()).trunks
+    assert segments(lines) == segments(Instructions(expected))
@@ -0,0 +1,110 @@
+import random
+import struct
+import zlib
+from array import array
+import pytest
+from src import MazePath, MazeSolver
+from src.compact_fields import ROOT, RIGHT, LEFT
+from src.distance_field import (distance_field, heat_levels, heat_palette,
+                                iter_heat_rows, open_distances,
+                                save_distances, save_heatmap)
+from src.generators import GENERATORS
+
+
+@pytest.mark.parametrize("algorithm", list(GENERATORS))
+def test_distance_field_matches_solver(algorithm):
+    maze = MazePath(14, 9, compact=True, algorithm=algorithm,
+                    rng=random.Random(6))
+    solver = MazeSolver(maze)
+    distances = distance_field(maze)
+    assert isinstance(distances, array)
+    for cell, distance in enumerate(distances):
+        field = divmod(cell, maze.width)
+        assert distance == solver.distance((4, 0), field)
+
+
+def test_distance_field_from_any_field():
+    maze = MazePath(10, 7, compact=True, fast=True, rng=random.Random(2))
+    solver = MazeSolver(maze)
+    distances = distance_field(maze, (6, 9))
+    assert distances == array("I", (solver.distance((6, 9), divmod(cell, 10))
+                                    for cell in range(70)))
+
+
+def test_distance_field_of_a_corridor():
+    maze = MazePath.from_codes(4, 1, bytearray([RIGHT, RIGHT, ROOT, LEFT]))
+    assert list(distance_field(maze)) == [0, 1, 2, 3]
+    assert list(distance_field(maze, (0, 2))) == [2, 1, 0, 1]
+
+
+def test_distance_field_into_a_buffer():
+    maze = MazePath(5, 4, compact=True, fast=True, rng=random.Random(1))
+    buffer = bytearray(80)
+    view = memoryview(buffer).cast("I")
+    assert distance_field(maze, out=view) is view
+    assert array("I", bytes(buffer)) == distance_field(maze)
+    with pytest.raises(ValueError):
+        distance_field(maze, out=array("I", bytes(4 * 19)))
+
+
+def test_distance_field_of_an_invalid_field():
+    maze = MazePath(5, 4, compact=True, fast=True)
+    with pytest.raises(ValueError):
+        distance_field(maze, (4, 0))
+    assert len(distance_field(MazePath.from_codes(0, 0, bytearray()))) == 0
+
+
+def test_save_and_open_distances(tmp_path):
+    path = str(tmp_path / "distances")
+    maze = MazePath(13, 8, compact=True, fast=True, rng=random.Random(3))
+    expected = distance_field(maze)
+    assert save_distances(path, maze) == max(expected)
+    distances = open_distances(path, 13, 8)
+    assert distances.tolist() == expected.tolist()
+    with open(path, "rb") as file:
+        data = file.read()
+    assert [int.from_bytes(data[i:i + 4], "little")
+            for i in range(0, len(data), 4)] == expected.tolist()
+    with pytest.raises(ValueError):
+        open_distances(path, 8, 8)
+
+
+def test_heat_palette():
+    palette = heat_palette()
+    assert len(palette) == 256
+    assert palette[0] == (48, 18, 59)
+    assert palette[-1] == (122, 4, 3)
+    assert all(0 <= value <= 255 for colour in palette for value in colour)
+
+
+@pytest.mark.parametrize("maximum", [1, 2, 7, 255, 256, 1000])
+def test_heat_levels(maximum):
+    assert heat_levels(maximum) == bytes(distance * 255 // maximum
+                                         for distance in range(maximum + 1))
+
+
+def test_iter_heat_rows():
+    distances = array("I", [0, 1, 2, 3, 4, 8])
+    assert list(iter_heat_rows(distances, 3, 2)) == [
+        bytes([0, 31, 63]), bytes([95, 127, 255])]
+    assert list(iter_heat_rows(distances, 3, 2, maximum=4)) == [
+        bytes([0, 63, 127]), bytes([191, 255, 255])]
+    assert list(iter_heat_rows(distances, 3, 2, scale=2))[:2] == [
+        bytes([0, 0, 31, 31, 63, 63])] * 2
+    assert list(iter_heat_rows(array("I", [0]), 1, 1)) == [b"\x00"]
+
+
+def test_save_heatmap(tmp_path):
+    path = str(tmp_path / "heatmap.png")
+    maze = MazePath(7, 5, compact=True, fast=True, rng=random.Random(4))
+    distances = distance_field(maze)
+    save_heatmap(path, distances, 7, 5, scale=3)
+    with open(path, "rb") as file:
+        data = file.read()
+    width, height, depth, color_type = struct.unpack(">IIBB", data[16:26])
+    assert (width, height, depth, color_type) == (21, 15, 8, 3)
+    start = data.index(b"IDAT") + 4
+    length, = struct.unpack(">I", data[start - 8:start - 4])
+    raw = zlib.decompress(data[start:start + length])
+    rows = [raw[i * 22 + 1:(i + 1) * 22] for i in range(15)]
+    assert rows == list(iter_heat_rows(distances, 7, 5, scale=3))
@@ -0,0 +1,72 @@
+import random
+import pytest
+from src import MazePath, PointsDict
+from src.eller import (EAST, SOUTH, eller_rows, iter_lines, iter_pixel_rows,
+                       save_streamed)
+from src.generators import orient
+from src.raster import render
+
+SIZES = [(1, 1), (1, 6), (6, 1), (5, 4), (23, 17)]
+
+
+def to_maze(rows, width, height):
+    passages = bytearray().join(rows)
+    return MazePath.from_codes(width, height,
+                               orient(passages, width, height, 0))
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+def test_eller_rows(width, height):
+    rows = list(eller_rows(width, height, random.Random(1)))
+    assert len(rows) == height
+    assert all(len(row) == width for row in rows)
+    assert not any(row[-1] & EAST for row in rows)
+    assert not any(flag & SOUTH for flag in rows[-1])
+    # a spanning tree has one passage less than fields
+    passages = sum(bin(flag).count("1") for row in rows for flag in row)
+    assert passages == width * height - 1
+    codes = to_maze(rows, width, height).get_codes()
+    assert 0 not in codes
+
+
+def test_eller_rows_are_lazy():
+    rows = eller_rows(10, 10 ** 12)
+    assert len(next(rows)) == 10
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+def test_iter_lines(width, height):
+    rows = list(eller_rows(width, height, random.Random(2)))
+    lines = list(iter_lines(rows, width, height))
+    assert len(lines) == len(set(lines))
+    assert set(lines) == PointsDict(to_maze(rows, width, height)).lines
+
+
+@pytest.mark.parametrize("thickness", [1, 3])
+@pytest.mark.parametrize("width, height", SIZES)
+def test_iter_pixel_rows(width, height, thickness):
+    rows = list(eller_rows(width, height, random.Random(3)))
+    pixels = list(iter_pixel_rows(rows, width, height, 5, 2, thickness))
+    raster = render(PointsDict(to_maze(rows, width, height)).lines,
+                    width, height, 5, 2, thickness)
+    # render puts the first row at the bottom
+    assert pixels[::-1] == [bytes(row) for row in raster.rows()]
+
+
+@pytest.mark.parametrize("image_format, signature",
+                         [("png", b"\x89PNG"), ("ppm", b"P6"),
+                          ("svg", b"<svg")])
+def test_save_streamed(tmp_path, image_format, signature):
+    path = str(tmp_path / f"maze.{image_format}")
+    save_streamed(path, 7, 300, 4, image_format, rng=random.Random(4))
+    with open(path, "rb") as file:
+        first = file.read()
+    assert first.startswith(signature)
+    save_streamed(path, 7, 300, 4, image_format, rng=random.Random(4))
+    with open(path, "rb") as file:
+        assert file.read() == first
+
+
+def test_save_streamed_invalid_format(tmp_path):
+    with pytest.raises(ValueError):
+        save_streamed(str(tmp_path / "maze.gif"), 3, 3, image_format="gif")
@@ -0,0 +1,93 @@
+import random
+import pytest
+from src import CompactFields, MazePath, PointsDict
+from src.carver import carve
+from src.compact_fields import ROOT, UP, LEFT, UNVISITED
+from src.generators import (GENERATORS, EAST, SOUTH, generate, orient,
+                            register)
+
+SIZES = [(1, 1), (1, 7), (7, 1), (5, 6), (31, 17)]
+
+
+def assert_spanning_tree(codes, width, height):
+    assert len(codes) == width * height
+    assert UNVISITED not in codes
+    assert codes.count(ROOT) == 1
+    fields = CompactFields(width, height, codes)
+    # every field leads back to the starting one
+    for i in range(height):
+        for j in range(width):
+            steps = 0
+            field = i, j
+            while field != ():
+                steps += 1
+                assert steps <= width * height
+                field = fields[field[0]][field[1]]
+
+
+def test_registry():
+    assert list(GENERATORS) == ["backtracker", "kruskal", "wilson", "prim",
+                                "binary_tree", "sidewinder", "eller"]
+    assert GENERATORS["backtracker"] is carve
+
+
+@pytest.mark.parametrize("algorithm", list(GENERATORS))
+@pytest.mark.parametrize("width, height", SIZES)
+def test_spanning_tree(algorithm, width, height):
+    codes = generate(algorithm, width, height, rng=random.Random(7))
+    assert_spanning_tree(codes, width, height)
+
+
+@pytest.mark.parametrize("algorithm", list(GENERATORS))
+def test_into_buffer_and_reproducible(algorithm):
+    codes = bytearray(40)
+    assert generate(algorithm, 8, 5, codes, random.Random(2)) is codes
+    assert codes == generate(algorithm, 8, 5, rng=random.Random(2))
+
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        generate("aldous_broder", 3, 3)
+
+
+def test_register():
+    @register("corridor")
+    def corridor(width, height, codes=None, rng=None):
+        codes = codes if codes is not None else bytearray(width * height)
+        codes[:] = bytes([LEFT]) * len(codes)
+        codes[0] = ROOT
+        return codes
+
+    try:
+        maze = MazePath(5, 1, compact=True, algorithm="corridor")
+        assert maze.get_codes() == bytearray([ROOT] + [LEFT] * 4)
+    finally:
+        del GENERATORS["corridor"]
+
+
+def test_orient():
+    # a 3 x 2 maze: a corridor along the first row and one passage down
+    passages = bytearray([EAST, EAST | SOUTH, 0, 0, 0, 0])
+    passages[3] = EAST
+    passages[4] = EAST
+    codes = orient(passages, 3, 2, 2)
+    assert_spanning_tree(codes, 3, 2)
+    assert codes[2] == ROOT
+    assert codes[4] == UP
+
+
+def test_binary_tree_bias():
+    codes = generate("binary_tree", 6, 4)
+    assert codes[1:6] == bytes([LEFT]) * 5
+    assert codes[6::6] == bytes([UP]) * 3
+    assert set(codes[1:]) <= {UP, LEFT}
+
+
+@pytest.mark.parametrize("algorithm", list(GENERATORS))
+@pytest.mark.parametrize("compact", [False, True])
+def test_maze_path(algorithm, compact):
+    maze = MazePath(9, 4, compact=compact, algorithm=algorithm, seed=1)
+    assert isinstance(maze.fields, CompactFields) is compact
+    # a perfect maze removes exactly one line per connection and two exits
+    all_lines = 9 * 5 + 4 * 10
+    assert len(PointsDict(maze).lines) == all_lines - (9 * 4 - 1) - 2
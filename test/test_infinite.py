@@ -0,0 +1,117 @@
+import pytest
+from src import PointsDict
+from src.compact_fields import ROOT, UP, DOWN, LEFT, RIGHT, OFFSETS
+from src.infinite import InfiniteMaze
+
+
+@pytest.fixture
+def maze():
+    return InfiniteMaze(seed=11, chunk_width=6, chunk_height=4,
+                        cache_size=8)
+
+
+def test_chunks_are_reproducible(maze):
+    other = InfiniteMaze(seed=11, chunk_width=6, chunk_height=4)
+    assert other.chunk(-3, 2).get_codes() == maze.chunk(-3, 2).get_codes()
+    assert other.chunk(0, 0).get_codes() != maze.chunk(1, 0).get_codes()
+    assert InfiniteMaze(seed=12, chunk_width=6, chunk_height=4).chunk(
+        -3, 2).get_codes() != maze.chunk(-3, 2).get_codes()
+
+
+def test_chunk_leads_out_through_its_exit(maze):
+    for cx, cy in [(0, 0), (-1, 5), (7, -2)]:
+        codes = maze.chunk(cx, cy).get_codes()
+        assert ROOT not in codes
+        code, exit_cell = maze.exit(cx, cy)
+        assert codes[exit_cell] == code
+        # every field reaches the exit before leaving the chunk
+        for cell in range(len(codes)):
+            for _ in range(len(codes)):
+                row, column = divmod(cell, 6)
+                d_row, d_column = OFFSETS[codes[cell]]
+                if not (0 <= row + d_row < 4 and 0 <= column + d_column < 6):
+                    break
+                cell = (row + d_row) * 6 + column + d_column
+            assert cell == exit_cell
+
+
+def test_lru_cache(maze):
+    for cx in range(10):
+        maze.chunk(cx, 0)
+    assert list(maze.chunks) == [(cx, 0) for cx in range(2, 10)]
+    maze.chunk(2, 0)
+    maze.chunk(10, 0)
+    assert list(maze.chunks)[0] == (4, 0)
+    assert list(maze.chunks)[-2:] == [(2, 0), (10, 0)]
+
+
+def test_is_open_is_symmetric(maze):
+    for row in range(-6, 6):
+        for column in range(-7, 7):
+            assert maze.is_open(row, column, DOWN) == \
+                maze.is_open(row + 1, column, UP)
+            assert maze.is_open(row, column, RIGHT) == \
+                maze.is_open(row, column + 1, LEFT)
+            code = maze.code(row, column)
+            assert maze.is_open(row, column, code)
+
+
+def test_viewport_has_no_loops(maze):
+    top, left, height, width = -7, -9, 15, 20
+    parents = {}
+
+    def find(field):
+        while parents.setdefault(field, field) != field:
+            field = parents[field]
+        return field
+
+    for row in range(top, top + height):
+        for column in range(left, left + width):
+            for code, other in ((DOWN, (row + 1, column)),
+                                (RIGHT, (row, column + 1))):
+                if other[0] == top + height or other[1] == left + width:
+                    continue
+                if maze.is_open(row, column, code):
+                    one, two = find((row, column)), find(other)
+                    assert one != two
+                    parents[one] = two
+
+
+def test_lines_follow_is_open(maze):
+    top, left, height, width = -5, -4, 9, 13
+    lines = set(maze.lines(top, left, height, width))
+    all_lines = width * (height + 1) + height * (width + 1)
+    passages = sum(maze.is_open(row, column, code)
+                   for row in range(top, top + height)
+                   for column in range(left, left + width)
+                   for code in (UP, LEFT))
+    passages += sum(maze.is_open(top + height - 1, column, DOWN)
+                    for column in range(left, left + width))
+    passages += sum(maze.is_open(row, left + width - 1, RIGHT)
+                    for row in range(top, top + height))
+    assert len(lines) == all_lines - passages
+
+
+def test_viewport_touches_only_its_chunks(maze):
+    maze.cache_size = 100
+    list(maze.lines(4, 6, 4, 6))
+    assert set(maze.chunks) == {(1, 1)}
+    maze.chunks.clear()
+    list(maze.lines(-2, -3, 5, 5))
+    assert set(maze.chunks) == {(-1, -1), (0, -1), (-1, 0), (0, 0)}
+
+
+def test_lines_match_points_dict(maze):
+    def inner(line):
+        (y_1, x_1), (y_2, x_2) = line
+        return not (y_1 == y_2 in (0, 4) or x_1 == x_2 in (0, 6))
+
+    lines = set(maze.lines(0, 0, 4, 6))
+    expected = PointsDict(maze.chunk(0, 0)).lines
+    assert set(filter(inner, lines)) == set(filter(inner, expected))
+
+
+def test_render(maze):
+    raster = maze.render(-3, -3, 6, 6, step=5)
+    assert (raster.width, raster.height) == (6 * 5 + 21, 6 * 5 + 21)
+    assert 0 in raster.pixels
@@ -0,0 +1,78 @@
+import re
+import pytest
+from src import PointsDict
+from src.compact_fields import ROOT, UP, LEFT, RIGHT, UNVISITED
+
+np = pytest.importorskip("numpy")
+from src import WallGrid  # noqa: E402
+from src.lockstep import ALGORITHMS, MazeBatch  # noqa: E402
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("width, height", [(1, 1), (1, 5), (5, 1), (10, 10),
+                                           (7, 4)])
+def test_spanning_trees(width, height, algorithm):
+    batch = MazeBatch(50, width, height, seed=1, algorithm=algorithm)
+    assert batch.codes.shape == (50, height, width)
+    for index in range(50):
+        maze = batch.maze(index)
+        codes = maze.get_codes()
+        assert UNVISITED not in codes
+        assert codes.count(ROOT) == 1
+        # every field leads back to the starting one
+        for i in range(height):
+            for j in range(width):
+                steps = 0
+                field = i, j
+                while field != ():
+                    steps += 1
+                    assert steps <= width * height
+                    field = maze.fields[field[0]][field[1]]
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_walls_match_wall_grid(algorithm):
+    batch = MazeBatch(20, 9, 6, seed=2, algorithm=algorithm)
+    assert batch.horizontal.shape == (20, 7, 9)
+    assert batch.vertical.shape == (20, 6, 10)
+    for index in range(20):
+        maze = batch.maze(index)
+        grid = WallGrid(maze)
+        assert (batch.horizontal[index] == grid.horizontal).all()
+        assert (batch.vertical[index] == grid.vertical).all()
+        assert set(grid.lines) == PointsDict(maze).lines
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_reproducible_and_varied(algorithm):
+    batch = MazeBatch(30, 6, 6, seed=3, algorithm=algorithm)
+    assert (MazeBatch(30, 6, 6, seed=3, algorithm=algorithm).codes ==
+            batch.codes).all()
+    assert len({maze.tobytes() for maze in batch.codes}) == 30
+
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        MazeBatch(3, 4, 4, algorithm="wilson")
+
+
+def test_sidewinder_runs():
+    batch = MazeBatch(100, 8, 5, seed=6, algorithm="sidewinder")
+    for maze in batch.codes:
+        for row in maze[1:]:
+            # every run has exactly one passage up, with passages
+            # leading towards it from both sides
+            runs = "".join({UP: "^", LEFT: "<", RIGHT: ">"}[code]
+                           for code in row.tolist())
+            assert re.fullmatch(r"(>*\^<*)+", runs)
+
+
+def test_texture_of_a_backtracker():
+    # long corridors of depth-first search leave few dead ends
+    batch = MazeBatch(200, 10, 10, seed=4)
+    horizontal = (~batch.horizontal).astype(np.int64)
+    vertical = (~batch.vertical).astype(np.int64)
+    passages = (horizontal[:, :-1] + horizontal[:, 1:] +
+                vertical[:, :, :-1] + vertical[:, :, 1:])
+    dead_ends = (passages == 1).mean()
+    assert 0.05 < dead_ends < 0.2
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ROOT)
+
+
+def run_program(*arguments):
+    return subprocess.run([sys.executable, "-m", PACKAGE, *arguments],
+                          cwd=os.path.dirname(ROOT), capture_output=True,
+                          text=True, check=True)
+
+
+@pytest.mark.skipif(not PACKAGE.isidentifier(),
+                    reason="the repository is not importable as a package")
+def test_eller_image_with_distances_and_heatmap(tmp_path):
+    image = str(tmp_path / "maze.png")
+    distances = str(tmp_path / "distances")
+    heatmap = str(tmp_path / "heatmap.png")
+    result = run_program("-s", "12", "8", "-a", "eller", "-b", "png",
+                         "-o", image, "--distances", distances,
+                         "--heatmap", heatmap)
+    for path in (image, distances, heatmap):
+        assert f"Saved {path}." in result.stdout
+        assert os.path.exists(path)
+    assert os.path.getsize(distances) == 4 * 12 * 8
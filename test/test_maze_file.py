@@ -0,0 +1,109 @@
+import os
+import random
+import pytest
+from src import (CSRAdjacency, MazeFile, MazePath, PointsDict, WallGrid,
+                 save_maze)
+from src.compact_fields import CompactFields, ROOT
+from src.maze_file import (HEADER, PackedCodes, iter_packed, pack_codes,
+                           unpack_codes)
+
+
+@pytest.fixture
+def maze():
+    return MazePath(13, 7, compact=True, fast=True, seed=4)
+
+
+@pytest.fixture
+def path(tmp_path, maze):
+    path = str(tmp_path / "maze.bin")
+    save_maze(path, maze, "backtracker")
+    return path
+
+
+@pytest.mark.parametrize("size", [1, 3, 4, 5, 97])
+def test_pack_unpack(size):
+    codes = bytearray(random.choice(b"\x02\x03\x04\x05")
+                      for _ in range(size))
+    packed = pack_codes(codes)
+    assert len(packed) == (size + 3) // 4
+    assert unpack_codes(packed, 0, size) == codes
+    assert unpack_codes(packed[1:], 5, size - 5) == codes[5:]
+
+
+@pytest.mark.parametrize("chunk", [4, 8, 96])
+def test_iter_packed_in_chunks(chunk):
+    codes = bytearray(random.choice(b"\x02\x03\x04\x05")
+                      for _ in range(101))
+    chunks = list(iter_packed(codes, chunk))
+    assert all(len(packed) <= chunk // 4 for packed in chunks)
+    assert b"".join(chunks) == pack_codes(codes)
+    assert unpack_codes(b"".join(chunks), 0, 101) == codes
+
+
+def test_packed_codes():
+    codes = bytearray(random.choice(b"\x02\x03\x04\x05") for _ in range(30))
+    codes[17] = ROOT
+    packed = PackedCodes(b"xx" + pack_codes(codes), 2, 30, 17)
+    assert len(packed) == 30
+    assert [packed[i] for i in range(30)] == list(codes)
+    assert packed[-1] == codes[-1]
+    assert packed[3:21] == codes[3:21]
+    assert packed[:] == codes
+    assert list(packed) == list(codes)
+    with pytest.raises(IndexError):
+        packed[30]
+
+
+def test_file_size(path, maze):
+    assert os.path.getsize(path) == HEADER.size + 1 + (13 * 7 + 3) // 4
+
+
+def test_load(path, maze):
+    with MazeFile(path) as loaded:
+        assert (loaded.width, loaded.height) == (13, 7)
+        assert loaded.seed == 4
+        assert loaded.algorithm == "backtracker"
+        assert isinstance(loaded.fields, CompactFields)
+        assert loaded.fields[3][5] == maze.fields[3][5]
+        assert loaded.get_codes() == maze.get_codes()
+        assert PointsDict(loaded).lines == PointsDict(maze).lines
+        assert (CSRAdjacency.from_maze(loaded).neighbours ==
+                CSRAdjacency.from_maze(maze).neighbours)
+        assert loaded.to_maze_path().get_codes() == maze.get_codes()
+
+
+def test_wall_grid(path, maze):
+    pytest.importorskip("numpy")
+    with MazeFile(path) as loaded:
+        assert WallGrid(loaded).lines == WallGrid(maze).lines
+
+
+@pytest.mark.parametrize("seed", [None, -3, 0, 2 ** 64, -2 ** 70])
+def test_seed(tmp_path, seed):
+    path = str(tmp_path / "maze.bin")
+    maze = MazePath(4, 4, compact=True, fast=True, seed=seed)
+    save_maze(path, maze)
+    with MazeFile(path) as loaded:
+        assert loaded.seed == seed
+        assert loaded.get_codes() == maze.get_codes()
+
+
+def test_invalid_files(tmp_path, path):
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a maze")
+    with pytest.raises(ValueError):
+        MazeFile(str(other))
+    with open(path, "rb") as file:
+        data = file.read()
+    other.write_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        MazeFile(str(other))
+    # the seed "4" replaced with a byte that is not a digit
+    other.write_bytes(data[:HEADER.size] + b"x" + data[HEADER.size + 1:])
+    with pytest.raises(ValueError):
+        MazeFile(str(other))
+
+
+def test_long_algorithm_name(tmp_path, maze):
+    with pytest.raises(ValueError):
+        save_maze(str(tmp_path / "maze.bin"), maze, "a" * 17)
@@ -0,0 +1,75 @@
+import os
+import random
+import pytest
+from src import MazePath, PointsDict
+from src.carver import carve
+from src.eller import iter_lines
+from src.out_of_core import (generate_mapped, iter_passages, iter_walls,
+                             open_mapped, save_image)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "maze.codes")
+
+
+@pytest.mark.parametrize("width, height", [(1, 1), (1, 6), (6, 1), (13, 9)])
+def test_generate_mapped(path, width, height):
+    expected = carve(width, height, rng=random.Random(3))
+    with generate_mapped(path, width, height, seed=3) as maze:
+        assert isinstance(maze, MazePath)
+        assert maze.get_codes()[:] == expected
+        assert maze.seed == 3
+    assert maze.get_codes().closed
+    with open(path, "rb") as file:
+        assert file.read() == expected
+    # the temporary visited bitmap is removed
+    assert os.listdir(os.path.dirname(path)) == ["maze.codes"]
+
+
+def test_carve_into_visited_buffer():
+    visited = bytearray(5 * 6)
+    codes = carve(3, 4, rng=random.Random(1), visited=visited)
+    assert codes == carve(3, 4, rng=random.Random(1))
+    assert set(visited) == {1}
+
+
+def test_open_mapped(path):
+    with generate_mapped(path, 8, 5, seed=1) as maze, \
+            open_mapped(path, 8, 5) as loaded:
+        assert loaded.get_codes()[:] == maze.get_codes()[:]
+        assert PointsDict(loaded).lines == PointsDict(maze).lines
+    assert loaded.get_codes().closed
+    with pytest.raises(ValueError):
+        open_mapped(path, 5, 5)
+
+
+def test_generate_empty_mapped_maze(path):
+    with pytest.raises(ValueError):
+        generate_mapped(path, 0, 5)
+
+
+@pytest.mark.parametrize("block_rows", [1, 2, 3, 100])
+def test_iter_walls(path, block_rows):
+    maze = generate_mapped(path, 11, 7, seed=5)
+    lines = list(iter_walls(maze, block_rows))
+    assert len(lines) == len(set(lines))
+    assert set(lines) == PointsDict(maze).lines
+
+
+@pytest.mark.parametrize("algorithm", ["kruskal", "sidewinder"])
+def test_iter_passages_of_any_maze(algorithm):
+    maze = MazePath(9, 6, compact=False, algorithm=algorithm)
+    assert set(iter_lines(iter_passages(maze, 4), 9, 6)) == \
+        PointsDict(maze).lines
+
+
+def test_save_image(path, tmp_path):
+    maze = generate_mapped(path, 10, 30, seed=2)
+    image = str(tmp_path / "maze.png")
+    save_image(image, maze, 3, block_rows=7)
+    with open(image, "rb") as file:
+        first = file.read()
+    save_image(image, maze, 3, block_rows=30)
+    with open(image, "rb") as file:
+        assert file.read() == first
@@ -24,6 +24,21 @@ def test_parser_with_no_args():
     assert parser.cell == [15]
     assert not parser.slow
     assert not parser.close
+    assert parser.flush_every is None
+    assert parser.flush_ms is None
+    assert not parser.instant
+    assert parser.backend == "turtle"
+    assert parser.output is None
+    assert not parser.merge
+    assert parser.algorithm == "backtracker"
+    assert parser.tile is None
+    assert parser.mapped is None
+    assert parser.workers is None
+    assert parser.profile is None
+    assert not parser.chain
+    assert parser.distances is None
+    assert parser.heatmap is None
+    assert not parser.profile_memory
 
 
 def test_parser_with_args():
@@ -35,6 +50,73 @@ def test_parser_with_args():
     assert parser.close
 
 
+def test_parser_with_flush_args():
+    parser = args_parser.parse_args(
+        ['--flush-every', '50', '--flush-ms', '40', '--instant'])
+    assert parser.flush_every == 50
+    assert parser.flush_ms == 40
+    assert parser.instant
+
+
+@pytest.mark.parametrize("args", [['-b', 'canvas'], ['--backend', 'canvas']])
+def test_parser_with_backend(args):
+    assert args_parser.parse_args(args).backend == "canvas"
+
+
+@pytest.mark.parametrize("algorithm", ["kruskal", "wilson", "prim",
+                                       "binary_tree", "sidewinder"])
+def test_parser_with_algorithm(algorithm):
+    assert args_parser.parse_args(['-a', algorithm]).algorithm == algorithm
+
+
+def test_parser_with_tiles():
+    parser = args_parser.parse_args(['--tile', '64', '32', '-w', '4'])
+    assert parser.tile == [64, 32]
+    assert parser.workers == 4
+
+
+def test_parser_with_mapped():
+    assert args_parser.parse_args(['--mapped', 'maze.codes']).mapped == \
+        "maze.codes"
+
+
+def test_parser_with_output():
+    parser = args_parser.parse_args(['-b', 'png', '-o', 'maze_1.png'])
+    assert parser.backend == "png"
+    assert parser.output == "maze_1.png"
+
+
+def test_parser_with_svg():
+    parser = args_parser.parse_args(['-b', 'svg', '--merge', '--chain'])
+    assert parser.backend == "svg"
+    assert parser.merge
+    assert parser.chain
+
+
+@pytest.mark.parametrize("args, expected", [
+    (['--profile'], "table"),
+    (['--profile', 'json'], "json"),
+])
+def test_parser_with_profile(args, expected):
+    parser = args_parser.parse_args(args + ['--profile-memory'])
+    assert parser.profile == expected
+    assert parser.profile_memory
+
+
+def test_parser_with_mapped():
+    parser = args_parser.parse_args(
+        ['--mapped', 'maze.codes', '-a', 'backtracker'])
+    assert parser.mapped == 'maze.codes'
+    assert parser.algorithm == 'backtracker'
+
+
+def test_parser_with_distances():
+    parser = args_parser.parse_args(
+        ['--distances', 'maze.dist', '--heatmap', 'heat.png'])
+    assert parser.distances == 'maze.dist'
+    assert parser.heatmap == 'heat.png'
+
+
 def test_parser_with_invalid_args():
     with pytest.raises(SystemExit):
         args_parser.parse_args(['-s', '300'])
@@ -68,3 +150,86 @@ def test_parser_with_invalid_args():
 
     with pytest.raises(SystemExit):
         args_parser.parse_args(['--close', '20'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--flush-every', '0'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--flush-ms'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--instant', '1'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--backend', 'pygame'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--output'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--merge', 'yes'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--algorithm', 'aldous_broder'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--tile', '64'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--workers', '0'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--mapped'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--profile', 'csv'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--heatmap'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--mapped', 'maze.codes', '-a', 'kruskal'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_args(['--mapped', 'maze.codes',
+                                '--tile', '10', '10'])
+
+
+def test_batch_parser_with_no_args():
+    parser = args_parser.parse_batch_args([])
+    assert parser.count == 1
+    assert parser.size == [[40, 20]]
+    assert parser.seed == 0
+    assert parser.cell == [15]
+    assert parser.format == "png"
+    assert parser.output_dir == "mazes"
+    assert parser.workers is None
+    assert parser.algorithm == "backtracker"
+
+
+def test_batch_parser_with_args():
+    parser = args_parser.parse_batch_args(
+        ['-n', '5', '-s', '10', '20', '-s', '30', '40', '--seed', '-3',
+         '-c', '4', '-f', 'svg', '-o', 'out', '-w', '2', '-a', 'prim'])
+    assert parser.count == 5
+    assert parser.size == [[10, 20], [30, 40]]
+    assert parser.seed == -3
+    assert parser.cell == [4]
+    assert parser.format == "svg"
+    assert parser.output_dir == "out"
+    assert parser.workers == 2
+    assert parser.algorithm == "prim"
+
+
+def test_batch_parser_with_invalid_args():
+    with pytest.raises(SystemExit):
+        args_parser.parse_batch_args(['-n', '0'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_batch_args(['-s', '10'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_batch_args(['-f', 'gif'])
+
+    with pytest.raises(SystemExit):
+        args_parser.parse_batch_args(['-w', '0'])
@@ -0,0 +1,133 @@
+import io
+import json
+import random
+import pytest
+from src import CSRAdjacency, MazePath, Tree, Instructions
+from src.compact_fields import ROOT, UP, DOWN, LEFT, RIGHT
+from src.profiling import Profiler, count_dead_ends
+from src.tree import pen_up_distance
+
+
+def test_count_dead_ends_of_a_corridor():
+    # a single row leading to the root in the middle
+    codes = bytearray([RIGHT, RIGHT, ROOT, LEFT, LEFT])
+    assert count_dead_ends(codes, 5) == 2
+    assert count_dead_ends(codes, 1) == 2
+
+
+def test_count_dead_ends_of_a_column():
+    codes = bytearray([ROOT, UP, UP])
+    assert count_dead_ends(codes, 1) == 1
+    codes = bytearray([DOWN, DOWN, ROOT])
+    assert count_dead_ends(codes, 1) == 1
+
+
+def test_count_dead_ends_of_small_mazes():
+    assert count_dead_ends(bytearray(), 0) == 0
+    assert count_dead_ends(bytearray([ROOT]), 1) == 1
+
+
+def test_count_dead_ends_matches_parents():
+    maze = MazePath(23, 17, compact=True, fast=True, rng=random.Random(3))
+    codes = maze.get_codes()
+    width = maze.width
+    offsets = {UP: -width, DOWN: width, LEFT: -1, RIGHT: 1}
+    parents = {cell + offsets[code] for cell, code in enumerate(codes)
+               if code != ROOT}
+    assert count_dead_ends(codes, width) == len(codes) - len(parents)
+
+
+def test_disabled_profiler_does_nothing():
+    profiler = Profiler(enabled=False)
+    with profiler.stage("generate"):
+        pass
+    profiler.count("fields", 10)
+    lines = [[(0, 0), (0, 1)]]
+    assert profiler.counted(lines) is lines
+    assert profiler.stage("tree") is profiler.stage("draw")
+    file = io.StringIO()
+    profiler.report(file=file)
+    assert file.getvalue() == ""
+    assert profiler.as_dict() == {"stages": {}, "counters": {}}
+
+
+def test_stages_are_measured():
+    profiler = Profiler()
+    with profiler.stage("allocate"):
+        data = bytearray(2 ** 20)
+    with profiler.stage("sum"):
+        sum(range(10000))
+    with profiler.stage("sum"):
+        sum(range(10000))
+    assert list(profiler.stages) == ["allocate", "sum"]
+    assert profiler.stages["allocate"]["peak_bytes"] >= len(data)
+    for stage in profiler.stages.values():
+        assert stage["wall"] >= 0
+        assert stage["cpu"] >= 0
+
+
+def test_stages_without_memory():
+    profiler = Profiler(memory=False)
+    with profiler.stage("generate"):
+        pass
+    assert "peak_bytes" not in profiler.stages["generate"]
+    assert "peak MiB" not in profiler.format_table()
+
+
+def test_counters_of_the_pipeline():
+    profiler = Profiler(memory=False)
+    maze = MazePath(12, 9, compact=True, fast=True, rng=random.Random(5))
+    profiler.count_maze(maze.get_codes(), maze.width, "backtracker")
+    adjacency = CSRAdjacency.from_maze(maze)
+    tree = Tree(adjacency)
+    profiler.count_tree(tree)
+    lines = list(profiler.counted(Instructions(tree.trunks,
+                                               adjacency.point)))
+    counters = profiler.counters
+    assert counters["fields"] == 108
+    assert counters["derived_forward_steps"] == 107
+    assert counters["derived_backtracks"] == counters["dead_ends"] - 1
+    assert counters["branches"] == len(tree.leaves)
+    assert counters["nodes"] == len(tree.nodes)
+    assert counters["lines"] == len(lines)
+    assert counters["points"] == sum(len(line) for line in lines)
+    assert counters["pen_up_distance"] == pytest.approx(
+        pen_up_distance(lines))
+
+
+def test_pen_up_distance_of_lines_consumed_in_part():
+    profiler = Profiler(memory=False)
+    lines = [[(0, 0), (1, 0)], [(4, 4), (4, 5)], [(0, 0), (0, 1)]]
+    counted = profiler.counted(lines)
+    next(counted)
+    next(counted)
+    counted.close()
+    assert profiler.counters["lines"] == 2
+    assert profiler.counters["pen_up_distance"] == pytest.approx(5.0)
+
+
+def test_walk_counters_only_for_the_backtracker():
+    profiler = Profiler()
+    profiler.count_maze(bytearray([RIGHT, ROOT]), 2, "kruskal")
+    assert "derived_forward_steps" not in profiler.counters
+    assert "derived_backtracks" not in profiler.counters
+    assert profiler.counters["dead_ends"] == 1
+
+
+def test_report_as_table_and_json():
+    profiler = Profiler(memory=False)
+    with profiler.stage("generate"):
+        pass
+    profiler.count("fields", 4)
+    file = io.StringIO()
+    profiler.report("table", file)
+    table = file.getvalue().splitlines()
+    assert table[0].split() == ["stage", "wall", "s", "cpu", "s"]
+    assert table[1].split()[0] == "generate"
+    assert table[2].split()[0] == "total"
+    assert table[3].split() == ["fields", "4"]
+    file = io.StringIO()
+    profiler.report("json", file)
+    result = json.loads(file.getvalue())
+    assert result["counters"] == {"fields": 4}
+    assert set(result["stages"]["generate"]) == {"wall", "cpu"}
@@ -0,0 +1,94 @@
+import io
+import struct
+import zlib
+import pytest
+from src import MazePath, PointsDict
+from src.raster import BLACK, WHITE, Raster, render, write_png, write_ppm
+
+ROWS = [bytes([0, 1, 2]), bytes([2, 1, 0])]
+PALETTE = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+
+
+def read_png(data):
+    """ Split a PNG file into chunks and decode its pixels. """
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    chunks, position = [], 8
+    while position < len(data):
+        length, = struct.unpack(">I", data[position:position + 4])
+        kind = data[position + 4:position + 8]
+        content = data[position + 8:position + 8 + length]
+        crc, = struct.unpack(">I", data[position + 8 + length:
+                                        position + 12 + length])
+        assert crc == zlib.crc32(kind + content)
+        chunks.append((kind, content))
+        position += 12 + length
+    header = dict(chunks)[b"IHDR"]
+    width, height, depth, color_type = struct.unpack(">IIBB", header[:10])
+    raw = zlib.decompress(b"".join(c for k, c in chunks if k == b"IDAT"))
+    rows = [raw[i * (width + 1) + 1:(i + 1) * (width + 1)]
+            for i in range(height)]
+    assert all(raw[i * (width + 1)] == 0 for i in range(height))
+    return [kind for kind, _ in chunks], (width, height, depth,
+                                          color_type), rows
+
+
+def test_write_png_gray():
+    file = io.BytesIO()
+    write_png(file, 3, 2, ROWS)
+    kinds, header, rows = read_png(file.getvalue())
+    assert kinds == [b"IHDR", b"IDAT", b"IEND"]
+    assert header == (3, 2, 8, 0)
+    assert rows == ROWS
+
+
+def test_write_png_palette():
+    file = io.BytesIO()
+    write_png(file, 3, 2, ROWS, PALETTE)
+    kinds, header, rows = read_png(file.getvalue())
+    assert kinds == [b"IHDR", b"PLTE", b"IDAT", b"IEND"]
+    assert header == (3, 2, 8, 3)
+
+
+@pytest.mark.parametrize("palette, expected",
+                         [(None, bytes([0, 0, 0, 1, 1, 1, 2, 2, 2,
+                                        2, 2, 2, 1, 1, 1, 0, 0, 0])),
+                          (PALETTE, bytes([255, 0, 0, 0, 255, 0, 0, 0, 255,
+                                           0, 0, 255, 0, 255, 0, 255, 0, 0]))])
+def test_write_ppm(palette, expected):
+    file = io.BytesIO()
+    write_ppm(file, 3, 2, ROWS, palette)
+    assert file.getvalue() == b"P6\n3 2\n255\n" + expected
+
+
+def test_raster_lines():
+    raster = Raster(4, 3)
+    raster.draw_horizontal(0, 2, 0)
+    raster.draw_vertical(3, 2, 0)
+    assert raster.pixels == bytes([BLACK, BLACK, BLACK, BLACK,
+                                   WHITE, WHITE, WHITE, BLACK,
+                                   WHITE, WHITE, WHITE, BLACK])
+    assert [bytes(row) for row in raster.rows()] == [
+        raster.pixels[0:4], raster.pixels[4:8], raster.pixels[8:12]]
+
+
+def test_render():
+    # a square with the left side missing
+    lines = [[(0, 0), (0, 1), (1, 1), (1, 0)]]
+    raster = render(lines, 1, 1, step=2, margin=1)
+    assert (raster.width, raster.height) == (5, 5)
+    assert raster.pixels == bytes([WHITE] * 5 +
+                                  [WHITE, BLACK, BLACK, BLACK, WHITE] +
+                                  [WHITE, WHITE, WHITE, BLACK, WHITE] +
+                                  [WHITE, BLACK, BLACK, BLACK, WHITE] +
+                                  [WHITE] * 5)
+
+
+def test_render_points_dict_lines():
+    maze = MazePath(6, 4)
+    lines = PointsDict(maze).lines
+    raster = render(lines, 6, 4, step=3, margin=2, thickness=2)
+    assert (raster.width, raster.height) == (6 * 3 + 6, 4 * 3 + 6)
+    file = io.BytesIO()
+    raster.write_png(file)
+    _, _, rows = read_png(file.getvalue())
+    assert b"".join(rows) == raster.pixels
@@ -0,0 +1,106 @@
+import random
+from collections import deque
+import pytest
+from src import MazePath, MazeSolver
+from src.compact_fields import ROOT, UP, DOWN, LEFT, RIGHT
+from src.generators import GENERATORS
+
+OFFSETS = {UP: (-1, 0), DOWN: (1, 0), LEFT: (0, -1), RIGHT: (0, 1)}
+
+
+def get_graph(maze):
+    graph = {(i, j): set() for i in range(maze.height)
+             for j in range(maze.width)}
+    for cell, code in enumerate(maze.get_codes()):
+        if code != ROOT:
+            i, j = divmod(cell, maze.width)
+            di, dj = OFFSETS[code]
+            graph[i, j].add((i + di, j + dj))
+            graph[i + di, j + dj].add((i, j))
+    return graph
+
+
+def bfs(graph, start):
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        field = queue.popleft()
+        for neighbour in graph[field]:
+            if neighbour not in distances:
+                distances[neighbour] = distances[field] + 1
+                queue.append(neighbour)
+    return distances
+
+
+@pytest.mark.parametrize("algorithm", list(GENERATORS))
+def test_distances_match_bfs(algorithm):
+    maze = MazePath(13, 9, compact=True, algorithm=algorithm,
+                    rng=random.Random(7))
+    solver = MazeSolver(maze)
+    graph = get_graph(maze)
+    for start in [(0, 0), (4, 6), (8, 12)]:
+        distances = bfs(graph, start)
+        for field, distance in distances.items():
+            assert solver.distance(start, field) == distance
+            assert solver.distance(field, start) == distance
+
+
+def test_depths_and_lca():
+    maze = MazePath(10, 10, compact=True, fast=True, rng=random.Random(1))
+    solver = MazeSolver(maze)
+    root = divmod(solver.root, maze.width)
+    assert maze.get_codes()[solver.root] == ROOT
+    assert solver.depth(root) == 0
+    graph = get_graph(maze)
+    distances = bfs(graph, root)
+    for field, distance in distances.items():
+        assert solver.depth(field) == distance
+        assert solver.lca(field, root) == root
+        assert solver.lca(field, field) == field
+
+
+def test_path():
+    maze = MazePath(17, 11, compact=True, fast=True, rng=random.Random(3))
+    solver = MazeSolver(maze)
+    graph = get_graph(maze)
+    rng = random.Random(5)
+    for _ in range(50):
+        a = rng.randrange(11), rng.randrange(17)
+        b = rng.randrange(11), rng.randrange(17)
+        path = solver.path(a, b)
+        assert path[0] == a and path[-1] == b
+        assert len(path) == solver.distance(a, b) + 1
+        assert len(set(path)) == len(path)
+        assert all(second in graph[first]
+                   for first, second in zip(path, path[1:]))
+    assert solver.path((2, 2), (2, 2)) == [(2, 2)]
+
+
+def test_solve():
+    maze = MazePath(20, 7, compact=True, fast=True, rng=random.Random(2))
+    path = MazeSolver(maze).solve()
+    assert path[0] == (3, 0)
+    assert path[-1] == (3, 19)
+
+
+def test_lists_and_compact_fields_give_the_same_index():
+    maze = MazePath(8, 6, rng=random.Random(4))
+    compact = MazePath.from_codes(8, 6, maze.get_codes())
+    assert MazeSolver(maze).up == MazeSolver(compact).up
+
+
+@pytest.mark.parametrize("width, height", [(1, 1), (1, 5), (6, 1)])
+def test_narrow_mazes(width, height):
+    maze = MazePath(width, height, compact=True, fast=True,
+                    rng=random.Random(0))
+    solver = MazeSolver(maze)
+    assert solver.distance((0, 0), (height - 1, width - 1)) == \
+        width + height - 2
+
+
+def test_invalid_field():
+    solver = MazeSolver(MazePath(4, 3, compact=True, fast=True))
+    with pytest.raises(ValueError):
+        solver.distance((0, 0), (3, 0))
+    with pytest.raises(ValueError):
+        solver.path((0, -1), (0, 0))
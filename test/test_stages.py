@@ -0,0 +1,59 @@
+import json
+import os
+import pytest
+from benchmarks.stages import PIPELINES, compare, run
+
+BASELINE = os.path.join(os.path.dirname(__file__), os.pardir,
+                        "benchmarks", "baseline.json")
+
+
+def results(seconds, peak_bytes, pipeline="classic"):
+    return {"pipeline": pipeline,
+            "results": {"100x100": {"Tree": {"seconds": seconds,
+                                             "peak_bytes": peak_bytes}}}}
+
+
+@pytest.mark.parametrize("seconds, peak_bytes", [(1.0, 1000), (1.19, 1199),
+                                                 (0.5, 10)])
+def test_compare_within_tolerance(seconds, peak_bytes):
+    assert compare(results(seconds, peak_bytes), results(1.0, 1000),
+                   0.2, 0.001) == []
+
+
+def test_compare_regressed_time():
+    regressions = compare(results(1.5, 1000), results(1.0, 1000), 0.2, 0.001)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("100x100 Tree: seconds")
+    assert "+50%" in regressions[0]
+
+
+def test_compare_regressed_memory():
+    regressions = compare(results(1.0, 2000), results(1.0, 1000), 0.2, 0.001)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("100x100 Tree: peak_bytes")
+
+
+def test_compare_skips_short_times_and_missing_entries():
+    assert compare(results(0.002, 1000), results(0.0005, 1000),
+                   0.2, 0.001) == []
+    other = {"pipeline": "classic", "results": {"10x10": {}}}
+    assert compare(results(5.0, 5000), other, 0.2, 0.001) == []
+
+
+def test_compare_other_pipeline():
+    regressions = compare(results(1.0, 1000, "compact"), results(1.0, 1000),
+                          0.2, 0.001)
+    assert len(regressions) == 1
+    assert "pipeline" in regressions[0]
+
+
+def test_run_matches_the_baseline_layout():
+    result = run("compact", [5], 1)
+    assert list(result["results"]["5x5"]) == \
+        [name for name, _ in PIPELINES["compact"]]
+    with open(BASELINE) as file:
+        baseline = json.load(file)
+    assert baseline["pipeline"] == "classic"
+    assert set(baseline["results"]["10x10"]) == \
+        {name for name, _ in PIPELINES["classic"]}
+    assert compare(baseline, baseline, 0.2, 0.001) == []
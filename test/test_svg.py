@@ -0,0 +1,56 @@
+import io
+import xml.etree.ElementTree as ElementTree
+from src import CSRAdjacency, Instructions, MazePath, Tree
+from src.svg import write_svg
+
+LINES = [[(0, 0), (0, 2), (1, 2)], [(1, 0), (2, 0)]]
+NAMESPACE = "{http://www.w3.org/2000/svg}"
+
+
+def parse(lines, **options):
+    file = io.StringIO()
+    write_svg(file, lines, 2, 2, step=10, margin=5, **options)
+    return ElementTree.fromstring(file.getvalue())
+
+
+def test_polylines():
+    root = parse(LINES)
+    assert (root.get("width"), root.get("height")) == ("30", "30")
+    polylines = root.findall(f"{NAMESPACE}g/{NAMESPACE}polyline")
+    assert [p.get("points") for p in polylines] == ["5,25 25,25 25,15",
+                                                    "5,15 5,5"]
+
+
+def test_merged_path():
+    root = parse(LINES, merge=True)
+    paths = root.findall(f"{NAMESPACE}g/{NAMESPACE}path")
+    assert not root.findall(f"{NAMESPACE}g/{NAMESPACE}polyline")
+    assert [p.get("d") for p in paths] == ["M5,25L25,25 25,15M5,15L5,5"]
+
+
+def test_streaming():
+    written = []
+
+    class Recorder(io.StringIO):
+        def write(self, text):
+            written.append(text)
+            return super().write(text)
+
+    def lines():
+        yield LINES[0]
+        # the first line must already be written
+        assert any("polyline" in text for text in written)
+        yield LINES[1]
+
+    write_svg(Recorder(), lines(), 2, 2)
+
+
+def test_instructions():
+    maze = MazePath(8, 5, compact=True, fast=True)
+    adjacency = CSRAdjacency.from_maze(maze)
+    instructions = Instructions(Tree(adjacency).trunks, adjacency.point,
+                                compress=True)
+    file = io.StringIO()
+    write_svg(file, instructions, 8, 5, merge=True)
+    root = ElementTree.fromstring(file.getvalue())
+    assert root.find(f"{NAMESPACE}g/{NAMESPACE}path").get("d")[0] == "M"
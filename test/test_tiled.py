@@ -0,0 +1,90 @@
+import random
+import pytest
+from src import CompactFields, CSRAdjacency, MazePath, PointsDict, Tree
+from src.compact_fields import ROOT, UP, DOWN, LEFT, RIGHT, UNVISITED
+from src.tiled import generate_tile, generate_tiled, get_tile_jobs, reroot
+
+
+def assert_spanning_tree(maze):
+    codes = maze.get_codes()
+    assert UNVISITED not in codes
+    assert codes.count(ROOT) == 1
+    # every field leads back to the starting one
+    for i in range(maze.height):
+        for j in range(maze.width):
+            steps = 0
+            field = i, j
+            while field != ():
+                steps += 1
+                assert steps <= maze.width * maze.height
+                field = maze.fields[field[0]][field[1]]
+
+
+def test_reroot():
+    # a 3 x 1 corridor rooted in its first field
+    codes = bytearray([ROOT, LEFT, LEFT])
+    reroot(codes, 3, 2, UP)
+    assert codes == bytearray([RIGHT, RIGHT, UP])
+
+
+def test_generate_tile():
+    job = 5, 4, "backtracker", 7, 2, UP
+    codes = generate_tile(job)
+    assert len(codes) == 20
+    assert ROOT not in codes
+    assert codes[2] == UP
+    assert generate_tile(job) == codes
+
+
+def test_get_tile_jobs():
+    jobs = get_tile_jobs(10, 7, 4, 3, rng=random.Random(1))
+    assert [(top, left) for top, left, _ in jobs] == [
+        (0, 0), (0, 4), (0, 8), (3, 0), (3, 4), (3, 8), (6, 0), (6, 4),
+        (6, 8)]
+    assert [job[:2] for _, _, job in jobs] == [
+        (4, 3), (4, 3), (2, 3), (4, 3), (4, 3), (2, 3), (4, 1), (4, 1),
+        (2, 1)]
+    assert [job[4] for _, _, job in jobs].count(-1) == 1
+
+
+@pytest.mark.parametrize("algorithm", ["backtracker", "kruskal", "prim"])
+@pytest.mark.parametrize("width, height, tile_width, tile_height",
+                         [(1, 1, 4, 4), (9, 1, 2, 3), (1, 9, 2, 2),
+                          (10, 7, 4, 3), (17, 23, 5, 8)])
+def test_generate_tiled(algorithm, width, height, tile_width, tile_height):
+    maze = generate_tiled(width, height, tile_width, tile_height,
+                          algorithm, seed=3, workers=1)
+    assert isinstance(maze.fields, CompactFields)
+    assert maze.seed == 3
+    assert_spanning_tree(maze)
+
+
+def test_seams():
+    width, height = 12, 9
+    maze = generate_tiled(width, height, 4, 3, seed=5, workers=1)
+    codes = maze.get_codes()
+    # passages crossing borders of tiles: one less than the tiles
+    crossing = 0
+    for cell, code in enumerate(codes):
+        row, column = divmod(cell, width)
+        if code == UP and row % 3 == 0 or code == LEFT and column % 4 == 0:
+            crossing += 1
+        elif code == DOWN and row % 3 == 2 or \
+                code == RIGHT and column % 4 == 3:
+            crossing += 1
+    assert crossing == 3 * 3 - 1
+
+
+def test_workers_do_not_change_the_maze():
+    maze = generate_tiled(30, 20, 8, 8, seed=9, workers=1)
+    parallel = generate_tiled(30, 20, 8, 8, seed=9, workers=2)
+    assert parallel.get_codes() == maze.get_codes()
+
+
+def test_consumers():
+    maze = generate_tiled(16, 12, 5, 5, seed=2, workers=1, compact=False)
+    assert isinstance(maze, MazePath)
+    assert len(PointsDict(maze).lines) == \
+        16 * 13 + 12 * 17 - (16 * 12 - 1) - 2
+    adjacency = CSRAdjacency.from_maze(maze)
+    assert Tree(adjacency).trunks
@@ -1,7 +1,11 @@
+import math
+import random
+from array import array
 from collections import deque
 from unittest.mock import patch
 import pytest
-from src import Branch, Tree, Instructions
+from src import Branch, CSRAdjacency, CSRBranch, MazePath, Tree, Instructions
+from src.tree import chain_lines, compress_line, pen_up_distance
 
 REG_DICT = {
     (0, 0): {(1, 0), (0, 1)},
@@ -85,6 +89,53 @@ class TestBranch:
         assert branch_1.children == deque(['a', 'b', 'c', 'd'])
 
 
+class TestCSRBranch:
+    @pytest.fixture
+    def adjacency(self):
+        lines = set()
+        for point, neighbours in REG_DICT.items():
+            lines.update((point, neighbour) for neighbour in neighbours)
+        return CSRAdjacency.from_lines(lines, 4, 5)
+
+    def test_init(self, adjacency):
+        leaf = adjacency.point_id(2, 3)
+        branch = CSRBranch(leaf, adjacency)
+        assert not hasattr(branch, "__dict__")
+        assert branch.line == array("I", [leaf])
+        assert branch.children == list()
+        assert branch.direction == adjacency.point_id(1, 3)
+
+    @pytest.mark.parametrize("leaf, line",
+                             [((2, 3),
+                               [(2, 3), (1, 3), (1, 2), (1, 1), (1, 0)]),
+                              ((2, 1),
+                               [(2, 1), (2, 2), (3, 2)]),
+                              ((4, 3), [(4, 3), (4, 4)])
+                              ])
+    def test_extend(self, adjacency, leaf, line):
+        branch = CSRBranch(adjacency.point_id(*leaf), adjacency)
+        branch.extend()
+        assert list(map(adjacency.point, branch.line)) == line
+        assert branch.direction is None
+
+    def test_join(self, adjacency):
+        branch_1 = CSRBranch(adjacency.point_id(2, 0), adjacency)
+        branch_1.children = ['a', 'b']
+        branch_2 = CSRBranch(adjacency.point_id(2, 0), adjacency)
+        branch_2.children = ['c', 'd']
+        branch_2.line = array("I", [5, 6])
+        branch_1.join_(branch_2)
+        assert branch_1.line == array("I", [10, 6, 5])
+        assert branch_1.children == ['a', 'b', 'd', 'c']
+        assert branch_2.finished
+
+    def test_tree(self, adjacency):
+        tree = Tree(adjacency)
+        lines = list(Instructions(tree.trunks, adjacency.point))
+        expected = list(Instructions(Tree(REG_DICT).trunks))
+        assert sorted(map(tuple, lines)) == sorted(map(tuple, expected))
+
+
 class TestTree:
     @patch('src.Tree.get_queue')
     @patch('src.Tree.get_trunks')
@@ -147,9 +198,11 @@ class TestTree:
         branch_2 = Branch((2, 0), SMALL_DICT)
         branch_2.line = deque([(1, 1), (1, 2)])
         tree.queue = deque([branch_1, branch_2])
+        tree.leaves = {(0, 0): branch_1, (1, 1): branch_2}
         tree.move_to_trunks(branch_to_be_finished)
         assert branch_to_be_finished in tree.trunks
         assert branch_2.finished
+        assert not branch_1.finished
 
     @pytest.mark.parametrize("nodes",
                              [{(1, 0): {"branches": [],
@@ -167,6 +220,50 @@ class TestTree:
                         "open_directions": {(0, 0), (1, 1)}}
         assert tree.nodes[(1, 0)] == node
 
+    def test_get_node_keeps_branches_sorted(self):
+        d = {(1, 0): {(0, 0), (1, 1), (2, 0), (1, 2)}}
+        tree = Tree(dict())
+        tree.points_dict = d
+        short = Branch((2, 0), SMALL_DICT)
+        short.line = deque([(2, 0), (1, 0)])
+        long = Branch((2, 0), SMALL_DICT)
+        long.line = deque([(3, 1), (2, 1), (1, 1), (1, 0)])
+        middle = Branch((2, 0), SMALL_DICT)
+        middle.line = deque([(0, 1), (0, 0), (1, 0)])
+        tree.get_node(short)
+        tree.get_node(long)
+        node = tree.get_node(middle)
+        # the order of a stable sort from the longest branch
+        assert node["branches"] == [long, middle, short]
+        assert tree.trim(node) is long
+        assert list(long.children) == [middle, short]
+
+    def test_get_node_keeps_equal_branches_in_order(self):
+        d = {(1, 0): {(0, 0), (1, 1), (2, 0), (1, 2)}}
+        tree = Tree(dict())
+        tree.points_dict = d
+        first = Branch((2, 0), SMALL_DICT)
+        first.line = deque([(3, 0), (2, 0), (1, 0)])
+        second = Branch((2, 0), SMALL_DICT)
+        second.line = deque([(1, 3), (1, 2), (1, 0)])
+        third = Branch((2, 0), SMALL_DICT)
+        third.line = deque([(0, 1), (0, 0), (1, 0)])
+        for branch in (first, second, third):
+            node = tree.get_node(branch)
+        assert node["branches"] == [first, second, third]
+
+    def test_get_node_without_open_directions(self):
+        d = {(1, 0): {(0, 0), (2, 0)}}
+        tree = Tree(dict())
+        tree.points_dict = d
+        parent = Branch((2, 0), SMALL_DICT)
+        parent.line = deque([(2, 0), (1, 0)])
+        branch = Branch((2, 0), SMALL_DICT)
+        branch.line = deque([(0, 2), (0, 1), (0, 0), (1, 0)])
+        tree.get_node(parent)
+        node = tree.get_node(branch)
+        assert node["branches"] == [parent, branch]
+
     @patch('src.Tree.move_to_trunks')
     @patch('src.Branch.extend', autospec=True)
     def test_serve_branch_finished(self, mock_extend, mock_move_to_trunks):
@@ -263,3 +360,121 @@ def test_instructions():
     instructions = Instructions(trunks)
     assert list(instructions) == [['branch_2'], ['branch_3'], ['branch_5'],
                                   ['branch_6'], ['branch_4'], ['branch_1']]
+
+
+@pytest.mark.parametrize("line, compressed",
+                         [([], []),
+                          ([(0, 0)], [(0, 0)]),
+                          ([(0, 0), (0, 1), (0, 2), (0, 3)],
+                           [(0, 0), (0, 3)]),
+                          ([(2, 3), (1, 3), (1, 2), (1, 1), (1, 0)],
+                           [(2, 3), (1, 3), (1, 0)]),
+                          ([(0, 0), (0, 1), (0, 1), (0, 2), (1, 2), (1, 1)],
+                           [(0, 0), (0, 2), (1, 2), (1, 1)])])
+def test_compress_line(line, compressed):
+    assert compress_line(line) == compressed
+
+
+@pytest.mark.parametrize("decode", [None, CSRAdjacency.from_lines(
+    {((r, c), p) for (r, c), ps in REG_DICT.items() for p in ps}, 4, 5)])
+def test_instructions_compressed(decode):
+    points_dict = REG_DICT if decode is None else decode
+    plain = list(Instructions(Tree(points_dict).trunks,
+                              decode and decode.point))
+    compressed = list(Instructions(Tree(points_dict).trunks,
+                                   decode and decode.point, compress=True))
+    assert len(compressed) == len(plain)
+    for line, short in zip(plain, compressed):
+        assert short == compress_line(line)
+        assert (short[0], short[-1]) == (line[0], line[-1])
+    assert sum(map(len, compressed)) < sum(map(len, plain))
+
+
+def unit_segments(lines):
+    return {frozenset(pair) for line in lines for pair in zip(line, line[1:])
+            if pair[0] != pair[1]}
+
+
+def test_pen_up_distance():
+    assert pen_up_distance([]) == 0
+    assert pen_up_distance([[(0, 0), (0, 3)]]) == 0
+    assert pen_up_distance([[(0, 0), (0, 3)], [(4, 3), (4, 0)],
+                            [(4, 0), (5, 0)]]) == 4
+
+
+def test_chain_lines_joins_lines_meeting_at_ends():
+    lines = [[(0, 0), (0, 1)], [(0, 2), (0, 1)], [(5, 5), (5, 6)],
+             deque([(0, 2), (1, 2)])]
+    assert chain_lines(lines) == [[(0, 0), (0, 1), (0, 2), (1, 2)],
+                                  [(5, 5), (5, 6)]]
+    assert chain_lines([]) == []
+
+
+def test_chain_lines_takes_the_nearest_end():
+    lines = [[(0, 0), (0, 1)], [(9, 9), (9, 8)], [(3, 5), (1, 1)],
+             [(9, 0), (8, 0)]]
+    assert chain_lines(lines, bucket=2) == [
+        [(0, 0), (0, 1)], [(1, 1), (3, 5)], [(9, 8), (9, 9)],
+        [(9, 0), (8, 0)]]
+
+
+@pytest.mark.parametrize("bucket", [1, 3, 8])
+def test_chain_lines_of_a_maze(bucket):
+    maze = MazePath(30, 20, compact=True, fast=True, rng=random.Random(4))
+    adjacency = CSRAdjacency.from_maze(maze)
+    lines = list(Instructions(Tree(adjacency).trunks, adjacency.point))
+    strokes = chain_lines(lines, bucket)
+    assert unit_segments(strokes) == unit_segments(lines)
+    assert len(strokes) <= len(lines)
+    assert pen_up_distance(strokes) < pen_up_distance(lines)
+
+
+def greedy_chain(lines):
+    """ Chain lines by scanning all unused lines after every line. """
+    unused = list(lines[1:])
+    pen, order = lines[0][-1], [list(lines[0])]
+    while unused:
+        line = min(unused, key=lambda line: min(math.dist(pen, line[0]),
+                                                math.dist(pen, line[-1])))
+        unused.remove(line)
+        if math.dist(pen, line[-1]) < math.dist(pen, line[0]):
+            line = line[::-1]
+        order.append(list(line))
+        pen = line[-1]
+    return order
+
+
+@pytest.mark.parametrize("bucket", [1, 3, 1000])
+def test_chain_lines_of_scattered_lines(bucket):
+    # few lines far apart, so searches reach the linear scan
+    generator = random.Random(3)
+    lines = [[(generator.randrange(10 ** 4), generator.randrange(10 ** 4))
+              for _ in range(2)] for _ in range(60)]
+    strokes = chain_lines(lines, bucket)
+    assert strokes == greedy_chain(lines)
+
+
+def test_instructions_chained():
+    maze = MazePath(12, 9, compact=True, fast=True, rng=random.Random(2))
+    adjacency = CSRAdjacency.from_maze(maze)
+    lines = list(Instructions(Tree(adjacency).trunks, adjacency.point))
+    chained = Instructions(Tree(adjacency).trunks, adjacency.point,
+                           chain=True)
+    assert list(chained) == chain_lines(lines)
+    compressed = list(Instructions(Tree(adjacency).trunks, adjacency.point,
+                                   compress=True, chain=True))
+    assert compressed == [compress_line(line) for line in chain_lines(lines)]
+
+
+def test_instructions_chained_keep_compressing_after_an_error():
+    maze = MazePath(6, 5, compact=True, fast=True, rng=random.Random(2))
+    adjacency = CSRAdjacency.from_maze(maze)
+
+    def decode(point):
+        raise KeyError(point)
+
+    instructions = Instructions(Tree(adjacency).trunks, decode,
+                                compress=True, chain=True)
+    with pytest.raises(KeyError):
+        next(instructions)
+    assert instructions._compress
@@ -0,0 +1,43 @@
+from unittest.mock import patch
+import pytest
+from src import turtle_renderer
+
+LINES = [[(0, 0), (0, 2), (1, 2)], [(1, 0), (2, 0)]]
+
+
+@pytest.fixture
+def mock_turtle():
+    with patch('src.turtle_renderer.turtle') as mock:
+        yield mock
+
+
+@pytest.mark.parametrize("slow, speed", [(False, 9), (True, 1)])
+def test_draw_animated(mock_turtle, slow, speed):
+    turtle_renderer.draw(LINES, 10, (-5, -5), slow=slow)
+    mock_turtle.speed.assert_called_once_with(speed)
+    assert not mock_turtle.tracer.called
+    assert not mock_turtle.update.called
+    assert mock_turtle.setposition.call_count == 5
+    mock_turtle.setposition.assert_called_with(-5, 15)
+
+
+def test_draw_instant(mock_turtle):
+    turtle_renderer.draw(LINES, 10, (0, 0), instant=True, flush_every=1)
+    mock_turtle.tracer.assert_called_once_with(0, 0)
+    assert mock_turtle.update.call_count == 1
+
+
+def test_draw_flush_every(mock_turtle):
+    turtle_renderer.draw(LINES, 10, (0, 0), flush_every=2)
+    mock_turtle.tracer.assert_called_once_with(0, 0)
+    # two batches of two moves and the final update
+    assert mock_turtle.update.call_count == 3
+
+
+def test_draw_flush_ms(mock_turtle):
+    ticks = iter(range(0, 1000, 30))
+    with patch('src.turtle_renderer.time.monotonic',
+               side_effect=lambda: next(ticks) / 1000):
+        turtle_renderer.draw(LINES, 10, (0, 0), flush_ms=50)
+    # moves at 30, 60, 90, 120 and 150 ms; flushes at 60 and 120 ms
+    assert mock_turtle.update.call_count == 3
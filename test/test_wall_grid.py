@@ -0,0 +1,51 @@
+from collections import Counter
+import pytest
+from src import MazePath, PointsDict, WallGrid, build_points_dict
+from src import wall_grid
+
+
+@pytest.fixture(params=[(1, 2), (2, 3), (12, 7)])
+def maze(request):
+    width, height = request.param
+    return MazePath(width, height)
+
+
+def test_build_points_dict(maze):
+    assert build_points_dict(maze) == PointsDict(maze).get_points_dict()
+
+
+def test_build_points_dict_without_numpy(maze, monkeypatch):
+    monkeypatch.setattr(wall_grid, "np", None)
+    assert build_points_dict(maze) == PointsDict(maze).get_points_dict()
+    with pytest.raises(ImportError):
+        WallGrid(maze)
+
+
+class TestWallGrid:
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        return pytest.importorskip("numpy")
+
+    def test_lines(self, maze):
+        assert WallGrid(maze).lines == PointsDict(maze).lines
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_shapes(self, compact):
+        grid = WallGrid(MazePath(4, 3, compact=compact))
+        assert grid.horizontal.shape == (4, 4)
+        assert grid.vertical.shape == (3, 5)
+        assert grid.degrees.shape == (4, 5)
+
+    def test_degrees(self, maze):
+        degrees = Counter()
+        for point_1, point_2 in PointsDict(maze).lines:
+            degrees[point_1] += 1
+            degrees[point_2] += 1
+        grid = WallGrid(maze)
+        for (row, column), degree in degrees.items():
+            assert grid.degrees[row, column] == degree
+        assert grid.degrees.sum() == sum(degrees.values())
+
+    def test_get_points_dict(self, maze):
+        assert (WallGrid(maze).get_points_dict() ==
+                PointsDict(maze).get_points_dict())